@@ -0,0 +1,253 @@
+"""Close out attendance windows once a schedule's end_time has passed.
+
+A schedule's ``start_time`` and ``end_time`` are wall-clock times in its
+dormitory's timezone. For every active schedule whose window closed within the
+last ``LOOKBACK_DAYS`` (honouring the weekday flags and the schedule's date
+range) the job:
+
+* marks every active student of the dormitory without a record since the window
+  opened as ABSENT, found with one anti-join and inserted in one batch;
+* reclassifies each student's first check-in as LATE when it came more than
+  ``late_grace_minutes`` after the window opened (the ``attendance`` system
+  config, ``settings.LATE_GRACE_MINUTES`` by default).
+
+A ``job_leases`` lease keeps concurrent workers from running it side by side,
+and a ``schedule_window_runs`` row written in the same transaction as the
+changes makes every window a one-off even if the lease is lost mid-run.
+
+    python -m app.core.absences [--interval 60]
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import List, Optional
+import uuid
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app.core.dashboard_cache import mark_summaries_stale
+from app.core.leases import acquire_lease, release_lease
+from app.core.rollups import refresh_attendance_rollups
+from app.core.runtime_config import AttendanceConfig, system_config
+from app.core.timezones import as_utc, get_zone, to_db_datetime
+from app.models.models import (
+    Attendance,
+    AttendanceSchedule,
+    AttendanceStatus,
+    Dormitory,
+    ScheduleWindowRun,
+    Student,
+)
+
+ABSENCE_JOB_NAME = "attendance_window_close"
+LEASE_TTL = timedelta(minutes=5)
+# Windows that closed longer ago than this are left alone (no surprise backfills)
+LOOKBACK_DAYS = 2
+ABSENT_NOTE = "Marked absent automatically when the schedule window closed"
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+def _parse_time(value: str) -> time:
+    hours, minutes = value.split(":")[:2]
+    return time(int(hours), int(minutes))
+
+
+def schedule_window(schedule: AttendanceSchedule, day: date, zone) -> tuple:
+    """Aware ``(start, end)`` of the schedule's window opening on local ``day``."""
+    start = datetime.combine(day, _parse_time(schedule.start_time), tzinfo=zone)
+    end = datetime.combine(day, _parse_time(schedule.end_time), tzinfo=zone)
+    if end <= start:
+        # The window runs past midnight
+        end += timedelta(days=1)
+    return start, end
+
+
+def in_date_range(schedule: AttendanceSchedule, day: date, zone) -> bool:
+    """Whether local ``day`` falls within the schedule's start and end dates."""
+    if as_utc(schedule.start_date).astimezone(zone).date() > day:
+        return False
+    return not schedule.end_date or as_utc(schedule.end_date).astimezone(zone).date() >= day
+
+
+def is_window_day(schedule: AttendanceSchedule, day: date, zone) -> bool:
+    """Whether a window of ``schedule`` opens on local ``day`` (weekday flags and date range)."""
+    return in_date_range(schedule, day, zone) and bool(getattr(schedule, WEEKDAYS[day.weekday()]))
+
+
+def current_window(schedule: AttendanceSchedule, now: datetime, zone) -> Optional[tuple]:
+    """The window of ``schedule`` open at the aware instant ``now`` as ``(day, start, end)``, if any.
+
+    Scans, staff entries, the dashboard and the close-out job all go through
+    this and ``schedule_window``, so they agree on when a window is open.
+    """
+    today = now.astimezone(zone).date()
+    # Yesterday's window may still be open past midnight
+    for day in (today, today - timedelta(days=1)):
+        if not is_window_day(schedule, day, zone):
+            continue
+        start, end = schedule_window(schedule, day, zone)
+        if start <= now <= end:
+            return day, start, end
+    return None
+
+
+def due_windows(db: Session, now: datetime) -> list:
+    """Closed, not yet processed windows as ``(schedule, day, start, end)``."""
+    rows = db.query(AttendanceSchedule, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    ).filter(AttendanceSchedule.is_active == True).all()
+    if not rows:
+        return []
+
+    first_day = (now - timedelta(days=LOOKBACK_DAYS + 1)).date()
+    processed = set(db.query(ScheduleWindowRun.schedule_id, ScheduleWindowRun.day).filter(
+        ScheduleWindowRun.day >= first_day
+    ))
+
+    windows = []
+    for schedule, tz_name in rows:
+        zone = get_zone(tz_name)
+        today = now.astimezone(zone).date()
+        for offset in range(LOOKBACK_DAYS + 1, -1, -1):
+            day = today - timedelta(days=offset)
+            if not is_window_day(schedule, day, zone) or (schedule.id, day) in processed:
+                continue
+            start, end = schedule_window(schedule, day, zone)
+            if end <= now and now - end <= timedelta(days=LOOKBACK_DAYS):
+                windows.append((schedule, day, start, end))
+    return windows
+
+
+def close_window(
+    db: Session,
+    schedule: AttendanceSchedule,
+    day: date,
+    start: datetime,
+    end: datetime,
+    now: datetime,
+) -> Optional[dict]:
+    """Mark absences and lateness for one window and commit.
+
+    Returns None when another worker has already closed the window.
+    """
+    dialect_name = db.get_bind().dialect.name
+    db_start, db_end, db_now = (to_db_datetime(value, dialect_name) for value in (start, end, now))
+    grace = system_config.section("attendance", AttendanceConfig).late_grace_minutes
+    grace_end = to_db_datetime(start + timedelta(minutes=grace), dialect_name)
+
+    run = ScheduleWindowRun(schedule_id=schedule.id, day=day)
+    db.add(run)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        return None
+
+    # Anything recorded since the window opened (including staff entries made
+    # after it closed) means the student is accounted for
+    seen = select(Attendance.id).where(
+        Attendance.student_id == Student.id,
+        Attendance.schedule_id == schedule.id,
+        Attendance.timestamp >= db_start,
+        Attendance.timestamp <= db_now,
+    ).exists()
+    missing = db.execute(
+        select(Student.id).where(
+            Student.dormitory_id == schedule.dormitory_id,
+            Student.is_active == True,
+            (Student.created_at < db_end) | (Student.created_at == None),
+            ~seen,
+        )
+    ).scalars().all()
+    if missing:
+        # Dated at the opening so the record falls on the window's local day
+        db.execute(insert(Attendance), [
+            {
+                "id": uuid.uuid4(),
+                "student_id": student_id,
+                "schedule_id": schedule.id,
+                "timestamp": db_start,
+                "status": AttendanceStatus.ABSENT,
+                "recorded_by_id": schedule.created_by_id,
+                "notes": ABSENT_NOTE,
+            }
+            for student_id in missing
+        ])
+
+    earlier = aliased(Attendance)
+    late_ids = db.execute(
+        select(Attendance.id).where(
+            Attendance.schedule_id == schedule.id,
+            Attendance.status == AttendanceStatus.PRESENT,
+            Attendance.timestamp > grace_end,
+            Attendance.timestamp < db_end,
+            ~select(earlier.id).where(
+                earlier.student_id == Attendance.student_id,
+                earlier.schedule_id == schedule.id,
+                earlier.status.in_([AttendanceStatus.PRESENT, AttendanceStatus.LATE]),
+                earlier.timestamp >= db_start,
+                earlier.timestamp < Attendance.timestamp,
+            ).exists(),
+        )
+    ).scalars().all()
+    if late_ids:
+        db.execute(
+            update(Attendance)
+            .where(Attendance.id.in_(late_ids))
+            .values(status=AttendanceStatus.LATE)
+            .execution_options(synchronize_session=False)
+        )
+
+    run.absent_marked = len(missing)
+    run.late_marked = len(late_ids)
+    if missing or late_ids:
+        # Core statements bypass the session events that track dashboard changes
+        mark_summaries_stale(db, [schedule.dormitory_id])
+    db.commit()
+    return {"schedule_id": schedule.id, "day": day, "absent_marked": len(missing), "late_marked": len(late_ids)}
+
+
+def close_finished_windows(db: Session, now: Optional[datetime] = None) -> List[dict]:
+    """Close every due window; returns one summary per window this call processed."""
+    now = now or datetime.now(timezone.utc)
+    if not acquire_lease(db, ABSENCE_JOB_NAME, LEASE_TTL):
+        return []
+    results = []
+    try:
+        for schedule, day, start, end in due_windows(db, now):
+            result = close_window(db, schedule, day, start, end, now)
+            if result is not None:
+                results.append(result)
+    finally:
+        release_lease(db, ABSENCE_JOB_NAME)
+
+    if any(result["absent_marked"] or result["late_marked"] for result in results):
+        # Bring the reports up to date now rather than at the next rollup run
+        refresh_attendance_rollups(db)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import time as clock
+
+    from app.core.database import SessionLocal
+
+    parser = argparse.ArgumentParser(description="Mark absences and lateness for closed schedule windows")
+    parser.add_argument("--interval", type=int, help="keep running, checking every N seconds")
+    args = parser.parse_args()
+
+    while True:
+        session = SessionLocal()
+        try:
+            for window in close_finished_windows(session):
+                print(
+                    f"Closed schedule {window['schedule_id']} on {window['day']}: "
+                    f"{window['absent_marked']} absent, {window['late_marked']} late"
+                )
+        finally:
+            session.close()
+        if not args.interval:
+            break
+        clock.sleep(args.interval)
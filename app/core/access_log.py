@@ -0,0 +1,128 @@
+"""Structured access logging as plain ASGI middleware.
+
+One JSON line per request is written after the response has been sent, with
+the method, route template, status, latency, SQL statement count and bytes
+transferred. The middleware only observes the ASGI messages passing through;
+bodies are never buffered or copied. Records go through a ``QueueHandler``, so
+the request path never waits on the log stream; a ``QueueListener`` thread does
+the formatting and writing.
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+from typing import Iterable, Optional
+
+from app.core.query_stats import QueryStats, current_query_stats, request_query_stats
+
+REDACTED_HEADERS = {"authorization", "cookie", "set-cookie", "proxy-authorization", "x-api-key"}
+
+logger = logging.getLogger("app.access")
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def route_template(scope) -> Optional[str]:
+    """Matched path template including router prefixes, e.g. ``/api/students/{student_id}``."""
+    # Newer FastAPI resolves included routers lazily; the prefixed route lives here
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    route = context if getattr(context, "path", None) else scope.get("route")
+    return getattr(route, "path", None)
+
+
+def start_access_log_listener(handler: Optional[logging.Handler] = None) -> None:
+    """Route ``app.access`` records through a queue drained by a background thread."""
+    global _listener
+    if _listener is not None:
+        return
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = handler or logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(log_queue, handler)
+    _listener.start()
+
+
+def stop_access_log_listener() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class AccessLogMiddleware:
+    def __init__(
+        self,
+        app,
+        sample_rate: float = 1.0,
+        log_headers: Iterable[str] = (),
+        slow_request_ms: Optional[float] = None,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.log_headers = {name.lower().encode("latin-1") for name in log_headers}
+        self.slow_request_ms = slow_request_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats, token = request_query_stats(scope)
+        response = {"status": 500, "bytes_in": 0, "bytes_out": 0}
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                response["bytes_in"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes_out"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            if token is not None:
+                current_query_stats.reset(token)
+            latency_ms = (time.perf_counter() - started) * 1000
+            if self._should_log(response["status"], latency_ms):
+                self._log(scope, response, latency_ms, stats)
+
+    def _should_log(self, status: int, latency_ms: float) -> bool:
+        # Server errors and slow requests are always kept, whatever the sample rate
+        if status >= 500 or (self.slow_request_ms is not None and latency_ms >= self.slow_request_ms):
+            return True
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def _log(self, scope, response: dict, latency_ms: float, stats: QueryStats) -> None:
+        entry = {
+            "method": scope["method"],
+            "route": route_template(scope),
+            "path": scope["path"],
+            "status": response["status"],
+            "latency_ms": round(latency_ms, 2),
+            "db_queries": stats.count,
+            "db_ms": round(stats.duration * 1000, 2),
+            "bytes_in": response["bytes_in"],
+            "bytes_out": response["bytes_out"],
+            "client": scope["client"][0] if scope.get("client") else None,
+        }
+        if self.log_headers:
+            entry["headers"] = {
+                name.decode("latin-1"): "[redacted]" if name.decode("latin-1") in REDACTED_HEADERS
+                else value.decode("latin-1")
+                for name, value in scope["headers"]
+                if name in self.log_headers
+            }
+        logger.info(json.dumps(entry))
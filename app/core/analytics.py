@@ -0,0 +1,189 @@
+"""Vectorized attendance analytics for the supervisor dashboard.
+
+Rows are pulled from ``attendance_daily_rollups`` in a single query, turned into
+NumPy column arrays and aggregated without per-row Python loops.
+"""
+from datetime import date
+from typing import Dict, Optional
+import uuid
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.timezones import as_utc, get_zone
+from app.models.models import AttendanceDailyRollup, AttendanceStatus, Dormitory, Student
+
+PRESENT, LATE, ABSENT = 0, 1, 2
+STATUS_CODES = {AttendanceStatus.PRESENT: PRESENT, AttendanceStatus.LATE: LATE, AttendanceStatus.ABSENT: ABSENT}
+
+
+def _encode(values: list) -> tuple:
+    """Map arbitrary hashable values (UUIDs, None) to dense integer codes."""
+    codes: Dict[object, int] = {}
+    encoded = np.fromiter((codes.setdefault(value, len(codes)) for value in values), dtype=np.int64, count=len(values))
+    return encoded, list(codes)
+
+
+def _streaks(mask: np.ndarray, student_idx: np.ndarray, n_students: int) -> tuple:
+    """Longest and current run of consecutive ``mask`` records per student.
+
+    Expects the arrays sorted by (student, day).
+    """
+    longest = np.zeros(n_students, dtype=np.int64)
+    current = np.zeros(n_students, dtype=np.int64)
+    if not mask.any():
+        return longest, current
+    same_student = np.r_[False, student_idx[1:] == student_idx[:-1]]
+    starts = mask & ~(np.r_[False, mask[:-1]] & same_student)
+    run_id = np.cumsum(starts) - 1
+    lengths = np.bincount(run_id[mask])
+    np.maximum.at(longest, student_idx[starts], lengths)
+    is_last = np.r_[student_idx[1:] != student_idx[:-1], True]
+    ends = is_last & mask
+    current[student_idx[ends]] = lengths[run_id[ends]]
+    return longest, current
+
+
+def compute_attendance_analytics(
+    student_idx: np.ndarray,
+    group_idx: np.ndarray,
+    days: np.ndarray,
+    status: np.ndarray,
+    check_in_hour: np.ndarray,
+    n_students: int,
+    n_groups: int,
+) -> dict:
+    """Aggregate per-record columns into rates, streaks and histograms.
+
+    ``days`` is ``datetime64[D]``, ``status`` holds the PRESENT/LATE/ABSENT codes
+    and ``check_in_hour`` is the local check-in hour or -1 when there was none.
+    """
+    order = np.lexsort((days, student_idx))
+    student_idx, group_idx, days = student_idx[order], group_idx[order], days[order]
+    status, check_in_hour = status[order], check_in_hour[order]
+    attended = status != ABSENT
+
+    months, month_idx = np.unique(days.astype("datetime64[M]"), return_inverse=True)
+    n_months = len(months)
+    cells = group_idx * n_months + month_idx
+    totals = np.bincount(cells, minlength=n_groups * n_months).reshape(n_groups, n_months)
+    attended_totals = np.bincount(cells, weights=attended, minlength=n_groups * n_months).reshape(n_groups, n_months)
+    group_totals = totals.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        monthly_rate = attended_totals / totals
+        overall_rate = attended_totals.sum(axis=1) / group_totals
+
+    longest_late, current_late = _streaks(status == LATE, student_idx, n_students)
+    longest_absent, current_absent = _streaks(status == ABSENT, student_idx, n_students)
+    student_group = np.zeros(n_students, dtype=np.int64)
+    student_group[student_idx] = group_idx
+    streaks = {}
+    for name, values in (
+        ("longest_late_streak", longest_late),
+        ("current_late_streak", current_late),
+        ("longest_absence_streak", longest_absent),
+        ("current_absence_streak", current_absent),
+    ):
+        per_group = np.zeros(n_groups, dtype=np.int64)
+        np.maximum.at(per_group, student_group, values)
+        streaks[name] = per_group
+
+    # 1970-01-01 was a Thursday; shift so Monday is 0
+    weekday = (days.astype(np.int64) + 3) % 7
+    absent = status == ABSENT
+    absence_by_weekday = np.bincount(
+        group_idx[absent] * 7 + weekday[absent], minlength=n_groups * 7
+    ).reshape(n_groups, 7)
+    has_hour = check_in_hour >= 0
+    check_in_heatmap = np.bincount(
+        weekday[has_hour] * 24 + check_in_hour[has_hour], minlength=7 * 24
+    ).reshape(7, 24)
+    late_hours = check_in_hour[(status == LATE) & has_hour]
+    late_by_hour = np.bincount(late_hours, minlength=24)
+
+    return {
+        "months": [str(month) for month in months],
+        "records": group_totals,
+        "overall_rate": overall_rate,
+        "monthly_rate": monthly_rate,
+        **streaks,
+        "absence_by_weekday": absence_by_weekday,
+        "check_in_heatmap": check_in_heatmap,
+        "late_by_hour": late_by_hour,
+    }
+
+
+def _rates_to_json(values: np.ndarray) -> list:
+    rounded = np.round(values, 3)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+def attendance_analytics(
+    db: Session,
+    dormitory_id: Optional[uuid.UUID] = None,
+    schedule_id: Optional[uuid.UUID] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    group_by: str = "student",
+) -> dict:
+    """Run the analytics over the rollup table and return compact, columnar JSON."""
+    Rollup = AttendanceDailyRollup
+    query = db.query(
+        Rollup.student_id,
+        Student.room_id,
+        Rollup.day,
+        Rollup.final_status,
+        Rollup.first_check_in,
+        Dormitory.timezone,
+    ).join(Student, Student.id == Rollup.student_id).join(Dormitory, Dormitory.id == Rollup.dormitory_id)
+    if dormitory_id:
+        query = query.filter(Rollup.dormitory_id == dormitory_id)
+    if schedule_id:
+        query = query.filter(Rollup.schedule_id == schedule_id)
+    if date_from:
+        query = query.filter(Rollup.day >= date_from)
+    if date_to:
+        query = query.filter(Rollup.day <= date_to)
+
+    rows = query.all()
+    if not rows:
+        return {"group_by": group_by, "groups": [], "months": []}
+    student_ids, room_ids, days, statuses, check_ins, tz_names = zip(*rows)
+
+    student_idx, students = _encode(student_ids)
+    if group_by == "room":
+        group_idx, groups = _encode(room_ids)
+    else:
+        group_idx, groups = student_idx, students
+
+    zones = {tz_name: get_zone(tz_name) for tz_name in set(tz_names)}
+    hours = np.fromiter(
+        (as_utc(ts).astimezone(zones[tz]).hour if ts is not None else -1 for ts, tz in zip(check_ins, tz_names)),
+        dtype=np.int64,
+        count=len(rows),
+    )
+    result = compute_attendance_analytics(
+        student_idx,
+        group_idx,
+        np.array(days, dtype="datetime64[D]"),
+        np.fromiter((STATUS_CODES[s] for s in statuses), dtype=np.int8, count=len(rows)),
+        hours,
+        len(students),
+        len(groups),
+    )
+
+    return {
+        "group_by": group_by,
+        "groups": [str(group) if group is not None else None for group in groups],
+        "months": result["months"],
+        "records": result["records"].tolist(),
+        "overall_rate": _rates_to_json(result["overall_rate"]),
+        "monthly_rate": _rates_to_json(result["monthly_rate"]),
+        "longest_late_streak": result["longest_late_streak"].tolist(),
+        "current_late_streak": result["current_late_streak"].tolist(),
+        "longest_absence_streak": result["longest_absence_streak"].tolist(),
+        "current_absence_streak": result["current_absence_streak"].tolist(),
+        "absence_by_weekday": result["absence_by_weekday"].tolist(),
+        "check_in_heatmap": result["check_in_heatmap"].tolist(),
+        "late_by_hour": result["late_by_hour"].tolist(),
+    }
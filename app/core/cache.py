@@ -0,0 +1,229 @@
+"""Small caches with TTL expiry and explicit invalidation.
+
+``TTLCache`` lives in one process. ``SharedCache`` puts the same in-process
+LRU in front of an optional shared tier configured by ``CACHE_BACKEND_URL``
+(see ``app.core.cache_backends``), so one worker's result serves the others.
+Invalidating a ``SharedCache`` also deletes the shared entry and tells every
+worker to drop its local copy. The invalidation listener runs from the
+application lifespan. The TTL bounds how stale a worker can get if it misses a
+message.
+
+Shared keys carry a generation number kept in the backend. Invalidating a
+whole cache bumps the generation instead of finding and deleting its keys;
+entries of older generations are never read again and expire with their TTL.
+Each worker remembers the generation and re-reads it after an invalidation
+message or once per TTL.
+"""
+import logging
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+from app.core.cache_backends import CacheBackend, backend_from_url
+from app.core.config import settings
+from app.core.leases import WORKER_ID
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "dms:cache:"
+
+# Named caches, reported on /metrics
+caches: Dict[str, Union["TTLCache", "SharedCache"]] = {}
+
+
+class TTLCache:
+    """Thread-safe LRU mapping whose entries expire ``ttl`` seconds after being set."""
+
+    def __init__(self, ttl: float, maxsize: int = 1024, name: Optional[str] = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if name:
+            caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            elif len(self._data) >= self.maxsize:
+                # Least recently used first
+                self._data.popitem(last=False)
+            self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SharedCache:
+    """``TTLCache`` backed by the shared tier, with invalidation broadcast to every worker.
+
+    Keys are identified across workers by their ``repr``, so use strings,
+    numbers, UUIDs, None or tuples of those. Values must be picklable.
+    Without a configured backend it behaves like a plain ``TTLCache``.
+    """
+
+    def __init__(self, name: str, ttl: float, maxsize: int = 1024, backend: Optional[CacheBackend] = None):
+        self.name = name
+        self.ttl = ttl
+        self.local = TTLCache(ttl=ttl, maxsize=maxsize)
+        self._backend = backend
+        # (generation, monotonic time it was read); None until first needed
+        self._generation: Optional[Tuple[int, float]] = None
+        self.hits = 0
+        self.misses = 0
+        caches[name] = self
+
+    @property
+    def backend(self) -> Optional[CacheBackend]:
+        return self._backend if self._backend is not None else shared_backend()
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{KEY_PREFIX}{self.name}:generation"
+
+    def _current_generation(self, backend: CacheBackend) -> int:
+        cached = self._generation
+        if cached is not None and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+        raw = backend.get(self._generation_key)
+        generation = int(raw) if raw is not None else 0
+        self._generation = (generation, time.monotonic())
+        return generation
+
+    def _key(self, backend: CacheBackend, key: Hashable) -> str:
+        return f"{KEY_PREFIX}{self.name}:{self._current_generation(backend)}:{key!r}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        local_key = repr(key)
+        value = self.local.get(local_key)
+        if value is not None:
+            self.hits += 1
+            return value
+        backend = self.backend
+        if backend is not None:
+            try:
+                raw = backend.get(self._key(backend, key))
+            except Exception:
+                logger.warning("Shared cache read failed for %s", self.name, exc_info=True)
+                raw = None
+            if raw is not None:
+                value = pickle.loads(raw)
+                self.local.set(local_key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.local.set(repr(key), value)
+        backend = self.backend
+        if backend is not None:
+            try:
+                backend.set(self._key(backend, key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), self.ttl)
+            except Exception:
+                logger.warning("Shared cache write failed for %s", self.name, exc_info=True)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when ``key`` is None, in every worker."""
+        local_key = None if key is None else repr(key)
+        self.local.invalidate(local_key)
+        backend = self.backend
+        if backend is None:
+            return
+        try:
+            if key is None:
+                self._generation = (backend.incr(self._generation_key), time.monotonic())
+            else:
+                backend.delete(self._key(backend, key))
+            backend.publish(f"{WORKER_ID}\t{self.name}\t{local_key or ''}")
+        except Exception:
+            logger.warning("Shared cache invalidation failed for %s", self.name, exc_info=True)
+
+    def __len__(self) -> int:
+        return len(self.local)
+
+
+_backend: Optional[CacheBackend] = None
+_backend_lock = threading.Lock()
+_listener: Optional[threading.Thread] = None
+_listener_stop = threading.Event()
+
+
+def shared_backend() -> Optional[CacheBackend]:
+    """The backend named by ``CACHE_BACKEND_URL``, created on first use."""
+    global _backend
+    if _backend is None and settings.CACHE_BACKEND_URL:
+        with _backend_lock:
+            if _backend is None:
+                _backend = backend_from_url(settings.CACHE_BACKEND_URL)
+    return _backend
+
+
+def _apply_invalidation(message: str) -> None:
+    sender, _, rest = message.partition("\t")
+    name, _, key = rest.partition("\t")
+    cache = caches.get(name)
+    if sender == WORKER_ID or not isinstance(cache, SharedCache):
+        return
+    if not key:
+        # The generation moved; read it again on next use
+        cache._generation = None
+    cache.local.invalidate(key or None)
+
+
+def start_cache_listener() -> None:
+    """Apply other workers' invalidations from a background thread, if a shared tier is configured."""
+    global _listener
+    backend = shared_backend()
+    if backend is None or _listener is not None:
+        return
+    _listener_stop.clear()
+    _listener = threading.Thread(
+        target=backend.listen, args=(_apply_invalidation, _listener_stop), name="cache-invalidation", daemon=True
+    )
+    _listener.start()
+
+
+def stop_cache_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener_stop.set()
+        _listener.join(timeout=5)
+        _listener = None
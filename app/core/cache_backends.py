@@ -0,0 +1,177 @@
+"""Shared cache tiers reachable from every worker.
+
+A backend stores pickled values under string keys with a TTL, keeps integer
+counters without one, and carries invalidation messages between workers:
+
+* ``redis://`` and ``rediss://`` use a Redis server (or anything speaking its
+  protocol) through the optional ``redis`` package. Messages go over pub/sub.
+* ``sqlite:///path/to/cache.db`` keeps entries in a local SQLite file in WAL
+  mode. It is a stand-in for single-box deployments with several workers.
+  Messages are rows in a table that each worker polls.
+
+Values are unpickled on read, so the shared tier must only be writable by
+this application.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+try:
+    import redis
+except ImportError:  # Only needed for a redis:// backend
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "dms:cache:invalidate"
+# Invalidation rows older than this are pruned from the SQLite stand-in
+INVALIDATION_RETENTION_SECONDS = 60.0
+# expires_at of SQLite counters, which never expire
+NEVER = float("inf")
+
+
+class CacheBackend:
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str) -> int:
+        """Add one to the counter at ``key`` (missing counts as 0) and return the new value."""
+        raise NotImplementedError
+
+    def publish(self, message: str) -> None:
+        raise NotImplementedError
+
+    def listen(self, callback: Callable[[str], None], stop: threading.Event) -> None:
+        """Call ``callback`` with every published message until ``stop`` is set."""
+        raise NotImplementedError
+
+
+class RedisBackend(CacheBackend):
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("A redis:// cache backend requires the redis package")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(key)
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+    def publish(self, message: str) -> None:
+        self.client.publish(INVALIDATION_CHANNEL, message)
+
+    def listen(self, callback: Callable[[str], None], stop: threading.Event) -> None:
+        while not stop.is_set():
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                while not stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        callback(message["data"].decode("utf-8"))
+            except redis.RedisError:
+                logger.warning("Cache invalidation subscription lost; reconnecting", exc_info=True)
+                stop.wait(1.0)
+            finally:
+                pubsub.close()
+
+
+class SQLiteBackend(CacheBackend):
+    def __init__(self, path: str, poll_interval: float = 0.5):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_invalidations "
+            "(id INTEGER PRIMARY KEY AUTOINCREMENT, message TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One autocommit connection per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value FROM cache_entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl),
+        )
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def incr(self, key: str) -> int:
+        return self._connection().execute(
+            "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, 1, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1 RETURNING value",
+            (key, NEVER),
+        ).fetchone()[0]
+
+    def publish(self, message: str) -> None:
+        self._connection().execute(
+            "INSERT INTO cache_invalidations (message, created_at) VALUES (?, ?)", (message, time.time())
+        )
+
+    def listen(self, callback: Callable[[str], None], stop: threading.Event) -> None:
+        conn = self._connection()
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidations").fetchone()[0]
+        last_prune = time.monotonic()
+        while not stop.wait(self.poll_interval):
+            try:
+                rows = conn.execute(
+                    "SELECT id, message FROM cache_invalidations WHERE id > ? ORDER BY id", (last_id,)
+                ).fetchall()
+                for last_id, message in rows:
+                    callback(message)
+                if time.monotonic() - last_prune >= INVALIDATION_RETENTION_SECONDS:
+                    now = time.time()
+                    conn.execute(
+                        "DELETE FROM cache_invalidations WHERE created_at < ?", (now - INVALIDATION_RETENTION_SECONDS,)
+                    )
+                    conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+                    last_prune = time.monotonic()
+            except sqlite3.Error:
+                logger.warning("Cache invalidation poll failed", exc_info=True)
+
+
+def backend_from_url(url: Optional[str]) -> Optional[CacheBackend]:
+    """The backend for ``CACHE_BACKEND_URL``; None keeps caches in-process only."""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url)
+    if parsed.scheme == "sqlite":
+        # sqlite:///relative.db or sqlite:////absolute/path.db, as for DATABASE_URL
+        return SQLiteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported cache backend URL: {url}")
@@ -0,0 +1,206 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+zstd and brotli are used when their packages are installed and the client
+accepts them, gzip otherwise. Only textual content types are compressed;
+anything that already has a ``Content-Encoding`` is passed through.
+
+Responses sent in one piece are compressed when they reach
+``minimum_size``. Streaming responses (NDJSON lists, exports) are compressed
+chunk by chunk, and every chunk is flushed, so the client still receives each
+batch as soon as it is produced. Server-Sent Events are never compressed.
+Bodies or chunks of ``thread_threshold`` bytes or more are compressed in a
+worker thread to keep the event loop free.
+"""
+import asyncio
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional
+    zstandard = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/javascript",
+    "image/svg+xml",
+}
+UNCOMPRESSED_TYPES = {"text/event-stream"}
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.process(data)
+        return out + (self._compressor.finish() if final else self._compressor.flush())
+
+
+class _ZstdEncoder:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        out = self._compressor.compress(data)
+        if final:
+            return out + self._compressor.flush()
+        return out + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+
+# In order of preference when the client rates several encodings the same
+ENCODERS = {"gzip": _GzipEncoder}
+if brotli is not None:
+    ENCODERS = {"br": _BrotliEncoder, **ENCODERS}
+if zstandard is not None:
+    ENCODERS = {"zstd": _ZstdEncoder, **ENCODERS}
+
+
+def parse_quality_list(header: str) -> Dict[str, float]:
+    """An ``Accept``-style header (``Accept-Encoding``, ``Accept``) as ``{value: q}``, lowercased."""
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header: str, available: Iterable[str] = ENCODERS) -> Optional[str]:
+    """The best available coding the client accepts, or None for identity."""
+    accepted = parse_quality_list(header)
+    best, best_quality = None, 0.0
+    for coding in available:
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def _compressible(content_type: str) -> bool:
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type in UNCOMPRESSED_TYPES:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def _vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            if b"accept-encoding" not in value.lower() and value.strip() != b"*":
+                headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    headers.append((b"vary", b"Accept-Encoding"))
+    return headers
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware compressing response bodies; see the module docstring."""
+
+    def __init__(self, app, minimum_size: int = 1024, thread_threshold: int = 256 * 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.thread_threshold = thread_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        header = next((value for name, value in scope["headers"] if name == b"accept-encoding"), b"")
+        coding = negotiate_encoding(header.decode("latin-1"))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        state = {"start": None, "encoder": None, "passthrough": False}
+
+        async def compressing_send(message):
+            if message["type"] == "http.response.start":
+                headers = dict((name.lower(), value) for name, value in message.get("headers", []))
+                length = headers.get(b"content-length")
+                if (
+                    message["status"] in (204, 304)
+                    or b"content-encoding" in headers
+                    or not _compressible(headers.get(b"content-type", b"").decode("latin-1"))
+                    or (length is not None and int(length) < self.minimum_size)
+                ):
+                    state["passthrough"] = True
+                    await send(message)
+                else:
+                    # Held back until the first body message shows whether to compress
+                    state["start"] = message
+                return
+            if message["type"] != "http.response.body" or state["passthrough"]:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            start, state["start"] = state["start"], None
+            if start is not None and not more_body and len(body) < self.minimum_size:
+                state["passthrough"] = True
+                await send(start)
+                await send(message)
+                return
+            if start is not None:
+                state["encoder"] = ENCODERS[coding]()
+            if len(body) >= self.thread_threshold:
+                body = await asyncio.to_thread(state["encoder"].compress, body, not more_body)
+            else:
+                body = state["encoder"].compress(body, not more_body)
+            if start is not None:
+                # A body sent in one piece keeps an exact Content-Length; a stream goes chunked
+                await send(self._compressed_start(start, coding, None if more_body else len(body)))
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        await self.app(scope, receive, compressing_send)
+
+    @staticmethod
+    def _compressed_start(start: dict, coding: str, length: Optional[int]) -> dict:
+        headers = []
+        for name, value in start.get("headers", []):
+            lowered = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                # The compressed bytes differ, so a strong validator no longer holds
+                value = b"W/" + value
+            headers.append((name, value))
+        headers.append((b"content-encoding", coding.encode("latin-1")))
+        if length is not None:
+            headers.append((b"content-length", str(length).encode("latin-1")))
+        return {**start, "headers": _vary(headers)}
@@ -0,0 +1,105 @@
+"""HTTP conditional requests for slowly-changing resources.
+
+Every resource that clients poll (dormitories, rooms, schedules, system
+config) has a row in ``resource_versions`` whose counter is bumped in the
+same transaction as any write to it. A read endpoint hashes the counters it
+depends on, together with the request and the caller, into a weak ETag:
+
+    not_modified = conditional_get(request, response, db, current_user, ROOM_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
+When the client's ``If-None-Match`` still matches, the 304 is answered after
+one primary-key SELECT, before any rows are loaded. Responses are marked
+``Cache-Control: private, no-cache`` so browsers and proxies keep them per
+user and revalidate on every use.
+"""
+import hashlib
+from typing import Dict, Iterable, Optional, Sequence
+
+from fastapi import Request, Response
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import ResourceVersion
+
+CACHE_CONTROL = "private, no-cache"
+VARY = "Authorization, Accept"
+
+
+def bump_version(db: Session, *names: str) -> None:
+    """Bump the counters of ``names`` in the caller's transaction; the caller commits."""
+    for name in names:
+        bumped = db.execute(
+            update(ResourceVersion)
+            .where(ResourceVersion.name == name)
+            .values(version=ResourceVersion.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if bumped:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(ResourceVersion).values(name=name, version=1))
+        except IntegrityError:
+            # Another request created the row first
+            db.execute(
+                update(ResourceVersion)
+                .where(ResourceVersion.name == name)
+                .values(version=ResourceVersion.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+
+
+def current_versions(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Counters of ``names`` in one query; a resource never written to is at 0."""
+    names = sorted(set(names))
+    versions = dict.fromkeys(names, 0)
+    versions.update(db.execute(
+        select(ResourceVersion.name, ResourceVersion.version).where(ResourceVersion.name.in_(names))
+    ).all())
+    return versions
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header (RFC 9110 13.1.2)."""
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session,
+    current_user,
+    resources: Sequence[str],
+    *extra,
+) -> Optional[Response]:
+    """Set ETag and Cache-Control on ``response``; return a 304 if the client's copy is current.
+
+    The tag covers the resources' counters, the path and query string, the
+    ``Accept`` header and the caller's id, role and dormitory, since those
+    decide what the endpoint returns. ``extra`` adds anything else the body
+    depends on, e.g. the current minute for a filter on "now".
+    """
+    key = "|".join(str(part) for part in (
+        sorted(current_versions(db, resources).items()),
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        request.headers.get("accept", ""),
+        current_user.id,
+        current_user.role,
+        current_user.dormitory_id,
+        *extra,
+    ))
+    etag = f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+    if _matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -1,3 +1,4 @@
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -7,6 +8,27 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_MINUTES: int
     UNKNOWN_RFID_RETENTION_DAYS: int = 30  # Default to 30 days
+    DEFAULT_TIMEZONE: str = "UTC"  # Used when a dormitory has no timezone set
+    DASHBOARD_CACHE_TTL_SECONDS: int = 15
+    CACHE_BACKEND_URL: Optional[str] = None  # redis://... or sqlite:///cache.db to share caches between workers
+    LATE_GRACE_MINUTES: int = 10  # First check-in later than this after a window opens counts as LATE
+    JOB_SCHEDULER_ENABLED: bool = True  # Run background jobs in this process (one worker leads)
+    JOB_RUN_RETENTION_DAYS: int = 14
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0  # Fraction of requests logged; 5xx and slow requests always are
+    ACCESS_LOG_SLOW_REQUEST_MS: float = 1000
+    ACCESS_LOG_HEADERS: List[str] = ["user-agent"]  # Credentials among these are logged as [redacted]
+    QUERY_AUDIT_DEBUG: bool = False  # Audit every request and fail those over their query budget
+    QUERY_AUDIT_SAMPLE_RATE: float = 0.01  # Fraction of requests audited otherwise
+    QUERY_BUDGET_DEFAULT: Optional[int] = None  # Budget for routes without @query_budget
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SLOW_QUERY_LOG_SIZE: int = 500  # Entries kept in memory per worker
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = 0.0  # Fraction of slow SELECTs re-run under EXPLAIN
+    SLOW_QUERY_DUMP_PATH: str = "slow_queries.jsonl"
+    PROFILE_TOKEN: Optional[str] = None  # When set, requests with "X-Profile-Token: <token>" run under cProfile
+    SYSTEM_CONFIG_POLL_SECONDS: float = 5  # How often each worker checks system_config for changes
+    COMPRESSION_MINIMUM_SIZE: int = 1024  # Smaller responses are sent uncompressed
+    COMPRESSION_THREAD_THRESHOLD: int = 262144  # Bodies or stream chunks this large are compressed off the event loop
+    METRICS_TOKEN: Optional[str] = None  # When set, /metrics requires "Authorization: Bearer <token>"
 
     class Config:
         env_file = ".env"
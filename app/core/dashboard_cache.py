@@ -0,0 +1,128 @@
+"""Dashboard summaries cached per dormitory, and their invalidation.
+
+A summary is cached under its dormitory id, or ``ALL_DORMITORIES`` for admins
+without a dormitory, whose summary covers everything. A commit that writes
+students, tickets, attendance or schedules drops the summaries of the
+dormitories those rows belong to, plus the all-dormitories one. Unknown RFIDs
+are not tied to a dormitory and appear in every summary, so writing one drops
+them all.
+
+ORM writes are picked up from the session after each flush. Statements that
+bypass the unit of work, such as the absences job's bulk insert and update,
+call ``mark_summaries_stale`` themselves.
+"""
+from typing import Iterable, Optional, Set
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import SharedCache
+from app.core.config import settings
+from app.models.models import Attendance, AttendanceSchedule, Student, Ticket, UnknownRFID, User
+
+ALL_DORMITORIES = "all"
+# session.info entry: dormitory ids to invalidate on commit; None in it means every summary
+_STALE = "dashboard_summaries_stale"
+
+summary_cache = SharedCache("dashboard_summary", ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+def summary_key(dormitory_id) -> object:
+    """Cache key of a summary; ``None`` is the all-dormitories summary only admins get."""
+    return dormitory_id or ALL_DORMITORIES
+
+
+def mark_summaries_stale(session: Session, dormitory_ids: Iterable) -> None:
+    """Drop these dormitories' summaries (and the all-dormitories one) once ``session`` commits."""
+    stale: Set = session.info.setdefault(_STALE, set())
+    stale.add(ALL_DORMITORIES)
+    stale.update(dormitory_id for dormitory_id in dormitory_ids if dormitory_id is not None)
+
+
+def _values(obj, attribute: str) -> Set:
+    """Current and, if it changed in this flush, previous value of a loaded attribute."""
+    state = inspect(obj)
+    values = {state.dict.get(attribute)}
+    values.update(state.attrs[attribute].history.deleted or ())
+    return values - {None}
+
+
+def _loaded(session: Session, model, ident, attribute: str) -> Optional[object]:
+    """``attribute`` of an instance already in the identity map, without loading anything."""
+    if ident is None:
+        return None
+    obj = session.identity_map.get(Session.identity_key(model, ident))
+    return inspect(obj).dict.get(attribute) if obj is not None else None
+
+
+def _dormitories_of(session: Session, model, ids: Set) -> Set:
+    """Look up the dormitories of rows whose dormitory is not loaded, in one query."""
+    if not ids:
+        return set()
+    rows = session.connection().execute(select(model.dormitory_id).where(model.id.in_(ids)))
+    return {dormitory_id for dormitory_id, in rows}
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_summaries(session, flush_context):
+    dormitory_ids = set()
+    # Rows whose dormitory is looked up afterwards: {model: ids}
+    lookups = {Student: set(), AttendanceSchedule: set(), User: set()}
+    touched = everything = False
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        state = inspect(obj)
+        if isinstance(obj, (Student, AttendanceSchedule)):
+            if "dormitory_id" in state.dict or state.identity is None:
+                dormitory_ids |= _values(obj, "dormitory_id")
+            else:
+                # Expired since it was loaded
+                lookups[type(obj)].add(state.identity[0])
+        elif isinstance(obj, Attendance):
+            student_id = state.dict.get("student_id")
+            dormitory_id = _loaded(session, Student, student_id, "dormitory_id") or _loaded(
+                session, AttendanceSchedule, state.dict.get("schedule_id"), "dormitory_id"
+            )
+            if dormitory_id is not None:
+                dormitory_ids.add(dormitory_id)
+            elif student_id is not None:
+                lookups[Student].add(student_id)
+        elif isinstance(obj, Ticket):
+            # Tickets belong to the dormitory of the staff member who created them
+            creator_id = state.dict.get("created_by")
+            dormitory_id = _loaded(session, User, creator_id, "dormitory_id")
+            if dormitory_id is not None:
+                dormitory_ids.add(dormitory_id)
+            elif creator_id is not None:
+                lookups[User].add(creator_id)
+        elif isinstance(obj, UnknownRFID):
+            everything = True
+        else:
+            continue
+        touched = True
+
+    if not touched:
+        return
+    if everything:
+        session.info.setdefault(_STALE, set()).add(None)
+        return
+    for model, ids in lookups.items():
+        dormitory_ids |= _dormitories_of(session, model, ids)
+    # Also when no dormitory was found: the all-dormitories summary counts every row
+    mark_summaries_stale(session, dormitory_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_summaries(session):
+    stale = session.info.pop(_STALE, None)
+    if not stale:
+        return
+    if None in stale:
+        summary_cache.invalidate()
+        return
+    for key in stale:
+        summary_cache.invalidate(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_summaries(session):
+    session.info.pop(_STALE, None)
@@ -2,11 +2,20 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .slow_queries import SlowQueryLog
 
 engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Statements slower than SLOW_QUERY_THRESHOLD_MS, kept for the diagnostics endpoints
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    capacity=settings.SLOW_QUERY_LOG_SIZE,
+    explain_sample_rate=settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+)
+slow_query_log.install(engine)
+
 def get_db():
     db = SessionLocal()
     try:
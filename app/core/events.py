@@ -0,0 +1,114 @@
+"""In-process publish/subscribe for live door activity.
+
+``record_rfid_scan`` publishes scans, unknown tags and check-in/out transitions
+here; the event stream endpoint fans them out to connected dashboards. Every
+subscriber has a bounded queue. A subscriber that falls behind far enough to
+fill it is dropped instead of slowing down publishing or growing memory.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Put in a dropped subscriber's queue so its consumer stops waiting
+DROPPED = {"type": "dropped", "data": {"reason": "subscriber queue overflow"}}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+class Subscription:
+    def __init__(self, broker: "EventBroker", dormitory_id: Optional[uuid.UUID], maxsize: int):
+        self.broker = broker
+        self.dormitory_id = dormitory_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = False
+
+    def _deliver(self, event: dict) -> None:
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            self.broker.unsubscribe(self, dropped=True)
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(DROPPED)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """Next event, or None when ``timeout`` passes without one."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Subscription] = {}
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    def subscribe(self, dormitory_id: Optional[uuid.UUID] = None) -> Subscription:
+        """Subscribe from inside the event loop; ``dormitory_id=None`` receives every dormitory."""
+        subscription = Subscription(self, dormitory_id, self.queue_size)
+        with self._lock:
+            self._subscribers[id(subscription)] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription, dropped: bool = False) -> None:
+        with self._lock:
+            if self._subscribers.pop(id(subscription), None) is not None and dropped:
+                self.dropped_subscribers += 1
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, dormitory_id: Optional[uuid.UUID], **data: Any) -> None:
+        """Fan an event out without blocking; safe to call from worker threads."""
+        event = {
+            "type": event_type,
+            "dormitory_id": _plain(dormitory_id),
+            "published_at": time.time(),
+            "data": {key: _plain(value) for key, value in data.items()},
+        }
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        self.published += 1
+        if not subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for subscription in subscribers:
+            if subscription.dormitory_id is not None and subscription.dormitory_id != dormitory_id:
+                continue
+            if subscription.loop is running:
+                subscription._deliver(event)
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is gone (worker shutting down)
+                self.unsubscribe(subscription)
+
+
+broker = EventBroker()
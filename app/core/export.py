@@ -0,0 +1,171 @@
+"""Streaming attendance exports.
+
+Rows are read through a server-side cursor in ``yield_per`` batches and encoded
+batch by batch, so memory use does not grow with the size of the export.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Optional
+import uuid
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.core.timezones import as_utc
+from app.models.models import Attendance, AttendanceSchedule, Student
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+EXPORT_BATCH_SIZE = 5000
+
+EXPORT_COLUMNS = (
+    ("attendance_id", Attendance.id),
+    ("timestamp", Attendance.timestamp),
+    ("status", Attendance.status),
+    ("notes", Attendance.notes),
+    ("student_id", Student.id),
+    ("student_name", Student.name),
+    ("student_surname", Student.surname),
+    ("rfid_tag", Student.rfid_tag),
+    ("room_id", Student.room_id),
+    ("schedule_id", AttendanceSchedule.id),
+    ("schedule_name", AttendanceSchedule.name),
+    ("dormitory_id", AttendanceSchedule.dormitory_id),
+    ("recorded_by_id", Attendance.recorded_by_id),
+)
+FIELD_NAMES = [name for name, _ in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def parquet_available() -> bool:
+    return pa is not None
+
+
+def build_export_query(
+    dormitory_id: Optional[uuid.UUID] = None,
+    schedule_id: Optional[uuid.UUID] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    stmt = (
+        select(*[column for _, column in EXPORT_COLUMNS])
+        .join(Student, Attendance.student_id == Student.id)
+        .join(AttendanceSchedule, Attendance.schedule_id == AttendanceSchedule.id)
+        .order_by(Attendance.timestamp, Attendance.id)
+    )
+    if dormitory_id:
+        stmt = stmt.where(AttendanceSchedule.dormitory_id == dormitory_id)
+    if schedule_id:
+        stmt = stmt.where(Attendance.schedule_id == schedule_id)
+    if start:
+        stmt = stmt.where(Attendance.timestamp >= start)
+    if end:
+        stmt = stmt.where(Attendance.timestamp < end)
+    return stmt
+
+
+def _plain(value):
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+def _batches(stmt) -> Iterator[list]:
+    # A dedicated session: the response body outlives the request's dependencies
+    db = SessionLocal()
+    try:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        for partition in result.partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def stream_csv(stmt) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FIELD_NAMES)
+    for batch in _batches(stmt):
+        writer.writerows([_plain(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def stream_ndjson(stmt) -> Iterator[bytes]:
+    for batch in _batches(stmt):
+        yield "".join(
+            json.dumps(dict(zip(FIELD_NAMES, [_plain(value) for value in row]))) + "\n" for row in batch
+        ).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the generator in chunks."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_parquet(stmt) -> Iterator[bytes]:
+    schema = pa.schema([
+        (name, pa.timestamp("us", tz="UTC") if name == "timestamp" else pa.string())
+        for name in FIELD_NAMES
+    ])
+    timestamp_position = FIELD_NAMES.index("timestamp")
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for batch in _batches(stmt):
+            # Each batch becomes one row group, flushed to the client straight away
+            columns = []
+            for position, column in enumerate(zip(*batch)):
+                if position == timestamp_position:
+                    values = [as_utc(value) if value else None for value in column]
+                    columns.append(pa.array(values, type=schema[position].type))
+                else:
+                    columns.append(pa.array([_plain(value) for value in column], type=pa.string()))
+            writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+    "parquet": stream_parquet,
+}
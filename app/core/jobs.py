@@ -0,0 +1,277 @@
+"""Periodic background jobs run inside the API process.
+
+Every worker starts a ``JobScheduler`` from the application lifespan, but only
+the worker holding the ``job_scheduler`` lease runs scheduled jobs; the others
+keep trying to take the lease so one of them steps in if the leader dies.
+Each job runs in a worker thread with its own session and every run is stored
+in ``job_runs``. A run, scheduled or manual, first takes the job's own
+``job:<name>`` lease, so at most one instance runs at a time across all
+workers; a manual run on a worker that is not the leader cannot overlap the
+leader's scheduled one.
+
+Timeouts cannot interrupt a running thread. A run that exceeds its timeout is
+reported as ``timeout`` and the job is not started again until it returns.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.absences import close_finished_windows
+from app.core.database import SessionLocal
+from app.core.leases import WORKER_ID, acquire_lease, release_lease
+from app.core.rollups import refresh_attendance_rollups
+from app.core.runtime_config import RetentionConfig, system_config
+from app.core.timezones import to_db_datetime
+from app.models.models import BlacklistedToken, JobRun, UnknownRFID
+
+logger = logging.getLogger(__name__)
+
+LEADER_LEASE_NAME = "job_scheduler"
+LEADER_LEASE_TTL = timedelta(seconds=30)
+# A job's lease outlives its timeout, since a timed-out thread keeps running
+JOB_LEASE_TIMEOUTS = 2
+TICK_SECONDS = 5.0
+# Durations kept per job for the latency percentiles
+LATENCY_WINDOW = 100
+
+
+class Job:
+    def __init__(self, name: str, func: Callable[[Session], Any], interval: float, timeout: float, jitter: float):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.timeout = timeout
+        self.jitter = jitter
+        self.next_run = time.monotonic() + random.uniform(0, jitter)
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.last_status: Optional[str] = None
+        self.last_started_at: Optional[datetime] = None
+        self.durations = deque(maxlen=LATENCY_WINDOW)
+
+    @property
+    def lease_name(self) -> str:
+        return f"job:{self.name}"
+
+    def schedule_next(self) -> None:
+        self.next_run = time.monotonic() + self.interval + random.uniform(0, self.jitter)
+
+    def stats(self) -> dict:
+        durations = sorted(self.durations)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not durations:
+                return None
+            return round(durations[min(len(durations) - 1, int(len(durations) * fraction))], 1)
+
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval,
+            "timeout_seconds": self.timeout,
+            "running": self.running,
+            "next_run_in_seconds": round(max(0.0, self.next_run - time.monotonic()), 1),
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "last_status": self.last_status,
+            "last_started_at": self.last_started_at,
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+            "latency_ms_max": round(durations[-1], 1) if durations else None,
+        }
+
+
+class JobScheduler:
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+        self._runs: set = set()  # References to scheduled runs so they are not garbage collected
+        self._lock = threading.Lock()
+
+    def register(self, name: str, interval: float, timeout: float, jitter: Optional[float] = None):
+        """Decorator adding ``func(db)`` as a job every ``interval`` seconds (plus up to ``jitter``)."""
+        def decorator(func: Callable[[Session], Any]):
+            self.jobs[name] = Job(name, func, interval, timeout, interval * 0.1 if jitter is None else jitter)
+            return func
+        return decorator
+
+    def _execute(self, job: Job, trigger: str, timed_out: threading.Event) -> str:
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        db = SessionLocal()
+        result = error = None
+        try:
+            result = job.func(db)
+            run_status = "success"
+        except Exception as exc:
+            db.rollback()
+            run_status = "failed"
+            error = f"{type(exc).__name__}: {exc}"
+            logger.exception("Job %s failed", job.name)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if timed_out.is_set():
+            run_status = "timeout"
+
+        try:
+            release_lease(db, job.lease_name)
+        except Exception:
+            db.rollback()
+            logger.exception("Could not release the lease of job %s", job.name)
+
+        with self._lock:
+            job.running = False
+            job.runs += 1
+            job.last_status = run_status
+            job.last_started_at = started_at
+            job.durations.append(duration_ms)
+            if run_status == "failed":
+                job.failures += 1
+
+        try:
+            dialect_name = db.get_bind().dialect.name
+            db.add(JobRun(
+                job_name=job.name,
+                trigger=trigger,
+                worker=WORKER_ID,
+                status=run_status,
+                started_at=to_db_datetime(started_at, dialect_name),
+                finished_at=to_db_datetime(datetime.now(timezone.utc), dialect_name),
+                duration_ms=int(duration_ms),
+                result=None if result is None else str(result)[:1000],
+                error=error,
+            ))
+            db.commit()
+        except Exception:
+            logger.exception("Could not record run of job %s", job.name)
+        finally:
+            db.close()
+        return run_status
+
+    def _claim_job(self, job: Job) -> bool:
+        db = SessionLocal()
+        try:
+            return acquire_lease(db, job.lease_name, timedelta(seconds=job.timeout * JOB_LEASE_TIMEOUTS))
+        except Exception:
+            logger.exception("Lease check for job %s failed", job.name)
+            return False
+        finally:
+            db.close()
+
+    async def run_job(self, name: str, trigger: str = "manual") -> Optional[str]:
+        """Run a job now and wait for it; None if it is already running here or on another worker."""
+        job = self.jobs[name]
+        with self._lock:
+            if job.running:
+                return None
+            job.running = True
+        if not await asyncio.to_thread(self._claim_job, job):
+            with self._lock:
+                job.running = False
+            return None
+        timed_out = threading.Event()
+        future = asyncio.ensure_future(asyncio.to_thread(self._execute, job, trigger, timed_out))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), job.timeout)
+        except asyncio.TimeoutError:
+            # The thread keeps going; _execute records the run as a timeout
+            timed_out.set()
+            with self._lock:
+                job.timeouts += 1
+            logger.warning("Job %s exceeded its %ss timeout", job.name, job.timeout)
+            return "timeout"
+
+    def _claim_leadership(self) -> bool:
+        db = SessionLocal()
+        try:
+            return acquire_lease(db, LEADER_LEASE_NAME, LEADER_LEASE_TTL)
+        except Exception:
+            logger.exception("Job scheduler lease check failed")
+            return False
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while True:
+            leader = await asyncio.to_thread(self._claim_leadership)
+            if leader != self.is_leader:
+                logger.info("Worker %s %s job scheduler leadership", WORKER_ID, "took" if leader else "lost")
+                self.is_leader = leader
+            if leader:
+                now = time.monotonic()
+                for job in self.jobs.values():
+                    if not job.running and job.next_run <= now:
+                        job.schedule_next()
+                        run = asyncio.ensure_future(self.run_job(job.name, trigger="schedule"))
+                        self._runs.add(run)
+                        run.add_done_callback(self._runs.discard)
+            await asyncio.sleep(TICK_SECONDS + random.uniform(0, 1))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            # Hand over straight away instead of letting the lease run out
+            db = SessionLocal()
+            try:
+                await asyncio.to_thread(release_lease, db, LEADER_LEASE_NAME)
+            finally:
+                db.close()
+            self.is_leader = False
+
+
+scheduler = JobScheduler()
+
+
+@scheduler.register("attendance_rollups", interval=300, timeout=240)
+def refresh_rollups_job(db: Session) -> int:
+    return refresh_attendance_rollups(db)
+
+
+@scheduler.register("attendance_window_close", interval=60, timeout=120, jitter=5)
+def close_windows_job(db: Session) -> int:
+    return len(close_finished_windows(db))
+
+
+@scheduler.register("retention_cleanup", interval=3600, timeout=300)
+def retention_cleanup_job(db: Session) -> dict:
+    """Drop unknown RFID sightings and job history past their retention period."""
+    retention = system_config.section("retention", RetentionConfig)
+    now = datetime.utcnow()
+    unknown = db.query(UnknownRFID).filter(
+        UnknownRFID.last_seen < now - timedelta(days=retention.unknown_rfid_days)
+    ).delete(synchronize_session=False)
+    runs_cutoff = datetime.now(timezone.utc) - timedelta(days=retention.job_run_days)
+    runs = db.query(JobRun).filter(
+        JobRun.started_at < to_db_datetime(runs_cutoff, db.get_bind().dialect.name)
+    ).delete(synchronize_session=False)
+    db.commit()
+    return {"unknown_rfids": unknown, "job_runs": runs}
+
+
+@scheduler.register("blacklisted_token_purge", interval=3600, timeout=300)
+def purge_blacklisted_tokens_job(db: Session) -> int:
+    """Expired tokens are rejected by their own ``exp``; their blacklist rows are dead weight."""
+    purged = db.query(BlacklistedToken).filter(
+        BlacklistedToken.expires_at < datetime.utcnow()
+    ).delete(synchronize_session=False)
+    db.commit()
+    return purged
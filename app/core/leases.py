@@ -0,0 +1,61 @@
+"""Database leases for work that must run on one worker at a time.
+
+A lease is a row in ``job_leases`` owned by ``holder`` until ``expires_at``.
+Taking it is a single conditional UPDATE (or an INSERT for a new name), so two
+workers racing for the same lease cannot both win. Holders renew before
+expiry; a crashed holder's lease simply runs out.
+"""
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.timezones import to_db_datetime
+from app.models.models import JobLease
+
+# Identifies this process as a lease holder
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def acquire_lease(db: Session, name: str, ttl: timedelta, holder: str = WORKER_ID) -> bool:
+    """Take or renew the lease ``name`` for ``ttl`` and commit; False if someone else holds it."""
+    dialect_name = db.get_bind().dialect.name
+    now = datetime.now(timezone.utc)
+    values = {
+        "holder": holder,
+        "expires_at": to_db_datetime(now + ttl, dialect_name),
+        "acquired_at": to_db_datetime(now, dialect_name),
+    }
+    taken = db.execute(
+        update(JobLease)
+        .where(
+            JobLease.name == name,
+            (JobLease.holder == holder) | (JobLease.expires_at <= to_db_datetime(now, dialect_name)),
+        )
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not taken:
+        try:
+            db.execute(insert(JobLease).values(name=name, **values))
+            taken = 1
+        except IntegrityError:
+            # Held by another worker
+            db.rollback()
+            return False
+    db.commit()
+    return bool(taken)
+
+
+def release_lease(db: Session, name: str, holder: str = WORKER_ID) -> None:
+    db.execute(
+        update(JobLease)
+        .where(JobLease.name == name, JobLease.holder == holder)
+        .values(expires_at=to_db_datetime(datetime.now(timezone.utc), db.get_bind().dialect.name))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
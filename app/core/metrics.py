@@ -0,0 +1,221 @@
+"""In-process metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms keep one shard per thread. An update only
+touches the calling thread's shard, so the request path takes no locks and two
+threads never race on the same cell. Scrapes add the shards together. Values
+are per process: with several workers, scrape each one.
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.core.access_log import route_template
+from app.core.query_stats import current_query_stats, request_query_stats
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            # Once per thread; every later update is lock-free
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def _snapshot(self) -> List[dict]:
+        with self._shards_lock:
+            return [dict(shard) for shard in self._shards]
+
+    def _labels(self, values: Tuple, extra: Tuple = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def _totals(self) -> Dict[Tuple, float]:
+        totals: Dict[Tuple, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(labels)} {_number(value)}" for labels, value in sorted(self._totals().items())]
+
+
+class Gauge(Counter):
+    """A counter that can go down; shards may hold negative values, only the sum matters."""
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels) -> None:
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            cell = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        cell[bisect.bisect_left(self.buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def _samples(self) -> List[str]:
+        totals: Dict[Tuple, list] = {}
+        for shard in self._snapshot():
+            for labels, cell in shard.items():
+                total = totals.setdefault(labels, [0] * len(cell))
+                for i, value in enumerate(list(cell)):
+                    total[i] += value
+        lines = []
+        for labels, cell in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), cell):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(float(bound))
+                lines.append(f"{self.name}_bucket{self._labels(labels, (('le', le),))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_number(float(cell[-2]))}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cell[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Add a callable returning exposition lines, evaluated at scrape time."""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        for collector in self.collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route")
+))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served.", ("method",)
+))
+db_queries = registry.register(Counter(
+    "http_db_queries_total", "SQL statements executed while serving requests.", ("route",)
+))
+db_query_duration = registry.register(Counter(
+    "http_db_query_seconds_total", "Time spent in SQL statements while serving requests.", ("route",)
+))
+db_queries_per_request = registry.register(Histogram(
+    "http_db_queries_per_request", "SQL statements per request.", ("route",), buckets=QUERY_COUNT_BUCKETS
+))
+
+
+def sample_lines(
+    name: str,
+    documentation: str,
+    samples: Dict[str, float],
+    label: Optional[str] = None,
+    kind: str = "gauge",
+) -> List[str]:
+    """Exposition lines for values read at scrape time, one sample per ``label`` value."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for key, value in samples.items():
+        labels = f'{{{label}="{_escape(key)}"}}' if label else ""
+        lines.append(f"{name}{labels} {_number(value)}")
+    return lines
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request count, latency and SQL usage per route."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        started = time.perf_counter()
+        stats, token = request_query_stats(scope)
+        status_code = [500]
+
+        async def recording_send(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            http_requests_in_flight.dec(method)
+            if token is not None:
+                current_query_stats.reset(token)
+            route = route_template(scope) or "unmatched"
+            http_requests.inc(method, route, str(status_code[0]))
+            http_request_duration.observe(time.perf_counter() - started, method, route)
+            db_queries.inc(route, amount=stats.count)
+            db_query_duration.inc(route, amount=stats.duration)
+            db_queries_per_request.observe(stats.count, route)
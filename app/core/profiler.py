@@ -0,0 +1,182 @@
+"""On-demand profiling of a live worker.
+
+``sample_stacks`` polls ``sys._current_frames()`` from a background thread for a
+fixed duration and counts the stacks it sees. The result is in the collapsed
+format read by flamegraph.pl, speedscope and similar tools. Nothing runs
+between profiles.
+
+``RequestProfilerMiddleware`` runs one request under cProfile when it carries
+``X-Profile-Token: <PROFILE_TOKEN>``. The stats are kept in memory under the id
+returned in ``X-Profile-Id``. It is only added to the app when
+``PROFILE_TOKEN`` is set. cProfile follows the event-loop thread. From Python
+3.12 it also sees the threadpool that runs ``def`` endpoints; before that, their
+bodies show up as time spent waiting on the pool. Other requests served at the
+same time are mixed in, so profile on a quiet worker.
+"""
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Optional, Tuple
+
+# Leaf frames that mean "this thread is waiting", not working
+IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+_sampling_lock = threading.Lock()
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def sample_stacks(duration: float, interval: float = 0.005, include_idle: bool = False) -> Tuple[Counter, int]:
+    """Sample every thread's stack each ``interval`` seconds for ``duration`` seconds.
+
+    Returns collapsed stacks (``"thread;outer;...;leaf" -> count``) and the number of samples.
+    Raises ProfilerBusy if another sampling run is in progress.
+    """
+    if not _sampling_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already being taken on this worker")
+    try:
+        own_id = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                leaf = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if not include_idle and leaf in IDLE_LEAVES:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, str(thread_id)))
+                stacks[";".join(reversed(labels))] += 1
+            samples += 1
+            time.sleep(interval)
+        return stacks, samples
+    finally:
+        _sampling_lock.release()
+
+
+def collapsed(stacks: Counter) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+class RequestProfiles:
+    """The most recent per-request cProfile results, by id."""
+
+    def __init__(self, capacity: int = 20):
+        self.capacity = capacity
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id: str, method: str, path: str, profile: cProfile.Profile, duration_ms: float) -> None:
+        profile.create_stats()
+        with self._lock:
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "method": method,
+                "path": path,
+                "duration_ms": round(duration_ms, 2),
+                "captured_at": time.time(),
+                "stats": profile.stats,
+            }
+            while len(self._profiles) > self.capacity:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def summaries(self) -> list:
+        with self._lock:
+            return [
+                {key: value for key, value in entry.items() if key != "stats"}
+                for entry in reversed(self._profiles.values())
+            ]
+
+
+def stats_text(entry: dict, sort: str = "cumulative", limit: int = 60) -> str:
+    """pstats report of a stored profile."""
+    stream = io.StringIO()
+    stats = pstats.Stats(_StatsHolder(entry["stats"]), stream=stream)
+    stats.sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
+
+
+def stats_file(entry: dict) -> bytes:
+    """A stored profile in the .prof format read by pstats, snakeviz and gprof2dot."""
+    return marshal.dumps(entry["stats"])
+
+
+class _StatsHolder:
+    # pstats.Stats accepts any object with create_stats() and a stats dict
+    def __init__(self, stats: Dict):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+request_profiles = RequestProfiles()
+_request_profile_lock = threading.Lock()
+
+
+class RequestProfilerMiddleware:
+    def __init__(self, app, token: str, header: str = "x-profile-token"):
+        self.app = app
+        self.token = token.encode()
+        self.header = header.encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not hmac.compare_digest(dict(scope["headers"]).get(self.header, b""), self.token):
+            await self.app(scope, receive, send)
+            return
+        # One profiler per process; a second request asking meanwhile runs unprofiled
+        if not _request_profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, self._with_header(send, b"busy"))
+            return
+
+        profile = cProfile.Profile()
+        profile_id = uuid.uuid4().hex[:12]
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, self._with_header(send, profile_id.encode()))
+            finally:
+                profile.disable()
+        finally:
+            _request_profile_lock.release()
+        duration_ms = (time.perf_counter() - started) * 1000
+        request_profiles.add(profile_id, scope["method"], scope["path"], profile, duration_ms)
+
+    @staticmethod
+    def _with_header(send, value: bytes):
+        async def wrapped(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [(b"x-profile-id", value)]}
+            await send(message)
+        return wrapped
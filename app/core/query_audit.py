@@ -0,0 +1,123 @@
+"""SQL query budgets and N+1 detection per request.
+
+Audited requests tally their statements by shape (normalized text). A shape
+that runs ``N_PLUS_ONE_THRESHOLD`` times or more in one request is almost
+always a query issued inside a loop, and is reported as a probable N+1.
+Routes can declare how many statements they should need with
+``@query_budget(n)``.
+
+In debug mode (``QUERY_AUDIT_DEBUG``) every request is audited and going over
+budget raises ``QueryBudgetExceeded`` after the response, which fails the
+request under a test client. Otherwise only ``QUERY_AUDIT_SAMPLE_RATE`` of
+requests are audited, and findings are only logged and counted. Audited
+responses carry ``X-DB-Queries`` and, when something repeats,
+``X-DB-N-Plus-One`` headers.
+"""
+import logging
+import random
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from app.core.access_log import route_template
+from app.core.metrics import Counter as MetricCounter, registry
+from app.core.query_stats import QueryStats, current_query_stats, request_query_stats
+
+logger = logging.getLogger(__name__)
+
+N_PLUS_ONE_THRESHOLD = 5
+
+budget_exceeded = registry.register(MetricCounter(
+    "http_query_budget_exceeded_total", "Audited requests that ran more SQL statements than their route's budget.",
+    ("route",)
+))
+n_plus_one_suspected = registry.register(MetricCounter(
+    "http_n_plus_one_suspected_total", "Audited requests repeating one statement shape N_PLUS_ONE_THRESHOLD+ times.",
+    ("route",)
+))
+audited_requests = registry.register(MetricCounter(
+    "http_query_audited_requests_total", "Requests whose SQL statements were audited.", ("route",)
+))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(limit: int) -> Callable:
+    """Declare the most SQL statements one call of the decorated endpoint should run.
+
+    Apply below the router decorator so the route sees the annotated function.
+    """
+    def decorator(func: Callable) -> Callable:
+        func.query_budget = limit
+        return func
+    return decorator
+
+
+def repeated_shapes(shapes: Counter, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+    return [(shape, count) for shape, count in shapes.most_common() if count >= threshold]
+
+
+@contextmanager
+def audit_queries() -> Iterator[QueryStats]:
+    """Audit the statements run inside the block, e.g. in a script or test."""
+    stats = QueryStats()
+    stats.shapes = Counter()
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+class QueryAuditMiddleware:
+    def __init__(self, app, debug: bool = False, sample_rate: float = 0.0, default_budget: Optional[int] = None):
+        self.app = app
+        self.debug = debug
+        self.sample_rate = sample_rate
+        self.default_budget = default_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (self.debug or random.random() < self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = request_query_stats(scope)
+        stats.shapes = Counter()
+
+        async def annotating_send(message):
+            if message["type"] == "http.response.start":
+                # Statements run while the body streams are not in these numbers
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-queries", str(stats.count).encode()))
+                repeated = repeated_shapes(stats.shapes)
+                if repeated:
+                    headers.append((b"x-db-n-plus-one", str(len(repeated)).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, annotating_send)
+        finally:
+            if token is not None:
+                current_query_stats.reset(token)
+        self._report(scope, stats)
+
+    def _report(self, scope, stats: QueryStats) -> None:
+        route = route_template(scope) or "unmatched"
+        audited_requests.inc(route)
+
+        repeated = repeated_shapes(stats.shapes)
+        if repeated:
+            n_plus_one_suspected.inc(route)
+            for shape, count in repeated:
+                logger.warning("Probable N+1 on %s %s: %d x %s", scope["method"], route, count, shape)
+
+        budget = getattr(scope.get("endpoint"), "query_budget", self.default_budget)
+        if budget is not None and stats.count > budget:
+            budget_exceeded.inc(route)
+            message = f"{scope['method']} {route} ran {stats.count} SQL statements, budget is {budget}"
+            if self.debug:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
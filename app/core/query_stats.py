@@ -0,0 +1,79 @@
+"""Per-request SQL statement counting.
+
+``track_queries`` hooks the engine's cursor events. Code that wants to know how
+many statements a unit of work ran (the access log, for one) puts a
+``QueryStats`` in ``current_query_stats`` first. Sync endpoints run in a
+threadpool with a copy of the request's context, so they update the same
+object. When ``shapes`` is a Counter, statements are also tallied by
+normalized text (see app/core/query_audit.py).
+"""
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|:\w+|\$\d+)"
+# IN (...) lists expanded to one placeholder per value
+_PLACEHOLDER_LIST = re.compile(r"\(\s*" + _PLACEHOLDER + r"(?:\s*,\s*" + _PLACEHOLDER + r")*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "shapes", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.count = 0
+        self.duration = 0.0  # seconds
+        self.shapes: Optional[Counter] = None
+        self.scope = scope  # ASGI scope of the request, if any
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def request_query_stats(scope: dict) -> Tuple[QueryStats, Optional[Token]]:
+    """The request's stats, created by whichever middleware gets there first.
+
+    The returned token is not None only for the creator, which must reset it.
+    """
+    stats = current_query_stats.get()
+    if stats is not None:
+        return stats, None
+    stats = QueryStats(scope)
+    return stats, current_query_stats.set(stats)
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a statement to its shape: literals, placeholders and IN lists collapse to ``?``."""
+    statement = _WHITESPACE.sub(" ", statement.strip())
+    statement = _PLACEHOLDER_LIST.sub("(?)", statement)
+    return _LITERAL.sub("?", statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with the statement even
+    # when it raises and after_cursor_execute never runs
+    if context is not None:
+        context._dms_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_dms_started", None)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        if started is not None:
+            stats.duration += time.perf_counter() - started
+        if stats.shapes is not None:
+            stats.shapes[normalize_statement(statement)] += 1
+
+
+def track_queries(engine: Engine) -> None:
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
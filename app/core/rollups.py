@@ -0,0 +1,179 @@
+"""Incremental maintenance of ``attendance_daily_rollups``.
+
+Each run reads the attendance rows written since the stored watermark, works
+out which (schedule, student, local day) keys they touch and rebuilds only
+those keys from the raw rows. Rebuilding whole keys keeps the job idempotent,
+so rows re-read because of the watermark lag are harmless.
+
+The watermark is on ``Attendance.updated_at``, which every insert and update
+sets to the time of the write. Rows dated in the past (staff edits, bulk
+imports, the absences job marking LATE/ABSENT) are therefore picked up like
+fresh scans.
+
+    python -m app.core.rollups
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+import uuid
+
+from sqlalchemy.orm import Session
+
+from app.core.timezones import as_utc, get_zone, local_day_range, to_db_datetime
+from app.models.models import (
+    Attendance,
+    AttendanceDailyRollup,
+    AttendanceSchedule,
+    AttendanceStatus,
+    Dormitory,
+    JobWatermark,
+)
+
+# The suffix names the column the watermark tracks, keeping it apart from a stored
+# watermark on any other column
+ROLLUP_JOB_NAME = "attendance_daily_rollups:updated_at"
+# Re-read this much before the watermark to pick up rows from transactions that
+# were still open when the previous run looked
+WATERMARK_LAG = timedelta(minutes=5)
+KEYS_PER_BATCH = 2000
+
+def _schedule_zones(db: Session) -> Dict[uuid.UUID, tuple]:
+    rows = db.query(AttendanceSchedule.id, AttendanceSchedule.dormitory_id, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    )
+    return {schedule_id: (dormitory_id, get_zone(tz_name)) for schedule_id, dormitory_id, tz_name in rows}
+
+
+def _chunks(items: list, size: int) -> Iterable[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _aggregate(rows: list) -> dict:
+    """Collapse one key's attendance rows (ordered by timestamp) into rollup values."""
+    check_ins = [(ts, status) for ts, status in rows if status in (AttendanceStatus.PRESENT, AttendanceStatus.LATE)]
+    first_check_in = check_ins[0][0] if check_ins else None
+    last_check_out = None
+    if first_check_in is not None:
+        check_outs = [ts for ts, status in rows if status == AttendanceStatus.ABSENT and ts > first_check_in]
+        last_check_out = check_outs[-1] if check_outs else None
+    if check_ins:
+        final_status = check_ins[0][1]
+    else:
+        final_status = AttendanceStatus.ABSENT
+    return {
+        "first_check_in": first_check_in,
+        "last_check_out": last_check_out,
+        "scan_count": len(rows),
+        "final_status": final_status,
+    }
+
+
+def _rebuild(db: Session, keys: list, zones: Dict[uuid.UUID, tuple]) -> None:
+    dialect_name = db.get_bind().dialect.name
+    by_schedule = defaultdict(list)
+    for schedule_id, student_id, day in keys:
+        by_schedule[schedule_id].append((student_id, day))
+
+    for schedule_id, entries in by_schedule.items():
+        dormitory_id, zone = zones[schedule_id]
+        student_ids = {student_id for student_id, _ in entries}
+        days = [day for _, day in entries]
+        start, end = local_day_range(zone.key, min(days), max(days), dialect_name=dialect_name)
+        wanted = set(entries)
+
+        grouped = defaultdict(list)
+        rows = db.query(Attendance.student_id, Attendance.timestamp, Attendance.status).filter(
+            Attendance.schedule_id == schedule_id,
+            Attendance.student_id.in_(student_ids),
+            Attendance.timestamp >= start,
+            Attendance.timestamp < end,
+        ).order_by(Attendance.timestamp)
+        for student_id, timestamp, attendance_status in rows:
+            timestamp = as_utc(timestamp)
+            key = (student_id, timestamp.astimezone(zone).date())
+            if key in wanted:
+                grouped[key].append((timestamp, attendance_status))
+
+        existing = {
+            (rollup.student_id, rollup.day): rollup
+            for rollup in db.query(AttendanceDailyRollup).filter(
+                AttendanceDailyRollup.schedule_id == schedule_id,
+                AttendanceDailyRollup.student_id.in_(student_ids),
+                AttendanceDailyRollup.day >= min(days),
+                AttendanceDailyRollup.day <= max(days),
+            )
+        }
+        for student_id, day in wanted:
+            rollup = existing.get((student_id, day))
+            key_rows = grouped.get((student_id, day))
+            if not key_rows:
+                # The rows behind this key are gone (e.g. re-dated); drop the stale rollup
+                if rollup is not None:
+                    db.delete(rollup)
+                continue
+            values = _aggregate(key_rows)
+            if rollup is None:
+                db.add(AttendanceDailyRollup(
+                    dormitory_id=dormitory_id,
+                    schedule_id=schedule_id,
+                    student_id=student_id,
+                    day=day,
+                    **values
+                ))
+            else:
+                for field, value in values.items():
+                    setattr(rollup, field, value)
+
+
+def refresh_attendance_rollups(db: Session, since: Optional[datetime] = None) -> int:
+    """Bring the rollup table up to date and return the number of keys rebuilt.
+
+    ``since`` overrides the stored watermark: rows written after it are
+    reprocessed, whatever their timestamp.
+    """
+    watermark = db.get(JobWatermark, ROLLUP_JOB_NAME)
+    if watermark is None:
+        watermark = JobWatermark(name=ROLLUP_JOB_NAME)
+        db.add(watermark)
+    if since is None and watermark.watermark is not None:
+        since = as_utc(watermark.watermark) - WATERMARK_LAG
+
+    zones = _schedule_zones(db)
+    query = db.query(Attendance.schedule_id, Attendance.student_id, Attendance.timestamp, Attendance.updated_at).filter(
+        Attendance.schedule_id.isnot(None),
+        Attendance.student_id.isnot(None),
+        Attendance.timestamp.isnot(None),
+    )
+    if since is not None:
+        query = query.filter(Attendance.updated_at > to_db_datetime(since, db.get_bind().dialect.name))
+
+    affected = set()
+    newest = None
+    for schedule_id, student_id, timestamp, updated_at in query.yield_per(10000):
+        if updated_at is not None:
+            updated_at = as_utc(updated_at)
+            if newest is None or updated_at > newest:
+                newest = updated_at
+        if schedule_id not in zones:
+            continue
+        affected.add((schedule_id, student_id, as_utc(timestamp).astimezone(zones[schedule_id][1]).date()))
+
+    for chunk in _chunks(sorted(affected), KEYS_PER_BATCH):
+        _rebuild(db, chunk, zones)
+        db.flush()
+
+    if newest is not None and (watermark.watermark is None or newest > as_utc(watermark.watermark)):
+        watermark.watermark = newest
+    db.commit()
+    return len(affected)
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        print(f"Rebuilt {refresh_attendance_rollups(session)} rollup keys")
+    finally:
+        session.close()
@@ -0,0 +1,147 @@
+"""In-memory view of the ``system_config`` table for runtime-tunable settings.
+
+Every worker keeps all ``SystemConfig`` rows in an immutable snapshot. A read
+only dereferences the current snapshot, so it takes no lock and runs no query.
+``create_system_config`` and ``update_system_config`` bump the
+``system_config`` counter in ``resource_versions`` (see
+``app.core.conditional``). Each worker polls that one row every
+``SYSTEM_CONFIG_POLL_SECONDS`` and reloads the table when it has moved. The
+worker that made the change reloads straight away.
+
+Settings are read as typed sections. A section is a pydantic model validated
+from the row whose key is the section name. A missing row, a missing field or
+an invalid value falls back to the model's defaults, which come from the
+environment settings:
+
+    grace = system_config.section("attendance", AttendanceConfig).late_grace_minutes
+
+    PUT /api/config/attendance  {"late_grace_minutes": 15}
+"""
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.conditional import current_versions
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.models import SystemConfig
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_CONFIG_RESOURCE = "system_config"
+
+Section = TypeVar("Section", bound=BaseModel)
+
+
+class AttendanceConfig(BaseModel):
+    """``attendance`` row: check-in classification."""
+    late_grace_minutes: int = Field(default_factory=lambda: settings.LATE_GRACE_MINUTES, ge=0)
+
+
+class RetentionConfig(BaseModel):
+    """``retention`` row: how long housekeeping keeps old rows."""
+    unknown_rfid_days: int = Field(default_factory=lambda: settings.UNKNOWN_RFID_RETENTION_DAYS, ge=1)
+    job_run_days: int = Field(default_factory=lambda: settings.JOB_RUN_RETENTION_DAYS, ge=1)
+
+
+class _Snapshot:
+    def __init__(self, version: int, values: Dict[str, Any]):
+        self.version = version
+        self.values = values
+        # Validated sections; filled on first use and discarded with the snapshot
+        self.sections: Dict[tuple, BaseModel] = {}
+
+
+class SystemConfigStore:
+    def __init__(self, poll_interval: float):
+        self.poll_interval = poll_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    @property
+    def version(self) -> Optional[int]:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Outside the API (scripts, the absences CLI) nothing has loaded it yet
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The raw value of ``key``, or ``default``."""
+        return self._current().values.get(key, default)
+
+    def section(self, key: str, model: Type[Section]) -> Section:
+        """The ``key`` row validated as ``model``; defaults fill anything missing or invalid."""
+        snapshot = self._current()
+        cached = snapshot.sections.get((key, model))
+        if cached is not None:
+            return cached
+        value = snapshot.values.get(key) or {}
+        try:
+            section = model.model_validate(value)
+        except ValidationError as exc:
+            logger.warning("Ignoring invalid system config %r: %s", key, exc)
+            section = model()
+        snapshot.sections[(key, model)] = section
+        return section
+
+    def refresh(self, db: Optional[Session] = None, force: bool = False) -> bool:
+        """Reload the rows if their version moved; True when a new snapshot was installed."""
+        with self._refresh_lock:
+            if db is None:
+                with SessionLocal() as own_db:
+                    return self._reload(own_db, force)
+            return self._reload(db, force)
+
+    def _reload(self, db: Session, force: bool) -> bool:
+        # The version is read before the rows: a write landing in between
+        # only causes one extra reload, never a stale snapshot
+        version = current_versions(db, [SYSTEM_CONFIG_RESOURCE])[SYSTEM_CONFIG_RESOURCE]
+        if not force and self._snapshot is not None and self._snapshot.version == version:
+            return False
+        rows = db.execute(select(SystemConfig.key, SystemConfig.value)).all()
+        self._snapshot = _Snapshot(version, {key: value for key, value in rows})
+        self.reloads += 1
+        return True
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception:
+                logger.exception("System config refresh failed")
+
+    async def start(self) -> None:
+        """Load the rows and start polling for changes; call from the application lifespan."""
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception:
+            # Loaded on first use instead
+            logger.exception("System config load failed")
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+system_config = SystemConfigStore(poll_interval=settings.SYSTEM_CONFIG_POLL_SECONDS)
@@ -0,0 +1,68 @@
+"""Additive schema changes for databases created before a column or index existed.
+
+``Base.metadata.create_all`` creates missing tables together with their
+indexes, but it never alters a table that is already there. Columns added to
+existing tables are listed in ``ADDED_COLUMNS``. ``upgrade_schema`` adds any
+that are missing and creates every index the models declare that the database
+lacks. Each step checks the live schema first, so it runs at every startup
+and is a no-op once applied.
+
+On a large existing ``attendances`` table, create its indexes with
+``CREATE INDEX CONCURRENTLY`` before deploying; startup then finds them in
+place and skips them.
+"""
+import logging
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import ClauseElement
+
+from app.models.models import Base
+
+logger = logging.getLogger(__name__)
+
+# Columns added to tables that existed before them: {table: (column, ...)}
+ADDED_COLUMNS = {
+    # Dormitory-local schedule windows and report days
+    "dormitories": ("timezone",),
+    # Watermark of the daily attendance rollups (app/core/rollups.py)
+    "attendances": ("updated_at",),
+}
+
+
+def _column_ddl(connection: Connection, table_name: str, column_name: str) -> str:
+    column = Base.metadata.tables[table_name].c[column_name]
+    dialect = connection.dialect
+    ddl = f"{dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=dialect)}"
+    if column.server_default is not None:
+        # SQLite only accepts constant defaults on ADD COLUMN; the models give
+        # such columns a client-side default as well
+        if dialect.name != "sqlite" or not isinstance(column.server_default.arg, ClauseElement):
+            ddl += f" DEFAULT {dialect.ddl_compiler(dialect, None).get_column_default_string(column)}"
+    return ddl
+
+
+def upgrade_schema(engine: Engine) -> None:
+    """Add the columns and indexes ``create_all`` skips on existing tables."""
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table_name, column_names in ADDED_COLUMNS.items():
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            for column_name in column_names:
+                if column_name in existing:
+                    continue
+                # IF NOT EXISTS covers another worker adding it at the same moment
+                if_not_exists = "IF NOT EXISTS " if connection.dialect.name == "postgresql" else ""
+                connection.exec_driver_sql(
+                    f"ALTER TABLE {table_name} ADD COLUMN {if_not_exists}"
+                    f"{_column_ddl(connection, table_name, column_name)}"
+                )
+                logger.info("Added column %s.%s", table_name, column_name)
+
+        if connection.dialect.name == "postgresql":
+            # The trigram indexes on students need it; create_all only adds it with new tables
+            connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                # Skips indexes that exist and those limited to another dialect
+                index.create(connection, checkfirst=True)
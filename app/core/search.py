@@ -0,0 +1,247 @@
+"""Student search.
+
+On Postgres the search is served by ``pg_trgm`` GIN indexes on the searchable
+columns. Other databases (SQLite in development) use an in-process n-gram index
+that is kept in sync with student writes through session events.
+"""
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session
+
+from app.models.models import Student
+
+SEARCH_FIELDS = ("name", "surname", "rfid_tag", "phone", "email", "class_name")
+NGRAM_SIZE = 3
+# Minimum share of query n-grams a candidate must contain before it is scored
+MIN_NGRAM_OVERLAP = 0.3
+# Rebuild the in-process index after this many seconds so writes made by other
+# workers are eventually picked up
+INDEX_MAX_AGE_SECONDS = 300
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join(text.lower().split()) if text else ""
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> set:
+    # Pad like pg_trgm so short words and word starts still produce n-grams
+    padded = f"  {text} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class _Doc:
+    __slots__ = ("dormitory_id", "room_id", "is_active", "fields", "grams")
+
+    def __init__(self, dormitory_id, room_id, is_active, fields: Dict[str, str]):
+        self.dormitory_id = dormitory_id
+        self.room_id = room_id
+        self.is_active = is_active
+        self.fields = fields
+        self.grams = {name: ngrams(value) for name, value in fields.items() if value}
+
+
+def _snapshot(student: Student) -> Tuple[uuid.UUID, _Doc]:
+    fields = {name: _normalize(getattr(student, name)) for name in SEARCH_FIELDS}
+    return student.id, _Doc(student.dormitory_id, student.room_id, student.is_active, fields)
+
+
+class StudentNgramIndex:
+    """In-process n-gram index over the searchable student columns."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, set] = defaultdict(set)
+        self._docs: Dict[uuid.UUID, _Doc] = {}
+        self._loaded_at: Optional[float] = None
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < INDEX_MAX_AGE_SECONDS:
+            return
+        columns = [Student.id, Student.dormitory_id, Student.room_id, Student.is_active]
+        columns += [getattr(Student, name) for name in SEARCH_FIELDS]
+        docs = {}
+        for row in db.query(*columns).yield_per(1000):
+            fields = {name: _normalize(value) for name, value in zip(SEARCH_FIELDS, row[4:])}
+            docs[row[0]] = _Doc(row[1], row[2], row[3], fields)
+
+        postings = defaultdict(set)
+        for student_id, doc in docs.items():
+            for grams in doc.grams.values():
+                for gram in grams:
+                    postings[gram].add(student_id)
+
+        with self._lock:
+            self._docs = docs
+            self._postings = postings
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def apply(self, upserts: Dict[uuid.UUID, _Doc], removals: set) -> None:
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            for student_id in removals | set(upserts):
+                old = self._docs.pop(student_id, None)
+                if old is None:
+                    continue
+                for grams in old.grams.values():
+                    for gram in grams:
+                        ids = self._postings.get(gram)
+                        if ids is not None:
+                            ids.discard(student_id)
+                            if not ids:
+                                del self._postings[gram]
+            for student_id, doc in upserts.items():
+                self._docs[student_id] = doc
+                for grams in doc.grams.values():
+                    for gram in grams:
+                        self._postings[gram].add(student_id)
+
+    def search(
+        self,
+        query: str,
+        dormitory_id: Optional[uuid.UUID] = None,
+        room_id: Optional[uuid.UUID] = None,
+        is_active: Optional[bool] = None,
+    ) -> List[Tuple[uuid.UUID, float]]:
+        """Return ``(student_id, score)`` pairs ordered by descending score."""
+        needle = _normalize(query)
+        query_grams = ngrams(needle)
+
+        with self._lock:
+            docs = self._docs
+            if len(needle) < NGRAM_SIZE:
+                # Too short for meaningful n-grams; a substring pass is cheap in memory
+                candidates = [
+                    student_id for student_id, doc in docs.items()
+                    if any(needle in value for value in doc.fields.values())
+                ]
+            else:
+                counts = defaultdict(int)
+                for gram in query_grams:
+                    for student_id in self._postings.get(gram, ()):
+                        counts[student_id] += 1
+                threshold = max(1, int(len(query_grams) * MIN_NGRAM_OVERLAP))
+                candidates = [student_id for student_id, count in counts.items() if count >= threshold]
+
+            results = []
+            for student_id in candidates:
+                doc = docs[student_id]
+                if dormitory_id is not None and doc.dormitory_id != dormitory_id:
+                    continue
+                if room_id is not None and doc.room_id != room_id:
+                    continue
+                if is_active is not None and doc.is_active != is_active:
+                    continue
+                results.append((student_id, _score(needle, query_grams, doc)))
+
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+
+def _score(needle: str, query_grams: set, doc: _Doc) -> float:
+    best = 0.0
+    for name, value in doc.fields.items():
+        if not value:
+            continue
+        if value == needle:
+            return 3.0
+        grams = doc.grams[name]
+        score = len(query_grams & grams) / len(query_grams | grams)
+        if value.startswith(needle):
+            score += 2.0
+        elif needle in value:
+            score += 1.0
+        best = max(best, score)
+    return best
+
+
+student_index = StudentNgramIndex()
+
+_PENDING_KEY = "student_search_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_student_changes(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, ({}, set()))
+    upserts, removals = pending
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Student):
+            student_id, doc = _snapshot(obj)
+            upserts[student_id] = doc
+            removals.discard(student_id)
+    for obj in session.deleted:
+        if isinstance(obj, Student):
+            upserts.pop(obj.id, None)
+            removals.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_student_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        student_index.apply(*pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_student_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def search_students(
+    db: Session,
+    query: Optional[str],
+    dormitory_id: Optional[uuid.UUID] = None,
+    room_id: Optional[uuid.UUID] = None,
+    is_active: Optional[bool] = True,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Student]:
+    filters = []
+    if dormitory_id is not None:
+        filters.append(Student.dormitory_id == dormitory_id)
+    if room_id is not None:
+        filters.append(Student.room_id == room_id)
+    if is_active is not None:
+        filters.append(Student.is_active == is_active)
+
+    if not query or not query.strip():
+        return db.query(Student).filter(*filters).order_by(Student.name).offset(skip).limit(limit).all()
+
+    if db.get_bind().dialect.name == "postgresql":
+        columns = [getattr(Student, name) for name in SEARCH_FIELDS]
+        pattern = f"%{_escape_like(query.strip())}%"
+        rank = func.greatest(*[func.coalesce(func.similarity(column, query), 0) for column in columns])
+        match = or_(
+            *[column.ilike(pattern, escape="\\") for column in columns],
+            *[column.op("%")(query) for column in columns],
+        )
+        return (
+            db.query(Student)
+            .filter(*filters, match)
+            .order_by(rank.desc(), Student.name)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+
+    student_index.ensure_loaded(db)
+    ranked = student_index.search(query, dormitory_id=dormitory_id, room_id=room_id, is_active=is_active)
+    page_ids = [student_id for student_id, _ in ranked[skip:skip + limit]]
+    if not page_ids:
+        return []
+    # Re-check filters against the database so a stale index entry never leaks a row
+    students = db.query(Student).filter(Student.id.in_(page_ids), *filters).all()
+    position = {student_id: i for i, student_id in enumerate(page_ids)}
+    return sorted(students, key=lambda student: position[student.id])
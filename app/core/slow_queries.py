@@ -0,0 +1,135 @@
+"""Slow-query recorder attached to the engine.
+
+Statements slower than the threshold are kept in a bounded ring buffer with
+their duration, the route that issued them and the shape of their bound
+parameters. Parameter values are never stored; only their types are. A
+sample of slow SELECTs is re-run under EXPLAIN on a separate connection in a
+background thread: ``EXPLAIN (ANALYZE, BUFFERS)`` on Postgres and
+``EXPLAIN QUERY PLAN`` on SQLite. The plan is attached to the entry once it is
+ready.
+"""
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.access_log import route_template
+from app.core.query_stats import current_query_stats
+
+logger = logging.getLogger(__name__)
+
+MAX_STATEMENT_LENGTH = 4000
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Types of the bound parameters, e.g. ``{"id_1": "UUID", "param_1": "int"}``."""
+    if executemany:
+        rows = list(parameters or [])
+        return {"rows": len(rows), "row": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return None
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, capacity: int = 500, explain_sample_rate: float = 0.0):
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.entries: deque = deque(maxlen=capacity)
+        self.recorded = 0
+        self._engine: Optional[Engine] = None
+        self._explainer: Optional[ThreadPoolExecutor] = None
+        self._explain_lock = threading.Lock()
+
+    def install(self, engine: Engine) -> None:
+        self._engine = engine
+        if not event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, like query_stats, so a statement that raises leaves nothing behind
+        if context is not None:
+            context._dms_slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_dms_slow_query_started", None)
+        if started is None or conn.info.get("explaining"):
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        stats = current_query_stats.get()
+        scope = stats.scope if stats is not None else None
+        entry = {
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration_ms, 2),
+            "route": f"{scope['method']} {route_template(scope)}" if scope else None,
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "parameters": parameter_shape(parameters, executemany),
+            "plan": None,
+        }
+        self.entries.append(entry)
+        self.recorded += 1
+        logger.warning("Slow query (%.1f ms) on %s: %s", duration_ms, entry["route"], entry["statement"][:200])
+
+        dialect_name = conn.dialect.name
+        if (
+            self.explain_sample_rate
+            and not executemany
+            and dialect_name in EXPLAIN_PREFIXES
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and "FOR UPDATE" not in statement.upper()
+            and random.random() < self.explain_sample_rate
+        ):
+            self._explain_later(entry, dialect_name, statement, parameters)
+
+    def _explain_later(self, entry: dict, dialect_name: str, statement: str, parameters: Any) -> None:
+        with self._explain_lock:
+            if self._explainer is None:
+                self._explainer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        self._explainer.submit(self._explain, entry, dialect_name, statement, parameters)
+
+    def _explain(self, entry: dict, dialect_name: str, statement: str, parameters: Any) -> None:
+        try:
+            with self._engine.connect() as conn:
+                conn.info["explaining"] = True
+                try:
+                    rows = conn.exec_driver_sql(EXPLAIN_PREFIXES[dialect_name] + statement, parameters).fetchall()
+                finally:
+                    conn.info.pop("explaining", None)
+                    # EXPLAIN ANALYZE really runs the statement; never keep its effects
+                    conn.rollback()
+            entry["plan"] = "\n".join(" ".join(str(value) for value in row) for row in rows)
+        except Exception as exc:
+            entry["plan"] = f"EXPLAIN failed: {type(exc).__name__}: {exc}"
+
+    def snapshot(self, limit: Optional[int] = None) -> List[dict]:
+        """Newest entries first."""
+        entries = list(self.entries)[::-1]
+        return entries[:limit] if limit else entries
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def dump(self, path: str) -> int:
+        """Append the buffered entries to ``path`` as JSON lines and return how many were written."""
+        entries = list(self.entries)
+        with open(path, "a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(entry) + "\n")
+        return len(entries)
@@ -0,0 +1,343 @@
+"""Full-text search over tickets and their comments.
+
+On Postgres the search uses ``tsvector`` documents backed by GIN expression
+indexes (see ``ticket_search_document`` in the models). Other databases use an
+in-process inverted index that is kept in sync with ticket and comment writes
+through session events.
+"""
+import html
+import math
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from sqlalchemy import event, exists, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.models import (
+    Comment,
+    Ticket,
+    TEXT_SEARCH_CONFIG,
+    comment_search_document,
+    ticket_search_document,
+)
+
+# Same relative weights Postgres uses for the A/B/C/D labels in ts_rank
+FIELD_WEIGHTS = {"title": 1.0, "category": 0.4, "description": 0.2, "comment": 0.1}
+HEADLINE_WORDS = 35
+HIGHLIGHT_START = "<b>"
+HIGHLIGHT_STOP = "</b>"
+# ts_headline marks matches with these private-use characters; the snippet is
+# HTML-escaped before they are swapped for the tags above
+SENTINEL_START = "\ue000"
+SENTINEL_STOP = "\ue001"
+INDEX_MAX_AGE_SECONDS = 300
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def headline(text: Optional[str], terms: set) -> Optional[str]:
+    """Return a window of ``text`` around the first match, HTML-escaped, with matches wrapped in <b> tags."""
+    if not text:
+        return None
+    parts = re.split(r"(\w+)", text)
+    words = list(range(1, len(parts), 2))
+    first = next((n for n, i in enumerate(words) if parts[i].lower() in terms), None)
+    if first is None:
+        return None
+    lo = max(0, first - HEADLINE_WORDS // 3)
+    hi = min(len(words), lo + HEADLINE_WORDS)
+    out = []
+    for i in range(words[lo], words[hi - 1] + 1):
+        part = parts[i]
+        if i % 2 == 1 and part.lower() in terms:
+            out.append(f"{HIGHLIGHT_START}{html.escape(part)}{HIGHLIGHT_STOP}")
+        else:
+            out.append(html.escape(part))
+    return "".join(out)
+
+
+def _mark_up(snippet: str) -> str:
+    """Turn a ``ts_headline`` snippet delimited by the sentinels into escaped HTML."""
+    return html.escape(snippet).replace(SENTINEL_START, HIGHLIGHT_START).replace(SENTINEL_STOP, HIGHLIGHT_STOP)
+
+
+class _TicketDoc:
+    __slots__ = ("status", "assigned_student", "fields", "comments")
+
+    def __init__(self, status, assigned_student, fields: Dict[str, Optional[str]]):
+        self.status = status
+        self.assigned_student = assigned_student
+        self.fields = fields
+        self.comments: Dict[uuid.UUID, str] = {}
+
+    def term_weights(self) -> Dict[str, float]:
+        weights = defaultdict(float)
+        for name, value in self.fields.items():
+            for term in tokenize(value):
+                weights[term] += FIELD_WEIGHTS[name]
+        for content in self.comments.values():
+            for term in tokenize(content):
+                weights[term] += FIELD_WEIGHTS["comment"]
+        return weights
+
+
+def _status_value(status):
+    return getattr(status, "value", status)
+
+
+class TicketInvertedIndex:
+    """In-process inverted index: term -> {ticket_id: weighted term frequency}."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: Dict[uuid.UUID, _TicketDoc] = {}
+        self._postings: Dict[str, Dict[uuid.UUID, float]] = defaultdict(dict)
+        self._terms: Dict[uuid.UUID, Dict[str, float]] = {}
+        self._loaded_at: Optional[float] = None
+
+    def ensure_loaded(self, db: Session) -> None:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < INDEX_MAX_AGE_SECONDS:
+            return
+        docs = {}
+        ticket_rows = db.query(
+            Ticket.id, Ticket.status, Ticket.assigned_student, Ticket.title, Ticket.category, Ticket.description
+        ).yield_per(1000)
+        for ticket_id, status, assigned_student, title, category, description in ticket_rows:
+            docs[ticket_id] = _TicketDoc(
+                _status_value(status),
+                assigned_student,
+                {"title": title, "category": category, "description": description}
+            )
+        for comment_id, ticket_id, content in db.query(Comment.id, Comment.ticket_id, Comment.content).yield_per(1000):
+            if ticket_id in docs:
+                docs[ticket_id].comments[comment_id] = content
+
+        postings = defaultdict(dict)
+        terms = {}
+        for ticket_id, doc in docs.items():
+            terms[ticket_id] = doc.term_weights()
+            for term, weight in terms[ticket_id].items():
+                postings[term][ticket_id] = weight
+
+        with self._lock:
+            self._docs = docs
+            self._postings = postings
+            self._terms = terms
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self._loaded_at = None
+
+    def _reindex(self, ticket_id: uuid.UUID) -> None:
+        for term in self._terms.pop(ticket_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(ticket_id, None)
+                if not postings:
+                    del self._postings[term]
+        doc = self._docs.get(ticket_id)
+        if doc is None:
+            return
+        self._terms[ticket_id] = doc.term_weights()
+        for term, weight in self._terms[ticket_id].items():
+            self._postings[term][ticket_id] = weight
+
+    def apply(
+        self,
+        tickets: Dict[uuid.UUID, tuple],
+        comments: Dict[uuid.UUID, tuple],
+        removed_comments: Dict[uuid.UUID, uuid.UUID],
+    ) -> None:
+        if self._loaded_at is None:
+            return
+        with self._lock:
+            touched = set()
+            for ticket_id, (status, assigned_student, fields) in tickets.items():
+                doc = self._docs.get(ticket_id)
+                if doc is None:
+                    doc = self._docs[ticket_id] = _TicketDoc(status, assigned_student, fields)
+                else:
+                    doc.status, doc.assigned_student, doc.fields = status, assigned_student, fields
+                touched.add(ticket_id)
+            for comment_id, (ticket_id, content) in comments.items():
+                doc = self._docs.get(ticket_id)
+                if doc is None:
+                    # Ticket written by another worker; rebuild on the next search
+                    self._loaded_at = None
+                    return
+                doc.comments[comment_id] = content
+                touched.add(ticket_id)
+            for comment_id, ticket_id in removed_comments.items():
+                doc = self._docs.get(ticket_id)
+                if doc is not None:
+                    doc.comments.pop(comment_id, None)
+                    touched.add(ticket_id)
+            for ticket_id in touched:
+                self._reindex(ticket_id)
+
+    def search(
+        self,
+        query: str,
+        status: Optional[str] = None,
+        assigned_student: Optional[uuid.UUID] = None,
+    ) -> List[tuple]:
+        """Return ``(ticket_id, rank)`` pairs for tickets containing every query term."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            total = max(len(self._docs), 1)
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            results = []
+            for ticket_id in postings[0]:
+                if not all(ticket_id in p for p in postings[1:]):
+                    continue
+                doc = self._docs[ticket_id]
+                if status is not None and doc.status != status:
+                    continue
+                if assigned_student is not None and doc.assigned_student != assigned_student:
+                    continue
+                rank = sum(p[ticket_id] * math.log(1 + total / len(p)) for p in postings)
+                results.append((ticket_id, rank))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def comments_for(self, ticket_id: uuid.UUID) -> List[str]:
+        with self._lock:
+            doc = self._docs.get(ticket_id)
+            return list(doc.comments.values()) if doc else []
+
+
+ticket_index = TicketInvertedIndex()
+
+_PENDING_KEY = "ticket_search_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_ticket_changes(session, flush_context):
+    tickets, comments, removed_comments = session.info.setdefault(_PENDING_KEY, ({}, {}, {}))
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Ticket):
+            tickets[obj.id] = (
+                _status_value(obj.status),
+                obj.assigned_student if isinstance(obj.assigned_student, uuid.UUID) else None,
+                {"title": obj.title, "category": obj.category, "description": obj.description}
+            )
+        elif isinstance(obj, Comment):
+            comments[obj.id] = (obj.ticket_id, obj.content)
+    for obj in session.deleted:
+        if isinstance(obj, Comment):
+            comments.pop(obj.id, None)
+            removed_comments[obj.id] = obj.ticket_id
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_ticket_changes(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        ticket_index.apply(*pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_ticket_changes(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def search_tickets(
+    db: Session,
+    query: str,
+    status: Optional[str] = None,
+    assigned_student: Optional[uuid.UUID] = None,
+    skip: int = 0,
+    limit: int = 50,
+) -> List[dict]:
+    """Return ranked hits as ``{"ticket", "rank", "highlights"}`` dicts."""
+    filters = []
+    if status:
+        filters.append(Ticket.status == status)
+    if assigned_student:
+        filters.append(Ticket.assigned_student == assigned_student)
+
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_tickets_pg(db, query, filters, skip, limit)
+
+    ticket_index.ensure_loaded(db)
+    ranked = ticket_index.search(query, status=status, assigned_student=assigned_student)[skip:skip + limit]
+    if not ranked:
+        return []
+    tickets = {
+        ticket.id: ticket
+        for ticket in db.query(Ticket).filter(Ticket.id.in_([ticket_id for ticket_id, _ in ranked]), *filters)
+    }
+    terms = set(tokenize(query))
+    hits = []
+    for ticket_id, rank in ranked:
+        ticket = tickets.get(ticket_id)
+        if ticket is None:
+            continue
+        texts = [ticket.title, ticket.category, ticket.description] + ticket_index.comments_for(ticket_id)
+        highlights = [h for h in (headline(text, terms) for text in texts) if h]
+        hits.append({"ticket": ticket, "rank": rank, "highlights": highlights})
+    return hits
+
+
+def _search_tickets_pg(db: Session, query: str, filters: list, skip: int, limit: int) -> List[dict]:
+    tsquery = func.websearch_to_tsquery(TEXT_SEARCH_CONFIG, query)
+    ticket_doc = ticket_search_document(Ticket.title, Ticket.description, Ticket.category)
+    comment_doc = comment_search_document(Comment.content)
+    comment_matches = comment_doc.op("@@")(tsquery)
+
+    comment_rank = (
+        select(func.max(func.ts_rank(comment_doc, tsquery)))
+        .where(Comment.ticket_id == Ticket.id, comment_matches)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+    rank = func.ts_rank(ticket_doc, tsquery) + func.coalesce(comment_rank, 0)
+    match = or_(
+        ticket_doc.op("@@")(tsquery),
+        exists().where(Comment.ticket_id == Ticket.id, comment_matches)
+    )
+    options = f'StartSel="{SENTINEL_START}", StopSel="{SENTINEL_STOP}", MaxWords={HEADLINE_WORDS}'
+    rows = (
+        db.query(
+            Ticket,
+            rank.label("rank"),
+            func.ts_headline(TEXT_SEARCH_CONFIG, Ticket.title, tsquery, options),
+            func.ts_headline(TEXT_SEARCH_CONFIG, func.coalesce(Ticket.category, ""), tsquery, options),
+            func.ts_headline(TEXT_SEARCH_CONFIG, Ticket.description, tsquery, options),
+        )
+        .filter(match, *filters)
+        .order_by(rank.desc(), Ticket.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    if not rows:
+        return []
+
+    comment_highlights = defaultdict(list)
+    comment_rows = db.query(
+        Comment.ticket_id,
+        func.ts_headline(TEXT_SEARCH_CONFIG, Comment.content, tsquery, options)
+    ).filter(Comment.ticket_id.in_([row[0].id for row in rows]), comment_matches)
+    for ticket_id, text in comment_rows:
+        comment_highlights[ticket_id].append(_mark_up(text))
+
+    hits = []
+    for ticket, ticket_rank, *headlines in rows:
+        highlights = [_mark_up(h) for h in headlines if h and SENTINEL_START in h]
+        highlights += comment_highlights.get(ticket.id, [])
+        hits.append({"ticket": ticket, "rank": float(ticket_rank), "highlights": highlights})
+    return hits
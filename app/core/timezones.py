@@ -0,0 +1,46 @@
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.core.config import settings
+
+
+def get_zone(tz_name: Optional[str]) -> ZoneInfo:
+    try:
+        return ZoneInfo(tz_name or settings.DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.DEFAULT_TIMEZONE)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Read a timestamp column value as aware UTC (SQLite returns naive UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def to_db_datetime(value: datetime, dialect_name: str) -> datetime:
+    """Convert an aware datetime to what the timestamp columns compare against.
+
+    Postgres stores ``timestamptz`` and compares aware values directly; SQLite
+    stores naive UTC strings, so the value is shifted to UTC and made naive.
+    """
+    value = value.astimezone(timezone.utc)
+    if dialect_name == "postgresql":
+        return value
+    return value.replace(tzinfo=None)
+
+
+def local_day_range(
+    tz_name: Optional[str],
+    first_day: date,
+    last_day: Optional[date] = None,
+    dialect_name: str = "postgresql",
+) -> Tuple[datetime, datetime]:
+    """Return the half-open ``[start, end)`` timestamp range covering the given
+    local calendar days (``last_day`` inclusive) in ``tz_name``."""
+    zone = get_zone(tz_name)
+    last_day = last_day or first_day
+    start = datetime.combine(first_day, time.min, tzinfo=zone)
+    end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=zone)
+    return to_db_datetime(start, dialect_name), to_db_datetime(end, dialect_name)
@@ -1,31 +1,50 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import auth, students, attendance, config, rooms, dormitories, attendance_schedules
+from app.routers import auth, students, attendance, config, rooms, dormitories, attendance_schedules, reports, dashboard, events, jobs, metrics, diagnostics
+from app.core.config import settings
 from app.core.database import engine
+from app.core.jobs import scheduler
 from app.models import models
 from app.routers.tickets import router as tickets_router
 import logging
-from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.cache import start_cache_listener, stop_cache_listener
+from app.core.compression import CompressionMiddleware
+from app.core.access_log import AccessLogMiddleware, start_access_log_listener, stop_access_log_listener
+from app.core.metrics import MetricsMiddleware
+from app.core.query_audit import QueryAuditMiddleware
+from app.core.profiler import RequestProfilerMiddleware
+from app.core.query_stats import track_queries
+from app.core.runtime_config import system_config
+from app.core.schema import upgrade_schema
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_access_log_listener()
+    start_cache_listener()
+    await system_config.start()
+    # Every worker runs the scheduler; a database lease picks the one that runs jobs
+    if settings.JOB_SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+    await system_config.stop()
+    stop_cache_listener()
+    stop_access_log_listener()
 
 app = FastAPI(
     title="Dormitory Management System",
     description="API for managing dormitory students and attendance using RFID",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("uvicorn")
-
-class LogRequestsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        logger.info(f"Incoming request: {request.method} {request.url}")
-        logger.info(f"Headers: {dict(request.headers)}")
-        response = await call_next(request)
-        return response
 
 # Configure CORS
 app.add_middleware(
@@ -36,8 +55,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Add the middleware to log requests
-app.add_middleware(LogRequestsMiddleware)
+# gzip, or br/zstd when installed; inside the access log so it records bytes on the wire
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    thread_threshold=settings.COMPRESSION_THREAD_THRESHOLD
+)
+
+# One structured access log line per request, with the SQL statements it ran
+track_queries(engine)
+app.add_middleware(
+    AccessLogMiddleware,
+    sample_rate=settings.ACCESS_LOG_SAMPLE_RATE,
+    log_headers=settings.ACCESS_LOG_HEADERS,
+    slow_request_ms=settings.ACCESS_LOG_SLOW_REQUEST_MS
+)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    QueryAuditMiddleware,
+    debug=settings.QUERY_AUDIT_DEBUG,
+    sample_rate=settings.QUERY_AUDIT_SAMPLE_RATE,
+    default_budget=settings.QUERY_BUDGET_DEFAULT
+)
+# Per-request cProfile; not installed at all unless a token is configured
+if settings.PROFILE_TOKEN:
+    app.add_middleware(RequestProfilerMiddleware, token=settings.PROFILE_TOKEN)
 
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
@@ -47,7 +89,13 @@ app.include_router(attendance.router, prefix="/api", tags=["Attendance"])
 app.include_router(attendance_schedules.router, prefix="/api", tags=["Attendance Schedules"])
 app.include_router(dormitories.router, prefix="/api", tags=["Dormitories"])
 app.include_router(config.router, prefix="/api", tags=["System Configuration"])
+app.include_router(reports.router, prefix="/api", tags=["Reports"])
+app.include_router(dashboard.router, prefix="/api", tags=["Dashboard"])
+app.include_router(events.router, prefix="/api", tags=["Events"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
+app.include_router(diagnostics.router, prefix="/api", tags=["Diagnostics"])
 app.include_router(tickets_router, prefix="/api/v1", tags=["Tickets"])
+app.include_router(metrics.router, tags=["Metrics"])
 
 @app.get("/")
 async def root():
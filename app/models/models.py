@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Enum, UUID, Boolean, Integer, Table
-from sqlalchemy.sql import func
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, JSON, Enum, UUID, Boolean, Integer, Table, Index, DDL, event
+from sqlalchemy.sql import func, literal_column
 from sqlalchemy.orm import relationship
 import uuid, enum
 import uuid
@@ -102,6 +102,17 @@ class Student(Base):
     tickets_assigned = relationship("Ticket", back_populates="assignee", foreign_keys="[Ticket.assigned_student]")
     rfid_logs = relationship("RFIDLog", back_populates="student")
 
+    # Trigram indexes serving the student search on Postgres (see app/core/search.py)
+    __table_args__ = tuple(
+        Index(
+            f"ix_students_{column}_trgm",
+            column,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql")
+        for column in ("name", "surname", "rfid_tag", "phone", "email", "class_name")
+    )
+
 class Attendance(Base):
     __tablename__ = "attendances"
     
@@ -112,11 +123,22 @@ class Attendance(Base):
     status = Column(Enum(AttendanceStatus))
     recorded_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     notes = Column(String)
+    # When the row was last written, whatever its timestamp; the rollup job's watermark.
+    # Also a client-side default: on SQLite, upgrade_schema adds it without the server one
+    updated_at = Column(DateTime(timezone=True), default=func.now(), server_default=func.now(), onupdate=func.now())
     
     student = relationship("Student", back_populates="attendances")
     recorded_by = relationship("User", back_populates="attendances_recorded")
     schedule = relationship("AttendanceSchedule", back_populates="attendances")
 
+    # Date filters are expressed as timestamp ranges so these can serve them
+    __table_args__ = (
+        Index("ix_attendances_timestamp", "timestamp"),
+        Index("ix_attendances_schedule_timestamp", "schedule_id", "timestamp"),
+        Index("ix_attendances_student_schedule_timestamp", "student_id", "schedule_id", "timestamp"),
+        Index("ix_attendances_updated_at", "updated_at"),
+    )
+
 class SystemConfig(Base):
     __tablename__ = "system_config"
     
@@ -143,6 +165,21 @@ class UnknownRFID(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     last_seen = Column(DateTime(timezone=True), server_default=func.now())
 
+# Full-text search documents for tickets and comments (Postgres only). The
+# expressions are shared by the GIN indexes and the search queries in
+# app/core/ticket_search.py so the planner can match them.
+TEXT_SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+def ticket_search_document(title, description, category):
+    return (
+        func.setweight(func.to_tsvector(TEXT_SEARCH_CONFIG, func.coalesce(title, "")), literal_column("'A'"))
+        .op("||")(func.setweight(func.to_tsvector(TEXT_SEARCH_CONFIG, func.coalesce(category, "")), literal_column("'B'")))
+        .op("||")(func.setweight(func.to_tsvector(TEXT_SEARCH_CONFIG, func.coalesce(description, "")), literal_column("'C'")))
+    )
+
+def comment_search_document(content):
+    return func.to_tsvector(TEXT_SEARCH_CONFIG, func.coalesce(content, ""))
+
 class Ticket(Base):
     __tablename__ = "tickets"
 
@@ -160,6 +197,14 @@ class Ticket(Base):
     assignee = relationship("Student", back_populates="tickets_assigned")
     comments = relationship("Comment", back_populates="ticket")
 
+    __table_args__ = (
+        Index(
+            "ix_tickets_search_document",
+            ticket_search_document(title, description, category),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -172,12 +217,21 @@ class Comment(Base):
     ticket = relationship("Ticket", back_populates="comments")
     author = relationship("User", back_populates="comments")
 
+    __table_args__ = (
+        Index(
+            "ix_comments_search_document",
+            comment_search_document(content),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
+
 class Dormitory(Base):
     __tablename__ = "dormitories"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     address = Column(String)
+    timezone = Column(String, default="UTC")  # IANA name, e.g. "Europe/Brussels"
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
     
@@ -227,6 +281,13 @@ class AttendanceSchedule(Base):
                                   back_populates="assigned_schedules")
     rfid_logs = relationship("RFIDLog", back_populates="attendance_schedule")
 
+# pg_trgm must exist before the trigram indexes on students are created
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
 # Association table for AttendanceSchedule-Device many-to-many relationship
 attendance_schedule_devices = Table(
     'attendance_schedule_devices', Base.metadata,
@@ -247,3 +308,82 @@ class RFIDLog(Base):
     student = relationship("Student", back_populates="rfid_logs")
     device = relationship("User", back_populates="rfid_scans")
     attendance_schedule = relationship("AttendanceSchedule", back_populates="rfid_logs")
+
+class AttendanceDailyRollup(Base):
+    """One row per student per schedule per local day, derived from attendances.
+
+    Maintained by app/core/rollups.py; report endpoints read only from here.
+    """
+    __tablename__ = "attendance_daily_rollups"
+
+    dormitory_id = Column(UUID(as_uuid=True), ForeignKey("dormitories.id"), primary_key=True)
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("attendance_schedules.id"), primary_key=True)
+    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Local day in the dormitory's timezone
+    first_check_in = Column(DateTime(timezone=True))
+    last_check_out = Column(DateTime(timezone=True))
+    scan_count = Column(Integer, nullable=False, default=0)
+    final_status = Column(Enum(AttendanceStatus), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_attendance_daily_rollups_dormitory_day", "dormitory_id", "day"),
+    )
+
+class JobWatermark(Base):
+    """Last processed position of an incremental job, keyed by job name."""
+    __tablename__ = "job_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ResourceVersion(Base):
+    """Change counter of a resource, bumped by every write to it; feeds HTTP ETags."""
+    __tablename__ = "resource_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class JobLease(Base):
+    """Time-limited ownership of a named job, so only one worker runs it at a time."""
+    __tablename__ = "job_leases"
+
+    name = Column(String, primary_key=True)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    acquired_at = Column(DateTime(timezone=True), nullable=False)
+
+class ScheduleWindowRun(Base):
+    """Record that a schedule's window on a local day has been closed out.
+
+    Written in the same transaction as the ABSENT/LATE changes, so each window is
+    processed at most once however many workers run the job.
+    """
+    __tablename__ = "schedule_window_runs"
+
+    schedule_id = Column(UUID(as_uuid=True), ForeignKey("attendance_schedules.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # Local day in the dormitory's timezone
+    absent_marked = Column(Integer, nullable=False, default=0)
+    late_marked = Column(Integer, nullable=False, default=0)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JobRun(Base):
+    """History of background job executions, written by app/core/jobs.py."""
+    __tablename__ = "job_runs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    job_name = Column(String, nullable=False)
+    trigger = Column(String, nullable=False)  # "schedule" or "manual"
+    worker = Column(String, nullable=False)
+    status = Column(String, nullable=False)  # "success", "failed" or "timeout"
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
+    duration_ms = Column(Integer, nullable=False)
+    result = Column(String)
+    error = Column(String)
+
+    __table_args__ = (
+        Index("ix_job_runs_job_started", "job_name", "started_at"),
+    )
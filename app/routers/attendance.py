@@ -2,16 +2,23 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_, case
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone, date as date_type
 import uuid
+from app.core.absences import WEEKDAYS, current_window, in_date_range
+from app.core.conditional import bump_version
 from app.core.database import get_db
-from app.core.config import settings
+from app.core.query_audit import query_budget
+from app.core.serialization import FieldSelection, RowProjection, accepts_ndjson
+from app.core.runtime_config import RetentionConfig, system_config
+from app.core.timezones import get_zone, local_day_range
+from app.core.events import broker
 from app.models.models import (
     Attendance, 
     Student, 
     User, 
     AttendanceStatus, 
     AttendanceSchedule, 
+    Dormitory,
     UserRole,
     RFIDLog,
     UnknownRFID
@@ -29,6 +36,10 @@ from app.routers.auth import get_current_user, get_current_io_device
 
 router = APIRouter()
 
+attendance_fields = FieldSelection(AttendanceSchema, Attendance, views={
+    "compact": ("student_id", "schedule_id", "status", "timestamp", "recorded_by_id", "notes"),
+})
+
 async def check_staff_access(current_user: User):
     if current_user.role not in [UserRole.ADMIN, UserRole.STAFF]:
         raise HTTPException(
@@ -43,9 +54,12 @@ async def check_schedule_access(db: Session, current_user: User, schedule_id: st
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid schedule ID format")
 
-    schedule = db.query(AttendanceSchedule).filter(AttendanceSchedule.id == schedule_uuid).first()
-    if not schedule:
+    row = db.query(AttendanceSchedule, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    ).filter(AttendanceSchedule.id == schedule_uuid).first()
+    if not row:
         raise HTTPException(status_code=404, detail="Schedule not found")
+    schedule, tz_name = row
     
     if current_user.role != UserRole.ADMIN and current_user.dormitory_id != schedule.dormitory_id:
         raise HTTPException(
@@ -53,31 +67,31 @@ async def check_schedule_access(db: Session, current_user: User, schedule_id: st
             detail="You don't have access to this schedule"
         )
     
-    # Check if schedule is active and within date range
-    now = datetime.utcnow()
-    if not schedule.is_active or now < schedule.start_date or (schedule.end_date and now > schedule.end_date):
+    # Windows are in the dormitory's local time, as for scans and the close-out job
+    zone = get_zone(tz_name)
+    now = datetime.now(timezone.utc)
+    if schedule.is_active and current_window(schedule, now, zone):
+        return schedule
+    
+    today = now.astimezone(zone).date()
+    if not schedule.is_active or not in_date_range(schedule, today, zone):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Schedule is not active or outside its date range"
         )
     
     # Check if today is a scheduled day
-    weekday = now.strftime("%A").lower()
+    weekday = WEEKDAYS[today.weekday()]
     if not getattr(schedule, weekday, False):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Attendance is not scheduled for {weekday}"
         )
     
-    # Check if current time is within schedule time window
-    current_time = now.strftime("%H:%M")
-    if current_time < schedule.start_time or current_time > schedule.end_time:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Current time is outside the scheduled time window"
-        )
-    
-    return schedule
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Current time is outside the scheduled time window"
+    )
 
 @router.post("/attendance/", response_model=AttendanceSchema)
 async def create_attendance(
@@ -179,15 +193,21 @@ async def update_attendance(
     return db_attendance
 
 @router.get("/attendance/", response_model=List[AttendanceSchema])
+@query_budget(4)
 async def list_attendance(
     skip: int = 0,
     limit: int = 100,
     schedule_id: Optional[str] = None,
     date: Optional[datetime] = None,
+    date_from: Optional[date_type] = Query(None, alias="from"),
+    date_to: Optional[date_type] = Query(None, alias="to"),
+    projection: RowProjection = Depends(attendance_fields),
+    ndjson: bool = Depends(accepts_ndjson),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     query = db.query(Attendance)
+    schedule_uuid = None
     
     # Filter by dormitory for non-admin users
     if current_user.role != UserRole.ADMIN:
@@ -199,12 +219,40 @@ async def list_attendance(
             query = query.filter(Attendance.schedule_id == schedule_uuid)
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid schedule ID format")
+
+    # `date` selects one local day, `from`/`to` an inclusive range of local days.
+    # Both become a half-open timestamp range so the timestamp indexes apply.
     if date:
-        query = query.filter(
-            func.date(Attendance.timestamp) == func.date(date)
-        )
+        date_from = date_to = date.date()
+    if date_from or date_to:
+        if date_from and date_to and date_to < date_from:
+            raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+        tz_name = get_attendance_timezone(db, current_user, schedule_uuid)
+        dialect_name = db.get_bind().dialect.name
+        if date_from:
+            start, _ = local_day_range(tz_name, date_from, dialect_name=dialect_name)
+            query = query.filter(Attendance.timestamp >= start)
+        if date_to:
+            _, end = local_day_range(tz_name, date_to, dialect_name=dialect_name)
+            query = query.filter(Attendance.timestamp < end)
     
-    return query.offset(skip).limit(limit).all()
+    query = projection.apply(query).offset(skip).limit(limit)
+    if ndjson:
+        return projection.stream(query)
+    return projection.response(query.all())
+
+def get_attendance_timezone(db: Session, current_user: User, schedule_id: Optional[uuid.UUID] = None) -> Optional[str]:
+    """Timezone of the schedule's dormitory, falling back to the user's dormitory."""
+    query = db.query(Dormitory.timezone)
+    if schedule_id:
+        query = query.join(AttendanceSchedule, AttendanceSchedule.dormitory_id == Dormitory.id).filter(
+            AttendanceSchedule.id == schedule_id
+        )
+    elif current_user.dormitory_id:
+        query = query.filter(Dormitory.id == current_user.dormitory_id)
+    else:
+        return None
+    return query.scalar()
 
 
 @router.post("/attendance/bulk", response_model=List[AttendanceSchema])
@@ -287,6 +335,7 @@ async def create_bulk_attendance(
                     print(f"Updated last_attendance_taken for schedule {schedule_id_str}")
             except Exception as e:
                 print(f"Error updating schedule {schedule_id_str}: {str(e)}")
+        bump_version(db, "attendance_schedules")
 
         # Commit the schedule updates
         db.commit()
@@ -306,6 +355,7 @@ async def create_bulk_attendance(
         )
 
 @router.post("/rfid-scan")
+@query_budget(12)
 async def record_rfid_scan(
     rfid_tag: str,
     db: Session = Depends(get_db),
@@ -323,10 +373,12 @@ async def record_rfid_scan(
             unknown_rfid.last_seen = func.now()
         
         # Clean up old unknown RFID records
-        cleanup_date = datetime.utcnow() - timedelta(days=settings.UNKNOWN_RFID_RETENTION_DAYS)
+        retention = system_config.section("retention", RetentionConfig)
+        cleanup_date = datetime.utcnow() - timedelta(days=retention.unknown_rfid_days)
         db.query(UnknownRFID).filter(UnknownRFID.last_seen < cleanup_date).delete()
         
         db.commit()
+        broker.publish("rfid.unknown", device.dormitory_id, rfid_tag=rfid_tag, device_id=device.id)
         raise HTTPException(
             status_code=404, 
             detail=f"Unknown RFID tag: {rfid_tag}"
@@ -346,20 +398,18 @@ async def record_rfid_scan(
             detail="Student is not assigned to any dormitory"
         )
 
-    # Find active schedule for current time
-    now = datetime.utcnow()
-    weekday = now.strftime("%A").lower()
-    current_time = now.strftime("%H:%M")
-    
-    schedule = db.query(AttendanceSchedule).filter(
+    # Find the schedule whose window is open now, in the dormitory's local time
+    now = datetime.now(timezone.utc)
+    candidates = db.query(AttendanceSchedule, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    ).filter(
         AttendanceSchedule.dormitory_id == student.dormitory_id,
-        AttendanceSchedule.is_active == True,
-        AttendanceSchedule.start_date <= now,
-        (AttendanceSchedule.end_date >= now) | (AttendanceSchedule.end_date == None),
-        getattr(AttendanceSchedule, weekday) == True,
-        AttendanceSchedule.start_time <= current_time,
-        AttendanceSchedule.end_time >= current_time
-    ).first()
+        AttendanceSchedule.is_active == True
+    ).order_by(AttendanceSchedule.start_time).all()
+    schedule = next(
+        (candidate for candidate, tz_name in candidates if current_window(candidate, now, get_zone(tz_name))),
+        None
+    )
     
     if not schedule:
         raise HTTPException(
@@ -403,6 +453,22 @@ async def record_rfid_scan(
     db.add(db_attendance)
     db.commit()
     db.refresh(db_attendance)
+
+    event_data = {
+        "student_id": student.id,
+        "student_name": student.name,
+        "schedule_id": schedule.id,
+        "schedule_name": schedule.name,
+        "device_id": device.id,
+        "timestamp": db_attendance.timestamp
+    }
+    broker.publish("rfid.scan", student.dormitory_id, rfid_tag=rfid_tag, **event_data)
+    broker.publish(
+        "attendance.check_in" if is_check_in else "attendance.check_out",
+        student.dormitory_id,
+        status=db_attendance.status,
+        **event_data
+    )
     
     return {
         "status": "success",
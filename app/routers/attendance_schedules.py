@@ -1,19 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, func, and_
+from typing import List, Optional
+from datetime import datetime, date
 import uuid
+from app.core.conditional import bump_version, conditional_get
 from app.core.database import get_db
-from app.models.models import AttendanceSchedule, User, UserRole, Dormitory
+from app.core.query_audit import query_budget
+from app.core.absences import close_finished_windows
+from app.core.timezones import get_zone, local_day_range
+from app.models.models import AttendanceSchedule, Attendance, Student, Room, User, UserRole, Dormitory
 from app.schemas.schemas import (
     AttendanceScheduleCreate,
     AttendanceScheduleUpdate,
-    AttendanceSchedule as AttendanceScheduleSchema
+    AttendanceSchedule as AttendanceScheduleSchema,
+    RosterEntry,
+    ScheduleWindowResult
 )
 from app.routers.auth import get_current_user
 
 router = APIRouter()
 
+# Schedules nest their dormitory and the user who created them
+SCHEDULE_RESOURCES = ("attendance_schedules", "dormitories", "users")
+
 async def check_admin_access(current_user: User, dormitory_id: str = None):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -51,18 +61,32 @@ async def create_attendance_schedule(
         created_by_id=current_user.id
     )
     db.add(db_schedule)
+    bump_version(db, "attendance_schedules")
     db.commit()
     db.refresh(db_schedule)
     return db_schedule
 
 @router.get("/attendance-schedules/", response_model=List[AttendanceScheduleSchema])
+@query_budget(5)
 async def list_attendance_schedules(
+    request: Request,
+    response: Response,
     dormitory_id: str = None,
     active_only: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    query = db.query(AttendanceSchedule)
+    # Which schedules are active depends on the time as well
+    now = datetime.utcnow().strftime("%Y-%m-%dT%H:%M") if active_only else None
+    not_modified = conditional_get(request, response, db, current_user, SCHEDULE_RESOURCES, now)
+    if not_modified is not None:
+        return not_modified
+
+    # Nested in the response; loaded in the same statement
+    query = db.query(AttendanceSchedule).options(
+        joinedload(AttendanceSchedule.dormitory),
+        joinedload(AttendanceSchedule.created_by)
+    )
     
     # Filter by dormitory if specified
     if dormitory_id:
@@ -88,9 +112,15 @@ async def list_attendance_schedules(
 @router.get("/attendance-schedules/{schedule_id}", response_model=AttendanceScheduleSchema)
 async def get_attendance_schedule(
     schedule_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, SCHEDULE_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     schedule = db.query(AttendanceSchedule).filter(AttendanceSchedule.id == schedule_id).first()
     if not schedule:
         raise HTTPException(status_code=404, detail="Schedule not found")
@@ -140,6 +170,7 @@ async def update_attendance_schedule(
     update_data = schedule_update.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_schedule, field, value)
+    bump_version(db, "attendance_schedules")
     
     db.commit()
     db.refresh(db_schedule)
@@ -159,4 +190,84 @@ async def delete_attendance_schedule(
     
     # Instead of deleting, mark as inactive
     db_schedule.is_active = False
+    bump_version(db, "attendance_schedules")
     db.commit()
+
+
+def build_roster_query(schedule_id, dormitory_id, start: datetime, end: datetime):
+    """Every active student of the dormitory with their latest record for the
+    schedule inside ``[start, end)``, resolved with a window function in one query."""
+    ranked = select(
+        Attendance.student_id,
+        Attendance.status,
+        Attendance.timestamp,
+        func.row_number().over(
+            partition_by=Attendance.student_id,
+            order_by=Attendance.timestamp.desc()
+        ).label("position")
+    ).where(
+        Attendance.schedule_id == schedule_id,
+        Attendance.timestamp >= start,
+        Attendance.timestamp < end
+    ).subquery()
+
+    return select(
+        Student.id.label("student_id"),
+        Student.name,
+        Student.surname,
+        Student.rfid_tag,
+        Student.photo_url,
+        Room.id.label("room_id"),
+        Room.number.label("room_number"),
+        ranked.c.status,
+        ranked.c.timestamp
+    ).outerjoin(Room, Student.room_id == Room.id).outerjoin(
+        ranked, and_(ranked.c.student_id == Student.id, ranked.c.position == 1)
+    ).where(
+        Student.dormitory_id == dormitory_id,
+        Student.is_active == True
+    ).order_by(Room.number.is_(None), Room.number, Student.name, Student.surname)
+
+@router.get("/attendance-schedules/{schedule_id}/roster", response_model=List[RosterEntry])
+@query_budget(5)
+async def get_schedule_roster(
+    schedule_id: str,
+    day: Optional[date] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        schedule_uuid = uuid.UUID(schedule_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid schedule ID format")
+
+    schedule = db.query(AttendanceSchedule.dormitory_id, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    ).filter(AttendanceSchedule.id == schedule_uuid).first()
+    if not schedule:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+
+    if current_user.role != UserRole.ADMIN and current_user.dormitory_id != schedule.dormitory_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this schedule"
+        )
+
+    # Roll call covers one local day, today unless another day is given
+    day = day or datetime.now(get_zone(schedule.timezone)).date()
+    start, end = local_day_range(schedule.timezone, day, dialect_name=db.get_bind().dialect.name)
+    rows = db.execute(build_roster_query(schedule_uuid, schedule.dormitory_id, start, end))
+    return [row._asdict() for row in rows]
+
+@router.post("/attendance-schedules/close-windows", response_model=List[ScheduleWindowResult])
+def close_schedule_windows(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark absences and lateness for every window that has closed but not been processed."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation requires admin privileges"
+        )
+    return close_finished_windows(db)
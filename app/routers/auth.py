@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
 from uuid import UUID
+from app.core.conditional import bump_version
 from app.core.database import get_db
 from app.core.security import verify_password, create_access_token, verify_token, get_password_hash, blacklist_token, \
     verify_refresh_token, create_refresh_token
@@ -52,6 +53,22 @@ async def check_admin_access(current_user: User):
         )
 
 
+def scoped_dormitory_id(current_user: User, requested: Optional[UUID] = None) -> Optional[UUID]:
+    """The dormitory a request is limited to; None (every dormitory) is only ever returned for admins.
+
+    Admins get ``requested``. Everyone else gets their own dormitory, and a
+    non-admin without one is refused instead of being left unfiltered.
+    """
+    if current_user.role == UserRole.ADMIN:
+        return requested
+    if current_user.dormitory_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not assigned to a dormitory"
+        )
+    return current_user.dormitory_id
+
+
 @router.post("/register", response_model=UserSchema)
 async def register_user(user: UserCreate, db: Session = Depends(get_db)):
     # Check if user with this email already exists
@@ -124,6 +141,7 @@ async def update_current_user(
     for field, value in update_data.items():
         setattr(current_user, field, value)
 
+    bump_version(db, "users")
     db.commit()
     db.refresh(current_user)
     return current_user
@@ -161,6 +179,7 @@ async def update_user_role(
         raise HTTPException(status_code=404, detail="User not found")
 
     user.role = role
+    bump_version(db, "users")
     db.commit()
     db.refresh(user)
     return user
@@ -186,6 +205,7 @@ async def toggle_user_status(
         raise HTTPException(status_code=404, detail="User not found")
 
     user.is_active = is_active
+    bump_version(db, "users")
     db.commit()
     db.refresh(user)
     return user
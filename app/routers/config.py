@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List
+from app.core.conditional import bump_version, conditional_get
 from app.core.database import get_db
+from app.core.runtime_config import system_config
 from app.models.models import SystemConfig, User, UserRole
 from app.schemas.schemas import (
     SystemConfigCreate,
@@ -11,6 +13,8 @@ from app.routers.auth import get_current_user
 
 router = APIRouter()
 
+CONFIG_RESOURCES = ("system_config",)
+
 async def check_admin_access(current_user: User):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -35,16 +39,25 @@ async def create_system_config(
     
     db_config = SystemConfig(**config.dict())
     db.add(db_config)
+    bump_version(db, "system_config")
     db.commit()
     db.refresh(db_config)
+    # Other workers pick the change up on their next poll
+    system_config.refresh(db)
     return db_config
 
 @router.get("/config/{key}", response_model=SystemConfigSchema)
 async def get_system_config(
     key: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, CONFIG_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     config = db.query(SystemConfig).filter(SystemConfig.key == key).first()
     if not config:
         raise HTTPException(status_code=404, detail="Configuration not found")
@@ -64,13 +77,21 @@ async def update_system_config(
         raise HTTPException(status_code=404, detail="Configuration not found")
     
     config.value = value
+    bump_version(db, "system_config")
     db.commit()
     db.refresh(config)
+    system_config.refresh(db)
     return config
 
 @router.get("/config/", response_model=List[SystemConfigSchema])
 async def list_system_configs(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, CONFIG_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     return db.query(SystemConfig).all()
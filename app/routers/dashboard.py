@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_
+from datetime import datetime, timezone
+from app.core.absences import is_window_day, schedule_window
+from app.core.dashboard_cache import summary_cache, summary_key
+from app.core.database import get_db
+from app.core.query_audit import query_budget
+from app.core.timezones import get_zone, local_day_range
+from app.models.models import (
+    Attendance,
+    AttendanceSchedule,
+    AttendanceStatus,
+    Dormitory,
+    Student,
+    Ticket,
+    TicketStatus,
+    UnknownRFID,
+    User
+)
+from app.schemas.schemas import DashboardSummary
+from app.routers.auth import get_current_user, scoped_dormitory_id
+
+router = APIRouter()
+
+def schedule_state(schedule: AttendanceSchedule, now: datetime, zone) -> str:
+    """State of the schedule's window opening today in ``zone``."""
+    start, end = schedule_window(schedule, now.astimezone(zone).date(), zone)
+    if now < start:
+        return "upcoming"
+    if now > end:
+        return "finished"
+    return "in_progress"
+
+
+def build_summary(db: Session, dormitory_id) -> dict:
+    student_filters = [Student.is_active == True]
+    if dormitory_id:
+        student_filters.append(Student.dormitory_id == dormitory_id)
+    active_students = db.query(func.count(Student.id)).filter(*student_filters).scalar()
+
+    # Present now: students whose latest scan today is a check-in
+    tz_name = db.query(Dormitory.timezone).filter(Dormitory.id == dormitory_id).scalar() if dormitory_id else None
+    today = datetime.now(get_zone(tz_name)).date()
+    start, end = local_day_range(tz_name, today, dialect_name=db.get_bind().dialect.name)
+    latest = db.query(
+        Attendance.student_id,
+        func.max(Attendance.timestamp).label("timestamp")
+    ).join(Student, Attendance.student_id == Student.id).filter(
+        *student_filters,
+        Attendance.timestamp >= start,
+        Attendance.timestamp < end
+    ).group_by(Attendance.student_id).subquery()
+    present_now = db.query(func.count(func.distinct(Attendance.student_id))).join(
+        latest,
+        and_(Attendance.student_id == latest.c.student_id, Attendance.timestamp == latest.c.timestamp)
+    ).filter(Attendance.status.in_([AttendanceStatus.PRESENT, AttendanceStatus.LATE])).scalar()
+
+    # Tickets belong to the dormitory of the staff member who created them
+    ticket_query = db.query(Ticket.status, func.count(Ticket.id)).filter(
+        Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])
+    )
+    recent_tickets_query = db.query(Ticket)
+    if dormitory_id:
+        ticket_query = ticket_query.join(User, Ticket.created_by == User.id).filter(User.dormitory_id == dormitory_id)
+        recent_tickets_query = recent_tickets_query.join(User, Ticket.created_by == User.id).filter(
+            User.dormitory_id == dormitory_id
+        )
+    ticket_counts = dict(ticket_query.group_by(Ticket.status).all())
+
+    # Schedule windows are in each dormitory's local time, as for scans and the close-out job
+    now = datetime.now(timezone.utc)
+    schedule_query = db.query(AttendanceSchedule, Dormitory.timezone).join(
+        Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id
+    ).filter(AttendanceSchedule.is_active == True)
+    if dormitory_id:
+        schedule_query = schedule_query.filter(AttendanceSchedule.dormitory_id == dormitory_id)
+    schedules_today = []
+    for schedule, schedule_tz in schedule_query.order_by(AttendanceSchedule.start_time):
+        zone = get_zone(schedule_tz)
+        if not is_window_day(schedule, now.astimezone(zone).date(), zone):
+            continue
+        schedules_today.append({
+            "id": schedule.id,
+            "name": schedule.name,
+            "start_time": schedule.start_time,
+            "end_time": schedule.end_time,
+            "state": schedule_state(schedule, now, zone),
+            "last_attendance_taken": schedule.last_attendance_taken
+        })
+
+    latest_unknown = db.query(UnknownRFID).order_by(UnknownRFID.last_seen.desc()).first()
+    recent_students = db.query(
+        Student.id, Student.name, Student.surname, Student.school, Student.is_active
+    ).filter(*student_filters[1:]).order_by(Student.created_at.desc()).limit(5).all()
+
+    return {
+        "active_students": active_students,
+        "present_now": present_now,
+        "open_tickets": ticket_counts.get(TicketStatus.OPEN, 0),
+        "in_progress_tickets": ticket_counts.get(TicketStatus.IN_PROGRESS, 0),
+        "schedules_today": schedules_today,
+        "latest_unknown_rfid": {
+            "rfid_tag": latest_unknown.rfid_tag,
+            "first_seen": latest_unknown.created_at,
+            "last_seen": latest_unknown.last_seen
+        } if latest_unknown else None,
+        "recent_students": [row._asdict() for row in recent_students],
+        "recent_tickets": [
+            {
+                "id": ticket.id,
+                "title": ticket.title,
+                "description": ticket.description,
+                "status": ticket.status,
+                "created_at": ticket.created_at
+            }
+            for ticket in recent_tickets_query.order_by(Ticket.created_at.desc()).limit(5)
+        ]
+    }
+
+
+@router.get("/dashboard/summary", response_model=DashboardSummary)
+@query_budget(12)
+def get_dashboard_summary(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Admins see their own dormitory, or every dormitory when they have none
+    dormitory_id = scoped_dormitory_id(current_user, current_user.dormitory_id)
+    return summary_cache.get_or_set(summary_key(dormitory_id), lambda: build_summary(db, dormitory_id))
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse, Response
+from typing import List, Optional
+import asyncio
+import time
+from app.core import profiler
+from app.core.config import settings
+from app.core.database import slow_query_log
+from app.models.models import User, UserRole
+from app.schemas.schemas import SlowQuery, SlowQueryDump, RequestProfileSummary
+from app.routers.auth import get_current_user
+
+router = APIRouter()
+
+
+async def check_admin_access(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation requires admin privileges"
+        )
+
+
+@router.get("/diagnostics/slow-queries", response_model=List[SlowQuery])
+async def list_slow_queries(
+    limit: Optional[int] = Query(100, ge=1),
+    min_duration_ms: Optional[float] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Slowest recent statements seen by this worker, newest first."""
+    await check_admin_access(current_user)
+    entries = slow_query_log.snapshot()
+    if min_duration_ms is not None:
+        entries = [entry for entry in entries if entry["duration_ms"] >= min_duration_ms]
+    return entries[:limit]
+
+
+@router.post("/diagnostics/slow-queries/dump", response_model=SlowQueryDump)
+async def dump_slow_queries(
+    clear: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """Append the buffered entries to SLOW_QUERY_DUMP_PATH as JSON lines."""
+    await check_admin_access(current_user)
+    written = slow_query_log.dump(settings.SLOW_QUERY_DUMP_PATH)
+    if clear:
+        slow_query_log.clear()
+    return {"path": settings.SLOW_QUERY_DUMP_PATH, "entries": written}
+
+
+@router.delete("/diagnostics/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries(current_user: User = Depends(get_current_user)):
+    await check_admin_access(current_user)
+    slow_query_log.clear()
+
+
+@router.get("/diagnostics/profile", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(10, gt=0, le=60),
+    interval_ms: float = Query(5, ge=1, le=100),
+    include_idle: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """Sample this worker's thread stacks for ``seconds`` and return them in collapsed format."""
+    await check_admin_access(current_user)
+    try:
+        stacks, samples = await asyncio.to_thread(
+            profiler.sample_stacks, seconds, interval_ms / 1000, include_idle
+        )
+    except profiler.ProfilerBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc))
+    filename = f"profile-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        profiler.collapsed(stacks),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "X-Profile-Samples": str(samples)}
+    )
+
+
+@router.get("/diagnostics/request-profiles", response_model=List[RequestProfileSummary])
+async def list_request_profiles(current_user: User = Depends(get_current_user)):
+    """Requests captured with the X-Profile-Token header, newest first."""
+    await check_admin_access(current_user)
+    return profiler.request_profiles.summaries()
+
+
+@router.get("/diagnostics/request-profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: str,
+    format: str = Query("text", pattern="^(text|prof)$"),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls)$"),
+    current_user: User = Depends(get_current_user)
+):
+    """A captured request profile as a pstats report or a .prof file."""
+    await check_admin_access(current_user)
+    entry = profiler.request_profiles.get(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "prof":
+        return Response(
+            profiler.stats_file(entry),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="request-{profile_id}.prof"'}
+        )
+    return PlainTextResponse(profiler.stats_text(entry, sort))
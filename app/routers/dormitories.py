@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
+from app.core.conditional import bump_version, conditional_get
 from app.core.database import get_db
 from app.models.models import Dormitory, User, UserRole
 from app.schemas.schemas import DormitoryCreate, Dormitory as DormitorySchema
@@ -8,6 +9,8 @@ from app.routers.auth import get_current_user
 
 router = APIRouter()
 
+DORMITORY_RESOURCES = ("dormitories",)
+
 async def check_admin_access(current_user: User):
     if current_user.role != UserRole.ADMIN:
         raise HTTPException(
@@ -38,6 +41,7 @@ async def create_dormitory(
     # Assign admin to the dormitory
     current_user.dormitory_id = db_dormitory.id
     db.add(current_user)
+    bump_version(db, "dormitories", "users")
     
     db.commit()
     db.refresh(db_dormitory)
@@ -45,11 +49,17 @@ async def create_dormitory(
 
 @router.get("/dormitories/", response_model=List[DormitorySchema])
 async def list_dormitories(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, DORMITORY_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     query = db.query(Dormitory)
     
     # Regular admin can only see their own dormitory
@@ -62,9 +72,15 @@ async def list_dormitories(
 @router.get("/dormitories/{dormitory_id}", response_model=DormitorySchema)
 async def get_dormitory(
     dormitory_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, DORMITORY_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     dormitory = db.query(Dormitory).filter(Dormitory.id == dormitory_id).first()
     if not dormitory:
         raise HTTPException(status_code=404, detail="Dormitory not found")
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+import json
+import uuid
+from app.core.database import get_db
+from app.core.events import broker, DROPPED
+from app.models.models import User
+from app.routers.auth import get_current_user, scoped_dormitory_id
+
+router = APIRouter()
+
+KEEPALIVE_SECONDS = 15
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/events/stream")
+async def stream_events(
+    request: Request,
+    dormitory_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Server-Sent Events stream of scans, unknown tags and check-in/out transitions."""
+    try:
+        dormitory_uuid = uuid.UUID(dormitory_id) if dormitory_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid dormitory ID format")
+
+    # Non-admin users only see their own dormitory; refused before subscribing
+    dormitory_uuid = scoped_dormitory_id(current_user, dormitory_uuid)
+
+    # The stream may stay open for hours; don't hold a pooled connection for it
+    db.close()
+
+    subscription = broker.subscribe(dormitory_uuid)
+
+    async def event_source():
+        try:
+            yield ": connected\n\n"
+            while True:
+                event = await subscription.get(timeout=KEEPALIVE_SECONDS)
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+                if event is DROPPED:
+                    break
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
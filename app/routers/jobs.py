@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+from typing import List
+from app.core.database import get_db
+from app.core.jobs import scheduler
+from app.models.models import JobRun, User, UserRole
+from app.schemas.schemas import JobInfo, JobRun as JobRunSchema, JobTriggerResult
+from app.routers.auth import get_current_user
+
+router = APIRouter()
+
+
+async def check_admin_access(current_user: User):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation requires admin privileges"
+        )
+
+
+def get_job_or_404(name: str):
+    if name not in scheduler.jobs:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return scheduler.jobs[name]
+
+
+@router.get("/jobs", response_model=List[JobInfo])
+async def list_jobs(current_user: User = Depends(get_current_user)):
+    """Registered jobs with their schedule and this worker's run statistics."""
+    await check_admin_access(current_user)
+    return [job.stats() for job in scheduler.jobs.values()]
+
+
+@router.get("/jobs/{name}/runs", response_model=List[JobRunSchema])
+async def list_job_runs(
+    name: str,
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Most recent runs of a job across all workers."""
+    await check_admin_access(current_user)
+    get_job_or_404(name)
+    return db.query(JobRun).filter(JobRun.job_name == name).order_by(JobRun.started_at.desc()).limit(limit).all()
+
+
+@router.post("/jobs/{name}/run", response_model=JobTriggerResult)
+async def trigger_job(name: str, current_user: User = Depends(get_current_user)):
+    """Run a job on this worker now and wait for it to finish or time out."""
+    await check_admin_access(current_user)
+    get_job_or_404(name)
+    run_status = await scheduler.run_job(name)
+    if run_status is None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Job is already running")
+    return {"name": name, "status": run_status}
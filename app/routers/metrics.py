@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import Response
+from typing import Optional
+from app.core.cache import caches
+from app.core.config import settings
+from app.core.database import engine
+from app.core.events import broker
+from app.core.metrics import CONTENT_TYPE, sample_lines, registry
+
+router = APIRouter()
+
+
+def pool_metrics() -> list:
+    pool = engine.pool
+    samples = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        # Not every pool class (e.g. SQLite's) implements all of these
+        method = getattr(pool, name, None)
+        if callable(method):
+            samples[name] = method()
+    return sample_lines("db_pool_connections", "Connection pool state by kind.", samples, label="state")
+
+
+def cache_metrics() -> list:
+    hits = {name: cache.hits for name, cache in caches.items()}
+    misses = {name: cache.misses for name, cache in caches.items()}
+    ratio = {name: cache.hits / ((cache.hits + cache.misses) or 1) for name, cache in caches.items()}
+    entries = {name: len(cache) for name, cache in caches.items()}
+    return (
+        sample_lines("cache_hits_total", "Cache hits since start.", hits, label="cache", kind="counter")
+        + sample_lines("cache_misses_total", "Cache misses since start.", misses, label="cache", kind="counter")
+        + sample_lines("cache_hit_ratio", "Cache hits over lookups since start.", ratio, label="cache")
+        + sample_lines("cache_entries", "Entries currently cached.", entries, label="cache")
+    )
+
+
+def event_metrics() -> list:
+    return (
+        sample_lines("event_stream_subscribers", "Connected event stream subscribers.", {"": broker.subscriber_count})
+        + sample_lines("events_published_total", "Events published since start.", {"": broker.published}, kind="counter")
+        + sample_lines(
+            "event_stream_dropped_subscribers_total",
+            "Subscribers dropped for falling behind since start.",
+            {"": broker.dropped_subscribers},
+            kind="counter"
+        )
+    )
+
+
+registry.add_collector(pool_metrics)
+registry.add_collector(cache_metrics)
+registry.add_collector(event_metrics)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text exposition of this worker's metrics."""
+    if settings.METRICS_TOKEN and authorization != f"Bearer {settings.METRICS_TOKEN}":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(registry.render(), media_type=CONTENT_TYPE)
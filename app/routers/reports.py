@@ -0,0 +1,249 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from typing import List, Optional
+from datetime import date
+import uuid
+from app.core.database import get_db
+from app.core.rollups import refresh_attendance_rollups
+from app.core.analytics import attendance_analytics
+from app.core import export
+from app.core.timezones import local_day_range
+from app.models.models import AttendanceDailyRollup, AttendanceSchedule, AttendanceStatus, Dormitory, User, UserRole
+from app.schemas.schemas import (
+    StudentAttendanceRate,
+    ScheduleCompliance,
+    DailyAttendanceCount,
+    RollupRefreshResult
+)
+from app.routers.auth import get_current_user, scoped_dormitory_id
+
+router = APIRouter()
+
+# All report queries below read only from attendance_daily_rollups
+Rollup = AttendanceDailyRollup
+
+present_count = func.sum(case((Rollup.final_status == AttendanceStatus.PRESENT, 1), else_=0))
+late_count = func.sum(case((Rollup.final_status == AttendanceStatus.LATE, 1), else_=0))
+absent_count = func.sum(case((Rollup.final_status == AttendanceStatus.ABSENT, 1), else_=0))
+
+
+def rollup_filters(
+    current_user: User,
+    dormitory_id: Optional[str],
+    schedule_id: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date]
+) -> list:
+    try:
+        dormitory_uuid = uuid.UUID(dormitory_id) if dormitory_id else None
+        schedule_uuid = uuid.UUID(schedule_id) if schedule_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid dormitory or schedule ID format")
+
+    # Non-admin users can only report on their own dormitory
+    dormitory_uuid = scoped_dormitory_id(current_user, dormitory_uuid)
+
+    filters = []
+    if dormitory_uuid:
+        filters.append(Rollup.dormitory_id == dormitory_uuid)
+    if schedule_uuid:
+        filters.append(Rollup.schedule_id == schedule_uuid)
+    if date_from:
+        filters.append(Rollup.day >= date_from)
+    if date_to:
+        filters.append(Rollup.day <= date_to)
+    return filters
+
+
+def rate(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+@router.get("/reports/attendance/students", response_model=List[StudentAttendanceRate])
+def student_attendance_rates(
+    dormitory_id: Optional[str] = None,
+    schedule_id: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    skip: int = 0,
+    limit: int = 1000,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    filters = rollup_filters(current_user, dormitory_id, schedule_id, date_from, date_to)
+    rows = db.query(
+        Rollup.student_id,
+        func.count(),
+        present_count,
+        late_count,
+        absent_count
+    ).filter(*filters).group_by(Rollup.student_id).order_by(Rollup.student_id).offset(skip).limit(limit)
+
+    return [
+        {
+            "student_id": student_id,
+            "days": days,
+            "present_days": present or 0,
+            "late_days": late or 0,
+            "absent_days": absent or 0,
+            "attendance_rate": rate((present or 0) + (late or 0), days)
+        }
+        for student_id, days, present, late, absent in rows
+    ]
+
+
+@router.get("/reports/attendance/schedules", response_model=List[ScheduleCompliance])
+def schedule_compliance(
+    dormitory_id: Optional[str] = None,
+    schedule_id: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    filters = rollup_filters(current_user, dormitory_id, schedule_id, date_from, date_to)
+    totals = db.query(
+        Rollup.schedule_id,
+        func.count(),
+        present_count,
+        late_count,
+        absent_count
+    ).filter(*filters).group_by(Rollup.schedule_id).all()
+
+    names = dict(
+        db.query(AttendanceSchedule.id, AttendanceSchedule.name).filter(
+            AttendanceSchedule.id.in_([row[0] for row in totals])
+        )
+    ) if totals else {}
+
+    return [
+        {
+            "schedule_id": schedule_id,
+            "schedule_name": names.get(schedule_id),
+            "student_days": student_days,
+            "present": present or 0,
+            "late": late or 0,
+            "absent": absent or 0,
+            "compliance_rate": rate((present or 0) + (late or 0), student_days)
+        }
+        for schedule_id, student_days, present, late, absent in totals
+    ]
+
+
+@router.get("/reports/attendance/days", response_model=List[DailyAttendanceCount])
+def daily_attendance_counts(
+    dormitory_id: Optional[str] = None,
+    schedule_id: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    filters = rollup_filters(current_user, dormitory_id, schedule_id, date_from, date_to)
+    rows = db.query(
+        Rollup.day,
+        present_count,
+        late_count,
+        absent_count
+    ).filter(*filters).group_by(Rollup.day).order_by(Rollup.day)
+
+    return [
+        {"day": day, "present": present or 0, "late": late or 0, "absent": absent or 0}
+        for day, present, late, absent in rows
+    ]
+
+
+@router.get("/reports/attendance/analytics")
+def get_attendance_analytics(
+    dormitory_id: Optional[str] = None,
+    schedule_id: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    group_by: str = Query("student", pattern="^(student|room)$"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Monthly rates, lateness/absence streaks and weekday/hour histograms.
+
+    Arrays are columnar: element ``i`` of every per-group array belongs to ``groups[i]``.
+    """
+    try:
+        dormitory_uuid = uuid.UUID(dormitory_id) if dormitory_id else None
+        schedule_uuid = uuid.UUID(schedule_id) if schedule_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid dormitory or schedule ID format")
+
+    dormitory_uuid = scoped_dormitory_id(current_user, dormitory_uuid)
+
+    return attendance_analytics(
+        db,
+        dormitory_id=dormitory_uuid,
+        schedule_id=schedule_uuid,
+        date_from=date_from,
+        date_to=date_to,
+        group_by=group_by
+    )
+
+
+@router.get("/reports/attendance/export")
+def export_attendance(
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    dormitory_id: Optional[str] = None,
+    schedule_id: Optional[str] = None,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream raw attendance joined to student and schedule as CSV, NDJSON or Parquet."""
+    if current_user.role not in [UserRole.ADMIN, UserRole.STAFF]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation requires staff privileges"
+        )
+    if format == "parquet" and not export.parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires the pyarrow package"
+        )
+    try:
+        dormitory_uuid = uuid.UUID(dormitory_id) if dormitory_id else None
+        schedule_uuid = uuid.UUID(schedule_id) if schedule_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid dormitory or schedule ID format")
+
+    dormitory_uuid = scoped_dormitory_id(current_user, dormitory_uuid)
+
+    start = end = None
+    if date_from or date_to:
+        tz_name = db.query(Dormitory.timezone).filter(
+            Dormitory.id == (dormitory_uuid or current_user.dormitory_id)
+        ).scalar()
+        dialect_name = db.get_bind().dialect.name
+        if date_from:
+            start, _ = local_day_range(tz_name, date_from, dialect_name=dialect_name)
+        if date_to:
+            _, end = local_day_range(tz_name, date_to, dialect_name=dialect_name)
+
+    stmt = export.build_export_query(dormitory_uuid, schedule_uuid, start, end)
+    filename = f"attendance-{date_from or 'start'}-{date_to or 'now'}.{format}"
+    return StreamingResponse(
+        export.STREAMERS[format](stmt),
+        media_type=export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/reports/attendance/rollups/refresh", response_model=RollupRefreshResult)
+def refresh_rollups(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operation requires admin privileges"
+        )
+    return {"keys_rebuilt": refresh_attendance_rollups(db)}
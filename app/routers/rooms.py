@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from app.core.conditional import bump_version, conditional_get
 from app.core.database import get_db
+from app.core.query_audit import query_budget
+from app.core.serialization import FieldSelection, RowProjection, accepts_ndjson
 from app.models.models import Room, User, UserRole
 from app.schemas.schemas import RoomCreate, Room as RoomSchema
 from app.routers.auth import get_current_user
 
 router = APIRouter()
 
+# Rooms nest their dormitory
+ROOM_RESOURCES = ("rooms", "dormitories")
+
+room_fields = FieldSelection(RoomSchema, Room, views={
+    "compact": ("number", "floor", "capacity", "is_active", "dormitory_id"),
+})
+
 async def check_staff_access(current_user: User):
     if current_user.role not in [UserRole.ADMIN, UserRole.STAFF]:
         raise HTTPException(
@@ -42,19 +52,29 @@ async def create_room(
     
     db_room = Room(**room.dict(), dormitory_id=current_user.dormitory_id)
     db.add(db_room)
+    bump_version(db, "rooms")
     db.commit()
     db.refresh(db_room)
     return db_room
 
 @router.get("/rooms/", response_model=List[RoomSchema])
+@query_budget(4)
 async def list_rooms(
+    request: Request,
+    response: Response,
     floor: Optional[int] = None,
     is_active: Optional[bool] = True,
     skip: int = 0,
     limit: int = 100,
+    projection: RowProjection = Depends(room_fields),
+    ndjson: bool = Depends(accepts_ndjson),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, ROOM_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     query = db.query(Room)
     
     # Filter by floor if specified
@@ -67,15 +87,23 @@ async def list_rooms(
     if current_user.role != UserRole.ADMIN:
         query = query.filter(Room.dormitory_id == current_user.dormitory_id)
     
-    rooms = query.offset(skip).limit(limit).all()
-    return rooms
+    query = projection.apply(query).offset(skip).limit(limit)
+    if ndjson:
+        return projection.stream(query, headers=response.headers)
+    return projection.response(query.all(), headers=response.headers)
 
 @router.get("/rooms/{room_id}", response_model=RoomSchema)
 async def get_room(
     room_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    not_modified = conditional_get(request, response, db, current_user, ROOM_RESOURCES)
+    if not_modified is not None:
+        return not_modified
+
     room = db.query(Room).filter(Room.id == room_id).first()
     if not room:
         raise HTTPException(status_code=404, detail="Room not found")
@@ -105,6 +133,7 @@ async def update_room(
     
     for field, value in room.dict().items():
         setattr(db_room, field, value)
+    bump_version(db, "rooms")
     
     db.commit()
     db.refresh(db_room)
@@ -124,5 +153,6 @@ async def delete_room(
     
     # Soft delete by setting is_active to False
     db_room.is_active = False
+    bump_version(db, "rooms")
     db.commit()
     return None
@@ -1,19 +1,27 @@
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
+from sqlalchemy import func
 from typing import List, Optional
 from datetime import datetime, timedelta
 from app.core.database import get_db
+from app.core.query_audit import query_budget
+from app.core.serialization import FieldSelection, RowProjection, accepts_ndjson
 from app.core.config import settings
+from app.core import search as student_search
 from app.models.models import Student, Attendance, AttendanceStatus, AttendanceType, User, UserRole, UnknownRFID, Ticket, AttendanceSchedule
 from app.schemas.schemas import StudentCreate, Student as StudentSchema, StudentUpdate, StudentWithTickets
-from app.routers.auth import get_current_user, get_password_hash
+from app.routers.auth import get_current_user, get_password_hash, scoped_dormitory_id
 import csv
 from io import StringIO
 from uuid import UUID
 
 router = APIRouter()
 
+student_fields = FieldSelection(StudentSchema, Student, views={
+    "compact": ("name", "surname", "rfid_tag", "room_id", "class_name", "is_active", "photo_url"),
+    "contact": ("name", "surname", "phone", "email", "emergency_contact", "parent_name", "parent_phone", "parent_email"),
+})
+
 def get_or_create_system_user(db: Session) -> User:
     system_user = db.query(User).filter(User.email == "system@dormitory.com").first()
     if not system_user:
@@ -122,28 +130,31 @@ async def delete_student(
 async def search_students(
     query: Optional[str] = None,
     room_id: Optional[str] = None,
+    dormitory_id: Optional[str] = None,
     is_active: Optional[bool] = True,
     skip: int = 0,
     limit: int = 100,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    filters = []
-    if is_active is not None:
-        filters.append(Student.is_active == is_active)
-    if room_id:
-        filters.append(Student.room_id == room_id)
-    if query:
-        filters.append(
-            or_(
-                Student.name.ilike(f"%{query}%"),
-                Student.rfid_tag.ilike(f"%{query}%"),
-                Student.phone.ilike(f"%{query}%")
-            )
-        )
-    
-    students = db.query(Student).filter(*filters).offset(skip).limit(limit).all()
-    return students
+    try:
+        room_uuid = UUID(room_id) if room_id else None
+        dormitory_uuid = UUID(dormitory_id) if dormitory_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid room or dormitory ID format")
+
+    # Non-admin users can only search students from their dormitory
+    dormitory_uuid = scoped_dormitory_id(current_user, dormitory_uuid)
+
+    return student_search.search_students(
+        db,
+        query,
+        dormitory_id=dormitory_uuid,
+        room_id=room_uuid,
+        is_active=is_active,
+        skip=skip,
+        limit=limit
+    )
 
 @router.post("/students/bulk-import/")
 async def bulk_import_students(
@@ -188,9 +199,12 @@ async def bulk_import_students(
     }
 
 @router.get("/students/", response_model=List[StudentSchema])
+@query_budget(3)
 def list_students(
     skip: int = 0, 
     limit: int = 100, 
+    projection: RowProjection = Depends(student_fields),
+    ndjson: bool = Depends(accepts_ndjson),
     db: Session = Depends(get_db), 
     current_user: User = Depends(get_current_user)
 ):
@@ -200,8 +214,10 @@ def list_students(
     if current_user.role != UserRole.ADMIN:
         query = query.filter(Student.dormitory_id == current_user.dormitory_id)
     
-    students = query.offset(skip).limit(limit).all()
-    return students
+    query = projection.apply(query).offset(skip).limit(limit)
+    if ndjson:
+        return projection.stream(query)
+    return projection.response(query.all())
 
 @router.get("/students/{student_id}", response_model=StudentWithTickets)
 def get_student(student_id: str, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
@@ -10,9 +10,20 @@ from ..core.database import get_db
 from ..schemas.schemas import Ticket, TicketCreate, TicketUpdate, Comment, CommentCreate, DetailedTicket
 from ..models.models import Ticket as TicketModel, Comment as CommentModel, User, Student
 from ..core.security import get_current_user, get_current_active_user
+from ..core.ticket_search import search_tickets as run_ticket_search
+from ..core.query_audit import query_budget
+from ..core.serialization import FieldSelection, RowProjection, accepts_ndjson
+from ..schemas.schemas import TicketSearchHit
 
 router = APIRouter()
 
+ticket_fields = FieldSelection(
+    DetailedTicket,
+    TicketModel,
+    views={"compact": ("title", "status", "category", "assigned_student", "created_at", "updated_at")},
+    relationships={"created_by": "creator", "assigned_student_details": "assignee"},
+)
+
 @router.post("/tickets/", response_model=Ticket)
 def create_ticket(ticket: TicketCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
     db_ticket = TicketModel(**ticket.dict(), created_by=current_user.id)
@@ -22,6 +33,7 @@ def create_ticket(ticket: TicketCreate, db: Session = Depends(get_db), current_u
     return db_ticket
 
 @router.get("/tickets/", response_model=List[DetailedTicket])
+@query_budget(3)
 def list_tickets(
     status: Optional[str] = Query(None),
     assigned_student: Optional[UUID] = Query(None),
@@ -30,6 +42,8 @@ def list_tickets(
     end_date: Optional[str] = Query(None),
     skip: int = 0,
     limit: int = 200,
+    projection: RowProjection = Depends(ticket_fields),
+    ndjson: bool = Depends(accepts_ndjson),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -44,22 +58,23 @@ def list_tickets(
     if start_date and end_date:
         query = query.filter(TicketModel.created_at.between(start_date, end_date))
     
-    tickets = query.offset(skip).limit(limit).all()
-    
-    # Enhance tickets with user and student details
-    for ticket in tickets:
-        # Get the creator user
-        creator = db.query(User).filter(User.id == ticket.created_by).first()
-        if creator:
-            ticket.created_by = creator
-
-        # Get the assigned student if exists
-        if ticket.assigned_student:
-            student = db.query(Student).filter(Student.id == ticket.assigned_student).first()
-            if student:
-                ticket.assigned_student_details = student
-    
-    return tickets
+    # Creator and assigned student come from joins, not a lookup per ticket
+    query = projection.apply(query).offset(skip).limit(limit)
+    if ndjson:
+        return projection.stream(query)
+    return projection.response(query.all())
+
+@router.get("/tickets/search/", response_model=List[TicketSearchHit])
+def search_tickets(
+    q: str = Query(..., min_length=1),
+    status: Optional[str] = Query(None),
+    assigned_student: Optional[UUID] = Query(None),
+    skip: int = 0,
+    limit: int = 50,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    return run_ticket_search(db, q, status=status, assigned_student=assigned_student, skip=skip, limit=limit)
 
 @router.get("/tickets/{ticket_id}/", response_model=DetailedTicket)
 def get_ticket(ticket_id: UUID, db: Session = Depends(get_db), current_user: User = Depends(get_current_active_user)):
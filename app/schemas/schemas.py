@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, UUID4
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from datetime import datetime, date
 from enum import Enum
 
 class UserRole(str, Enum):
@@ -268,6 +268,11 @@ class Ticket(TicketBase):
     class Config:
         from_attributes = True
 
+class TicketSearchHit(BaseModel):
+    ticket: Ticket
+    rank: float
+    highlights: List[str] = []  # HTML-escaped matching snippets with matches wrapped in <b></b>
+
 class CommentBase(BaseModel):
     content: str
 
@@ -290,6 +295,7 @@ class StudentWithTickets(BaseModel):
 class DormitoryBase(BaseModel):
     name: str
     address: Optional[str] = None
+    timezone: Optional[str] = "UTC"
     is_active: Optional[bool] = True
 
 class DormitoryCreate(DormitoryBase):
@@ -412,3 +418,136 @@ class SimplifiedAttendance(BaseModel):
 
     class Config:
         from_attributes = True
+
+class StudentAttendanceRate(BaseModel):
+    student_id: UUID4
+    days: int
+    present_days: int
+    late_days: int
+    absent_days: int
+    attendance_rate: float
+
+class ScheduleCompliance(BaseModel):
+    schedule_id: UUID4
+    schedule_name: Optional[str] = None
+    student_days: int
+    present: int
+    late: int
+    absent: int
+    compliance_rate: float
+
+class DailyAttendanceCount(BaseModel):
+    day: date
+    present: int
+    late: int
+    absent: int
+
+class RollupRefreshResult(BaseModel):
+    keys_rebuilt: int
+
+class ScheduleWindowResult(BaseModel):
+    schedule_id: UUID4
+    day: date
+    absent_marked: int
+    late_marked: int
+
+class ScheduleStatus(BaseModel):
+    id: UUID4
+    name: str
+    start_time: str
+    end_time: str
+    state: str  # "upcoming", "in_progress" or "finished"
+    last_attendance_taken: Optional[datetime] = None
+
+class UnknownRFIDSighting(BaseModel):
+    rfid_tag: str
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+
+class DashboardStudent(BaseModel):
+    id: UUID4
+    name: str
+    surname: Optional[str] = None
+    school: Optional[str] = None
+    is_active: Optional[bool] = True
+
+class DashboardTicket(BaseModel):
+    id: UUID4
+    title: str
+    description: str
+    status: Optional[TicketStatus] = None
+    created_at: Optional[datetime] = None
+
+class DashboardSummary(BaseModel):
+    active_students: int
+    present_now: int
+    open_tickets: int
+    in_progress_tickets: int
+    schedules_today: List[ScheduleStatus]
+    latest_unknown_rfid: Optional[UnknownRFIDSighting] = None
+    recent_students: List[DashboardStudent]
+    recent_tickets: List[DashboardTicket]
+
+class RosterEntry(BaseModel):
+    student_id: UUID4
+    name: str
+    surname: Optional[str] = None
+    rfid_tag: str
+    photo_url: Optional[str] = None
+    room_id: Optional[UUID4] = None
+    room_number: Optional[str] = None
+    status: Optional[AttendanceStatus] = None  # None when the student has no record yet
+    timestamp: Optional[datetime] = None
+
+class JobInfo(BaseModel):
+    name: str
+    interval_seconds: float
+    timeout_seconds: float
+    running: bool
+    next_run_in_seconds: float
+    runs: int
+    failures: int
+    timeouts: int
+    last_status: Optional[str] = None
+    last_started_at: Optional[datetime] = None
+    latency_ms_p50: Optional[float] = None
+    latency_ms_p95: Optional[float] = None
+    latency_ms_max: Optional[float] = None
+
+class JobRun(BaseModel):
+    id: UUID4
+    job_name: str
+    trigger: str
+    worker: str
+    status: str
+    started_at: datetime
+    finished_at: datetime
+    duration_ms: int
+    result: Optional[str] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+class JobTriggerResult(BaseModel):
+    name: str
+    status: str
+
+class SlowQuery(BaseModel):
+    at: datetime
+    duration_ms: float
+    route: Optional[str] = None
+    statement: str
+    parameters: Optional[Any] = None
+    plan: Optional[str] = None
+
+class SlowQueryDump(BaseModel):
+    path: str
+    entries: int
+
+class RequestProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    duration_ms: float
+    captured_at: float
@@ -0,0 +1,19 @@
+"""Benchmarks for the API hot paths; run each with ``python -m benchmarks.<name>``.
+
+Scripts that seed a dataset drop tables first. By default they use their own
+scratch SQLite file, never ``DATABASE_URL``. Seeding any other database needs
+``--drop``.
+"""
+import argparse
+
+
+def add_database_arguments(parser: argparse.ArgumentParser, scratch_url: str) -> None:
+    parser.add_argument("--database-url", default=scratch_url, help=f"database to seed and query (default: {scratch_url})")
+    parser.add_argument("--drop", action="store_true",
+                        help="allow seeding a --database-url other than the default; its tables are dropped")
+
+
+def check_can_seed(parser: argparse.ArgumentParser, args: argparse.Namespace, scratch_url: str) -> None:
+    """Exit with a usage error before seeding would drop tables the user did not opt into."""
+    if args.database_url != scratch_url and not args.drop:
+        parser.error(f"seeding drops tables in {args.database_url}; pass --drop to confirm")
@@ -0,0 +1,77 @@
+"""Compare the old ``func.date(timestamp) = ...`` filter with the half-open
+timestamp range used by ``list_attendance``.
+
+Generates a dataset with generate_data.py (one dormitory and a year of
+attendance, about 160,000 rows, by default), then prints the query plan and
+timing of both predicates for a day in the middle of it.
+
+    python -m benchmarks.attendance_date_filter --scale 0.25 --days 365
+    python -m benchmarks.attendance_date_filter --database-url postgresql://... --drop
+"""
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta
+
+SCRATCH_DATABASE_URL = "sqlite:///./bench_attendance.db"
+
+os.environ.setdefault("DATABASE_URL", SCRATCH_DATABASE_URL)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+
+from sqlalchemy import create_engine, func, select, text  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.timezones import local_day_range  # noqa: E402
+from app.models.models import Attendance  # noqa: E402
+from benchmarks import add_database_arguments, check_can_seed  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+END_DATE = date(2026, 8, 31)
+
+
+def explain(session: Session, stmt) -> str:
+    compiled = stmt.compile(session.get_bind(), compile_kwargs={"literal_binds": True})
+    if session.get_bind().dialect.name == "postgresql":
+        rows = session.execute(text(f"EXPLAIN {compiled}")).all()
+        return "\n".join(row[0] for row in rows)
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+def timed(session: Session, stmt, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        session.execute(stmt).all()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, SCRATCH_DATABASE_URL)
+    parser.add_argument("--scale", type=float, default=0.25, help="see generate_data.py; 0.25 is one dormitory")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--timezone", default="Europe/Brussels")
+    args = parser.parse_args()
+    check_can_seed(parser, args, SCRATCH_DATABASE_URL)
+
+    generate(args.database_url, scale=args.scale, days=args.days, end_date=END_DATE, drop=True, rollups=False)
+    engine = create_engine(args.database_url)
+
+    day = END_DATE - timedelta(days=args.days // 2)
+    start, end = local_day_range(args.timezone, day, dialect_name=engine.dialect.name)
+    old = select(Attendance.id).where(func.date(Attendance.timestamp) == func.date(datetime.combine(day, datetime.min.time())))
+    new = select(Attendance.id).where(Attendance.timestamp >= start, Attendance.timestamp < end)
+
+    with Session(engine) as session:
+        for label, stmt in (("func.date(timestamp) = :day", old), ("timestamp >= :start AND timestamp < :end", new)):
+            print(f"== {label}")
+            print(explain(session, stmt))
+            print(f"rows={len(session.execute(stmt).all())} avg={timed(session, stmt, args.repeat):.2f} ms\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Fan-out benchmark for the in-process event broker.
+
+Starts N subscribers (500 by default) as asyncio tasks, publishes a burst of
+scan events and reports publish cost and end-to-end delivery latency. A few
+subscribers are deliberately stalled to show they are dropped once their
+bounded queues fill, without slowing the others down.
+
+    python -m benchmarks.event_fanout --subscribers 500 --events 2000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_events.db")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+
+from app.core.events import DROPPED, EventBroker  # noqa: E402
+
+
+async def consume(subscription, expected: int, latencies: list) -> int:
+    received = 0
+    while received < expected:
+        event = await subscription.get()
+        if event is DROPPED:
+            break
+        latencies.append(time.time() - event["published_at"])
+        received += 1
+    return received
+
+
+async def run(args) -> None:
+    broker = EventBroker(queue_size=args.queue_size)
+    dormitory = uuid.uuid4()
+    latencies: list = []
+    subscriptions = [broker.subscribe(dormitory) for _ in range(args.subscribers)]
+    stalled = subscriptions[:args.stalled]
+    consumers = [
+        asyncio.create_task(consume(subscription, args.events, latencies))
+        for subscription in subscriptions[args.stalled:]
+    ]
+
+    publish_times = []
+    started = time.perf_counter()
+    for i in range(args.events):
+        t0 = time.perf_counter()
+        broker.publish("rfid.scan", dormitory, rfid_tag=f"TAG-{i}", student_id=uuid.uuid4())
+        publish_times.append(time.perf_counter() - t0)
+        if i % args.burst == 0:
+            # Let consumers run between bursts, as request handling would
+            await asyncio.sleep(0)
+    received = await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - started
+
+    deliveries = sum(received)
+    latencies.sort()
+    print(f"subscribers={args.subscribers} events={args.events} deliveries={deliveries:,}")
+    print(f"total {elapsed * 1000:.1f} ms, {deliveries / elapsed:,.0f} deliveries/s")
+    print(f"publish mean={statistics.mean(publish_times) * 1e6:.1f} us "
+          f"max={max(publish_times) * 1e6:.1f} us")
+    print(f"delivery latency p50={latencies[len(latencies) // 2] * 1000:.2f} ms "
+          f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+    print(f"stalled subscribers dropped: {sum(s.dropped for s in stalled)}/{len(stalled)} "
+          f"(broker.dropped_subscribers={broker.dropped_subscribers})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=500)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--stalled", type=int, default=5)
+    parser.add_argument("--queue-size", type=int, default=256)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Compare the ORM + response_model path with RowProjection for list endpoints.
+
+Generates a dataset with generate_data.py, then renders the same page of
+``list_students`` and ``list_attendance`` both ways. The page is rendered
+from a fresh session each time, so lazy loads are counted as they are in a
+request. The script prints time per row, SQL statements per page, and checks
+that both paths produce the same JSON.
+
+    python -m benchmarks.list_serialization --rows 1000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date
+from typing import List
+
+SCRATCH_DATABASE_URL = "sqlite:///./bench_serialization.db"
+
+os.environ.setdefault("DATABASE_URL", SCRATCH_DATABASE_URL)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.query_audit import audit_queries  # noqa: E402
+from app.core.query_stats import track_queries  # noqa: E402
+from app.models.models import Attendance, Student  # noqa: E402
+from app.routers.attendance import attendance_fields  # noqa: E402
+from app.routers.students import student_fields  # noqa: E402
+from app.schemas.schemas import Attendance as AttendanceSchema, Student as StudentSchema  # noqa: E402
+from benchmarks import add_database_arguments, check_can_seed  # noqa: E402
+from generate_data import generate  # noqa: E402
+
+
+def render_orm(session: Session, entity, schema, rows: int) -> bytes:
+    """What FastAPI does with ORM objects and response_model=List[schema]."""
+    adapter = TypeAdapter(List[schema])
+    items = adapter.validate_python(session.query(entity).limit(rows).all(), from_attributes=True)
+    return json.dumps(
+        adapter.dump_python(items, mode="json"), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def render_projection(session: Session, entity, projection, rows: int) -> bytes:
+    return projection.render(projection.apply(session.query(entity)).limit(rows).all())
+
+
+def measure(engine, render, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as session, audit_queries() as stats:
+            started = time.perf_counter()
+            body = render(session)
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], stats.count, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, SCRATCH_DATABASE_URL)
+    parser.add_argument("--rows", type=int, default=1000, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--skip-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not args.skip_seed:
+        check_can_seed(parser, args, SCRATCH_DATABASE_URL)
+        # 1,000 students and a few days of attendance
+        generate(args.database_url, scale=1, days=3, end_date=date(2026, 3, 1), workers=1, drop=True, rollups=False)
+    engine = create_engine(args.database_url)
+    track_queries(engine)
+
+    cases = [
+        ("list_students", Student, StudentSchema, student_fields.full),
+        ("list_attendance", Attendance, AttendanceSchema, attendance_fields.full),
+    ]
+    for name, entity, schema, projection in cases:
+        orm_ms, orm_queries, orm_body = measure(
+            engine, lambda session: render_orm(session, entity, schema, args.rows), args.repeat
+        )
+        fast_ms, fast_queries, fast_body = measure(
+            engine, lambda session: render_projection(session, entity, projection, args.rows), args.repeat
+        )
+        rows = len(json.loads(fast_body))
+        assert json.loads(orm_body) == json.loads(fast_body), f"{name}: the two paths disagree"
+        print(f"{name} ({rows} rows, {len(fast_body) / 1024:.0f} KiB)")
+        print(f"  orm + response_model  {orm_ms:8.1f} ms  {orm_ms * 1000 / rows:7.1f} us/row  {orm_queries} queries")
+        print(f"  row projection        {fast_ms:8.1f} ms  {fast_ms * 1000 / rows:7.1f} us/row  {fast_queries} queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""HTTP load test for the API hot paths.
+
+Seeds a dataset with generate_data.py, boots the app under uvicorn against it and drives a set of
+scenarios with an async HTTP client. Each scenario runs for a fixed time at a
+fixed concurrency. The report is printed (and optionally written) as JSON so
+runs can be diffed between commits:
+
+* ``scan_storm``      curfew check-in rush on ``POST /api/rfid-scan`` from every door device
+* ``bulk_roll_call``  staff submitting a room-sized roll call to ``POST /api/attendance/bulk``
+* ``dashboard``       dashboard summary, student list and student search
+* ``tickets``         ticket list, full-text search and ticket detail
+
+Queries per request come from the ``X-DB-Queries`` header. The server runs
+with ``QUERY_AUDIT_SAMPLE_RATE=1`` so every response carries it.
+
+    python -m benchmarks.load_test --students 10000 --days 730 --duration 20 --concurrency 32
+    python -m benchmarks.load_test --database-url postgresql://localhost/dorm_bench --drop --workers 4
+    python -m benchmarks.load_test --skip-seed --scenarios scan_storm,tickets --output run.json
+
+Needs ``httpx`` and ``uvicorn``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+SCRATCH_DATABASE_URL = "sqlite:///./bench_load.db"
+
+os.environ.setdefault("DATABASE_URL", SCRATCH_DATABASE_URL)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, select, text  # noqa: E402
+
+from app.core.absences import WEEKDAYS  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.models.models import (  # noqa: E402
+    AttendanceSchedule, Dormitory, Student, Ticket, User, UserRole, attendance_schedule_devices
+)
+from benchmarks import add_database_arguments, check_can_seed  # noqa: E402
+from generate_data import DORMITORIES_PER_SCALE, FIRST_NAMES, TICKET_SUBJECTS, generate  # noqa: E402
+
+# Words that occur in generated ticket titles
+TICKET_WORDS = sorted({word.lower() for _, title, _ in TICKET_SUBJECTS for word in title.split() if len(word) > 3})
+TOKEN_LIFETIME = timedelta(hours=12)
+
+
+def seed(database_url: str, dormitories: int, students: int, days: int, seed_value: int) -> None:
+    """Regenerate the dataset with generate_data.py, then open the doors all day.
+
+    Generated schedules only accept scans inside their windows, so every
+    dormitory also gets an always-open schedule on its door devices.
+    """
+    generate(database_url, scale=dormitories / DORMITORIES_PER_SCALE, days=days, seed=seed_value, drop=True,
+             students_per_dormitory=max(1, students // dormitories))
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        users = conn.execute(select(User.id, User.role, User.dormitory_id)).all()
+        for dormitory_id, in conn.execute(select(Dormitory.id)).all():
+            schedule_id = uuid.uuid4()
+            admin_id = next(
+                user_id for user_id, role, dormitory in users if dormitory == dormitory_id and role == UserRole.ADMIN
+            )
+            conn.execute(AttendanceSchedule.__table__.insert(), [{
+                "id": schedule_id, "name": "Load test", "dormitory_id": dormitory_id, "created_by_id": admin_id,
+                "start_time": "00:00", "end_time": "23:59", "start_date": datetime(date.today().year - 5, 1, 1),
+                "is_active": True, **dict.fromkeys(WEEKDAYS, True),
+            }])
+            conn.execute(attendance_schedule_devices.insert(), [
+                {"schedule_id": schedule_id, "device_id": user_id}
+                for user_id, role, dormitory in users if dormitory == dormitory_id and role == UserRole.IO_DEVICE
+            ])
+    engine.dispose()
+
+
+def load_dataset(engine) -> dict:
+    """What the scenarios need to build requests, read back from the database."""
+    with engine.connect() as conn:
+        dormitories = {}
+        for dormitory_id, in conn.execute(select(Dormitory.id)):
+            dormitories[dormitory_id] = {
+                "tags": conn.execute(select(Student.rfid_tag).where(Student.dormitory_id == dormitory_id)).scalars().all(),
+                "students": conn.execute(select(Student.id).where(Student.dormitory_id == dormitory_id)).scalars().all(),
+                "schedule": conn.execute(
+                    select(AttendanceSchedule.id).where(AttendanceSchedule.dormitory_id == dormitory_id)
+                ).scalars().first(),
+            }
+        users = conn.execute(select(User.email, User.role, User.dormitory_id)).all()
+        counts = {
+            name: conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+            for name in ("students", "attendances", "tickets", "comments")
+        }
+        tickets = conn.execute(select(Ticket.id).limit(5000)).scalars().all()
+
+    def token(email):
+        return create_access_token({"sub": email}, expires_delta=TOKEN_LIFETIME)
+
+    for email, role, dormitory_id in users:
+        entry = dormitories[dormitory_id]
+        key = {UserRole.ADMIN: "admin", UserRole.STAFF: "staff", UserRole.IO_DEVICE: "device"}.get(role)
+        if key:
+            entry.setdefault(key, {"Authorization": f"Bearer {token(email)}"})
+    return {"dormitories": list(dormitories.values()), "tickets": tickets, "counts": counts}
+
+
+def scan_storm(dataset, rng):
+    dormitory = rng.choice(dataset["dormitories"])
+    return "POST", "/api/rfid-scan", {"params": {"rfid_tag": rng.choice(dormitory["tags"])}, "headers": dormitory["device"]}
+
+
+def bulk_roll_call(dataset, rng):
+    dormitory = rng.choice(dataset["dormitories"])
+    students = rng.sample(dormitory["students"], min(30, len(dormitory["students"])))
+    body = [{"student_id": str(student_id), "schedule_id": str(dormitory["schedule"]),
+             "status": rng.choice(["present", "present", "present", "late", "absent"])} for student_id in students]
+    return "POST", "/api/attendance/bulk", {"json": body, "headers": dormitory["staff"]}
+
+
+def dashboard(dataset, rng):
+    dormitory = rng.choice(dataset["dormitories"])
+    choice = rng.random()
+    if choice < 0.4:
+        return "GET", "/api/dashboard/summary", {"headers": dormitory["staff"]}
+    if choice < 0.7:
+        return "GET", "/api/students/", {"params": {"skip": rng.randrange(0, 500), "limit": 50}, "headers": dormitory["staff"]}
+    query = rng.choice(FIRST_NAMES)[:rng.randint(3, 5)]
+    return "GET", "/api/students/search/", {"params": {"query": query, "limit": 20}, "headers": dormitory["staff"]}
+
+
+def tickets(dataset, rng):
+    headers = rng.choice(dataset["dormitories"])["staff"]
+    choice = rng.random()
+    if choice < 0.4:
+        return "GET", "/api/v1/tickets/", {"params": {"skip": rng.randrange(0, 200), "limit": 50}, "headers": headers}
+    if choice < 0.7:
+        return "GET", "/api/v1/tickets/search/", {"params": {"q": " ".join(rng.sample(TICKET_WORDS, 2))}, "headers": headers}
+    return "GET", f"/api/v1/tickets/{rng.choice(dataset['tickets'])}/", {"headers": headers}
+
+
+SCENARIOS = {
+    "scan_storm": scan_storm,
+    "bulk_roll_call": bulk_roll_call,
+    "dashboard": dashboard,
+    "tickets": tickets,
+}
+
+
+def percentile(values: list, fraction: float) -> float:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(len(values) * fraction))], 2)
+
+
+async def run_scenario(base_url: str, name: str, dataset: dict, concurrency: int, duration: float, seed_value: int) -> dict:
+    make_request = SCENARIOS[name]
+    latencies, queries, statuses = [], [], Counter()
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        nonlocal errors
+        rng = random.Random(seed_value * 1000 + index)
+        while time.perf_counter() < deadline:
+            method, url, kwargs = make_request(dataset, rng)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] += 1
+            if "x-db-queries" in response.headers:
+                queries.append(int(response.headers["x-db-queries"]))
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors + sum(count for status, count in statuses.items() if status >= 500),
+        "status_counts": {str(status): count for status, count in sorted(statuses.items())},
+        "duration_s": round(elapsed, 2),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "JOB_SCHEDULER_ENABLED": "false",
+        "ACCESS_LOG_SAMPLE_RATE": "0",
+        "ACCESS_LOG_SLOW_REQUEST_MS": "1000000",
+        "QUERY_AUDIT_SAMPLE_RATE": "1",
+        "SLOW_QUERY_THRESHOLD_MS": "1000000",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        env=env,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError("The API server did not come up within 60 seconds")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, SCRATCH_DATABASE_URL)
+    parser.add_argument("--dormitories", type=int, default=2)
+    parser.add_argument("--students", type=int, default=10000, help="spread evenly over the dormitories")
+    parser.add_argument("--days", type=int, default=30, help="days of attendance history (730 for two years)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data already in the database")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15, help="seconds per scenario")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="also write the JSON report here")
+    args = parser.parse_args()
+    if not args.skip_seed:
+        check_can_seed(parser, args, SCRATCH_DATABASE_URL)
+
+    if not args.skip_seed:
+        started = time.perf_counter()
+        seed(args.database_url, args.dormitories, args.students, args.days, args.seed)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    engine = create_engine(args.database_url)
+    dataset = load_dataset(engine)
+    engine.dispose()
+
+    port = free_port()
+    server = start_server(args.database_url, port, args.workers)
+    try:
+        results = {}
+        for name in args.scenarios.split(","):
+            print(f"Running {name} for {args.duration:g}s at concurrency {args.concurrency}", file=sys.stderr)
+            results[name] = asyncio.run(run_scenario(
+                f"http://127.0.0.1:{port}", name, dataset, args.concurrency, args.duration, args.seed
+            ))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "commit": git_commit(),
+        "run_at": datetime.now().isoformat(timespec="seconds"),
+        "database": engine.dialect.name,
+        "dataset": dataset["counts"],
+        "workers": args.workers,
+        "concurrency": args.concurrency,
+        "scenarios": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time the single-query roll-call roster for one schedule.
+
+Generates one dormitory of N students (1,000 by default) with generate_data.py,
+with a month of scans, and times the roster of its evening check-in for the
+last day. The target is well under 50 ms for 1,000 students.
+
+    python -m benchmarks.roster_query --students 1000
+"""
+import argparse
+import os
+import time
+from datetime import date
+
+SCRATCH_DATABASE_URL = "sqlite:///./bench_roster.db"
+
+os.environ.setdefault("DATABASE_URL", SCRATCH_DATABASE_URL)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.timezones import local_day_range  # noqa: E402
+from app.models.models import Attendance, AttendanceSchedule, Dormitory  # noqa: E402
+from app.routers.attendance_schedules import build_roster_query  # noqa: E402
+from benchmarks import add_database_arguments, check_can_seed  # noqa: E402
+from generate_data import DORMITORIES_PER_SCALE, SCHEDULES, generate  # noqa: E402
+
+END_DATE = date(2026, 3, 30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_database_arguments(parser, SCRATCH_DATABASE_URL)
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    check_can_seed(parser, args, SCRATCH_DATABASE_URL)
+
+    # A single dormitory holding all the students
+    generate(args.database_url, scale=1 / DORMITORIES_PER_SCALE, days=args.days, end_date=END_DATE, drop=True,
+             rollups=False, students_per_dormitory=args.students)
+    engine = create_engine(args.database_url)
+    with Session(engine) as session:
+        schedule_id, dormitory_id, tz_name = session.execute(
+            select(AttendanceSchedule.id, Dormitory.id, Dormitory.timezone)
+            .join(Dormitory, AttendanceSchedule.dormitory_id == Dormitory.id)
+            .where(AttendanceSchedule.name == SCHEDULES[0][0])
+        ).one()
+        rows = session.execute(select(func.count()).select_from(Attendance)).scalar()
+    start, end = local_day_range(tz_name, END_DATE, dialect_name=engine.dialect.name)
+    stmt = build_roster_query(schedule_id, dormitory_id, start, end)
+
+    with Session(engine) as session:
+        roster = session.execute(stmt).all()
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            session.execute(stmt).all()
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"students={args.students} attendance_rows={rows:,} roster_rows={len(roster)}")
+    print(f"roster query p50={timings[len(timings) // 2]:.1f} ms p95={timings[int(len(timings) * 0.95)]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,27 +3,17 @@
 import { useState, useEffect } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
-import { apiClient, Student, Ticket, AttendanceSchedule } from '@/lib/api'
+import { apiClient, DashboardSummary } from '@/lib/api'
 import { Users, Ticket as TicketIcon, Calendar, UserCheck } from 'lucide-react'
 
 export default function DashboardPage() {
-  const [students, setStudents] = useState<Student[]>([])
-  const [tickets, setTickets] = useState<Ticket[]>([])
-  const [schedules, setSchedules] = useState<AttendanceSchedule[]>([])
+  const [summary, setSummary] = useState<DashboardSummary | null>(null)
   const [loading, setLoading] = useState(true)
 
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [studentsData, ticketsData, schedulesData] = await Promise.all([
-          apiClient.getStudents(),
-          apiClient.getTickets(),
-          apiClient.getAttendanceSchedules(),
-        ])
-        
-        setStudents(studentsData)
-        setTickets(ticketsData)
-        setSchedules(schedulesData)
+        setSummary(await apiClient.getDashboardSummary())
       } catch (error) {
         console.error('Failed to fetch dashboard data:', error)
       } finally {
@@ -34,9 +24,11 @@ export default function DashboardPage() {
     fetchData()
   }, [])
 
-  const activeStudents = students.filter(s => s.is_active).length
-  const openTickets = tickets.filter(t => t.status === 'open').length
-  const activeSchedules = schedules.filter(s => s.is_active).length
+  const activeStudents = summary?.active_students ?? 0
+  const openTickets = summary?.open_tickets ?? 0
+  const activeSchedules = summary?.schedules_today.filter(s => s.state === 'in_progress').length ?? 0
+  const students = summary?.recent_students ?? []
+  const tickets = summary?.recent_tickets ?? []
 
   if (loading) {
     return (
@@ -52,6 +52,12 @@ export interface Ticket {
   category?: string
 }
 
+export interface TicketSearchHit {
+  ticket: Ticket
+  rank: number
+  highlights: string[]
+}
+
 export interface AttendanceSchedule {
   id: string
   name: string
@@ -73,6 +79,40 @@ export interface AttendanceSchedule {
   last_attendance_taken?: string
 }
 
+export interface DashboardSummary {
+  active_students: number
+  present_now: number
+  open_tickets: number
+  in_progress_tickets: number
+  schedules_today: {
+    id: string
+    name: string
+    start_time: string
+    end_time: string
+    state: 'upcoming' | 'in_progress' | 'finished'
+    last_attendance_taken?: string
+  }[]
+  latest_unknown_rfid?: {
+    rfid_tag: string
+    first_seen?: string
+    last_seen?: string
+  }
+  recent_students: Pick<Student, 'id' | 'name' | 'surname' | 'school' | 'is_active'>[]
+  recent_tickets: Pick<Ticket, 'id' | 'title' | 'description' | 'status' | 'created_at'>[]
+}
+
+export interface RosterEntry {
+  student_id: string
+  name: string
+  surname?: string
+  rfid_tag: string
+  photo_url?: string
+  room_id?: string
+  room_number?: string
+  status?: 'present' | 'absent' | 'late'
+  timestamp?: string
+}
+
 class ApiClient {
   private baseURL: string
   private token: string | null = null
@@ -153,6 +193,11 @@ class ApiClient {
     this.clearToken()
   }
 
+  // Dashboard endpoints
+  async getDashboardSummary(): Promise<DashboardSummary> {
+    return this.request<DashboardSummary>('/api/dashboard/summary')
+  }
+
   // Students endpoints
   async getStudents(): Promise<Student[]> {
     return this.request<Student[]>('/api/students/')
@@ -181,6 +226,16 @@ class ApiClient {
     return this.request<Ticket[]>('/api/v1/tickets/')
   }
 
+  async searchTickets(
+    q: string,
+    filters: { status?: Ticket['status']; assigned_student?: string } = {}
+  ): Promise<TicketSearchHit[]> {
+    const params = new URLSearchParams({ q })
+    if (filters.status) params.set('status', filters.status)
+    if (filters.assigned_student) params.set('assigned_student', filters.assigned_student)
+    return this.request<TicketSearchHit[]>(`/api/v1/tickets/search/?${params}`)
+  }
+
   async createTicket(ticket: Partial<Ticket>): Promise<Ticket> {
     return this.request<Ticket>('/api/v1/tickets/', {
       method: 'POST',
@@ -200,6 +255,11 @@ class ApiClient {
     return this.request<AttendanceSchedule[]>('/api/attendance-schedules/')
   }
 
+  async getScheduleRoster(scheduleId: string, day?: string): Promise<RosterEntry[]> {
+    const query = day ? `?day=${day}` : ''
+    return this.request<RosterEntry[]>(`/api/attendance-schedules/${scheduleId}/roster${query}`)
+  }
+
   async createAttendanceSchedule(schedule: Partial<AttendanceSchedule>): Promise<AttendanceSchedule> {
     return this.request<AttendanceSchedule>('/api/attendance-schedules/', {
       method: 'POST',
@@ -0,0 +1,403 @@
+"""Generate a synthetic, performance-sized dataset.
+
+Each unit of ``--scale`` adds four dormitories of 250 students (change that
+with ``--students-per-dormitory``). Every dormitory gets an admin, three staff
+members, two door devices, an evening check-in (21:00-22:30, every day) and a
+morning roll call (07:00-08:30, weekdays), tickets with comments, and
+``--days`` of attendance history ending on ``--end-date``.
+
+Scans follow the shape of a real window. Most students arrive soon after it
+opens, each with their own punctuality and absence rate. A tail arrives after
+the ``LATE_GRACE_MINUTES`` grace period and is recorded as LATE. An occasional
+double tap is recorded as a check-out. No-shows get the ABSENT row that
+closing the window would have written. Every window is recorded in
+``schedule_window_runs``, so the absence job does not revisit it.
+
+The same ``--seed``, ``--end-date`` and starting database always produce the
+same rows, ids included. Attendance is generated in a process pool, one task
+per dormitory and month. On Postgres each worker loads its rows with COPY.
+Elsewhere the rows go back to this process, which inserts them in batches
+(SQLite allows a single writer). Existing data is kept: new dormitories are
+numbered after the ones already there. Pass ``--drop`` to start from an empty
+schema.
+
+    python generate_data.py --scale 0.25 --days 30
+    python generate_data.py --scale 16 --days 365 --workers 8   # ~10M attendance rows
+    python generate_data.py --database-url postgresql://localhost/dorm_perf --drop --scale 4
+
+All generated accounts use the password ``password``.
+"""
+import argparse
+import csv
+import io
+import multiprocessing
+import os
+import random
+import time as timer
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from app.core.absences import ABSENT_NOTE, WEEKDAYS, is_window_day, schedule_window
+from app.core.config import settings
+from app.core.database import Base
+from app.core.rollups import refresh_attendance_rollups
+from app.core.schema import upgrade_schema
+from app.core.security import get_password_hash
+from app.core.timezones import get_zone, to_db_datetime
+from app.models.models import (
+    Attendance, AttendanceSchedule, AttendanceStatus, Comment, Dormitory, RFIDLog, Room, ScheduleWindowRun,
+    Student, Ticket, TicketStatus, User, UserRole, attendance_schedule_devices
+)
+
+DORMITORIES_PER_SCALE = 4
+STUDENTS_PER_DORMITORY = 250
+ROOM_CAPACITY = 2
+TICKETS_PER_STUDENT_YEAR = 0.5
+DAYS_PER_TASK = 30
+BATCH_SIZE = 10000
+
+TIMEZONES = ["Europe/Brussels", "Europe/Brussels", "Europe/Brussels", "Europe/Amsterdam", "Europe/London"]
+CITIES = [("Turnhout", "2300"), ("Geel", "2440"), ("Mol", "2400"), ("Herentals", "2200"), ("Hasselt", "3500")]
+FIRST_NAMES = ["Emma", "Lucas", "Olivia", "Noah", "Mila", "Liam", "Louise", "Arthur", "Elena", "Jules", "Nora",
+               "Finn", "Lena", "Victor", "Julie", "Adam", "Marie", "Louis", "Sara", "Milan", "Anna", "Mats",
+               "Fien", "Lars", "Ella", "Warre", "Lotte", "Seppe", "Hanne", "Jasper"]
+SURNAMES = ["Peeters", "Janssens", "Maes", "Jacobs", "Mertens", "Willems", "Claes", "Goossens", "Wouters",
+            "De Smet", "Dubois", "Lambert", "Dupont", "Hermans", "Aerts", "Michiels", "Pauwels", "Smets",
+            "Van den Broeck", "Verstraeten", "Vermeulen", "De Clercq", "Cools", "Segers", "Leysen"]
+SCHOOLS = ["Sint-Victor College", "Sint-Jan College", "Sint-Jozef College", "Koninklijk Atheneum"]
+TICKET_SUBJECTS = [
+    ("maintenance", "Leaking tap", "The tap in the bathroom keeps dripping."),
+    ("maintenance", "Broken radiator", "The radiator stays cold even on the highest setting."),
+    ("maintenance", "Window does not close", "The window handle is loose and the window will not lock."),
+    ("it", "No wifi", "The wifi drops out every evening during study hours."),
+    ("it", "RFID card not working", "The door reader does not recognise the card."),
+    ("cleaning", "Mould in shower", "There are black spots on the shower ceiling."),
+    ("security", "Lost key", "The room key was lost on the way back from school."),
+    ("other", "Noise complaint", "Loud music from the room next door after curfew."),
+]
+COMMENTS = ["Technician is scheduled for tomorrow.", "Parts have been ordered.", "Checked, works again.",
+            "Could you send a photo?", "Still happening tonight.", "Replaced, please confirm."]
+
+# (name, start, end, weekday flags)
+SCHEDULES = [
+    ("Evening check-in", "21:00", "22:30", (True,) * 7),
+    ("Morning roll call", "07:00", "08:30", (True,) * 5 + (False,) * 2),
+]
+
+ATTENDANCE_COLUMNS = ("id", "student_id", "schedule_id", "timestamp", "status", "recorded_by_id", "notes")
+RFID_LOG_COLUMNS = ("id", "student_id", "device_id", "timestamp", "attendance_schedule_id")
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def build_dormitory(index: int, seed: int, start_day: date, password_hash: str,
+                    students_per_dormitory: int = STUDENTS_PER_DORMITORY) -> dict:
+    """All rows of one dormitory apart from attendance, derived from ``seed`` and ``index`` alone."""
+    rng = random.Random(f"{seed}:dormitory:{index}")
+    number = index + 1
+    city, postal_code = rng.choice(CITIES)
+    dormitory = {"id": _uuid(rng), "name": f"Generated Dormitory {number}", "address": f"Kerkstraat {number}, {postal_code} {city}",
+                 "timezone": rng.choice(TIMEZONES), "is_active": True}
+
+    def user(role: UserRole, name: str, email: str) -> dict:
+        return {"id": _uuid(rng), "name": name, "email": email, "hashed_password": password_hash, "role": role,
+                "is_active": True, "dormitory_id": dormitory["id"]}
+
+    admin = user(UserRole.ADMIN, f"Admin {number}", f"admin.g{number}@example.com")
+    staff = [user(UserRole.STAFF, f"Staff {number}-{j + 1}", f"staff.g{number}.{j + 1}@example.com") for j in range(3)]
+    devices = [user(UserRole.IO_DEVICE, f"Door {number}-{j + 1}", f"door.g{number}.{j + 1}@example.com") for j in range(2)]
+
+    schedules = []
+    for name, start_time, end_time, flags in SCHEDULES:
+        schedules.append({
+            "id": _uuid(rng), "name": name, "dormitory_id": dormitory["id"], "created_by_id": admin["id"],
+            "start_time": start_time, "end_time": end_time, "start_date": datetime.combine(start_day, time.min, tzinfo=timezone.utc),
+            "is_active": True, **dict(zip(WEEKDAYS, flags)),
+        })
+
+    rooms = []
+    for r in range(-(-students_per_dormitory // ROOM_CAPACITY)):
+        floor = r // 25 + 1
+        rooms.append({"id": _uuid(rng), "number": f"G{number}-{floor}{r % 25 + 1:02d}", "floor": floor,
+                      "capacity": ROOM_CAPACITY, "is_active": True, "dormitory_id": dormitory["id"]})
+
+    students = []
+    for s in range(students_per_dormitory):
+        name, surname = rng.choice(FIRST_NAMES), rng.choice(SURNAMES)
+        slug = f"{name}.{surname}".lower().replace(" ", "")
+        students.append({
+            "id": _uuid(rng), "name": name, "surname": surname, "rfid_tag": f"GEN{number:04d}{s:05d}",
+            "date_of_birth": datetime(2006, 1, 1) + timedelta(days=rng.randrange(5 * 365)),
+            "phone": f"+32 4{rng.randrange(70, 100)} {rng.randrange(10, 100)} {rng.randrange(10, 100)} {rng.randrange(10, 100)}",
+            "email": f"{slug}.{number}.{s}@example.com", "school": rng.choice(SCHOOLS),
+            "class_name": f"{rng.randint(1, 6)}{rng.choice('ABCD')}", "address": f"Dorpsstraat {rng.randint(1, 200)}",
+            "city": city, "postal_code": postal_code, "parent_name": f"{rng.choice(FIRST_NAMES)} {surname}",
+            "parent_email": f"parent.{slug}.{number}.{s}@example.com", "room_id": rooms[s // ROOM_CAPACITY]["id"],
+            "dormitory_id": dormitory["id"], "is_active": True,
+        })
+
+    return {"dormitory": dormitory, "users": [admin, *staff, *devices], "admin": admin, "staff": staff,
+            "devices": devices, "schedules": schedules, "rooms": rooms, "students": students}
+
+
+def build_tickets(index: int, seed: int, built: dict, start_day: date, days: int) -> Tuple[List[dict], List[dict]]:
+    rng = random.Random(f"{seed}:tickets:{index}")
+    tickets, comments = [], []
+    rooms = {room["id"]: room["number"] for room in built["rooms"]}
+    count = round(len(built["students"]) * TICKETS_PER_STUDENT_YEAR * days / 365)
+    for _ in range(count):
+        category, title, description = rng.choice(TICKET_SUBJECTS)
+        student = rng.choice(built["students"])
+        room = rooms[student["room_id"]]
+        created_at = datetime.combine(start_day, time.min, tzinfo=timezone.utc) + timedelta(seconds=rng.randrange(days * 86400))
+        ticket = {"id": _uuid(rng), "title": f"{title} in room {room}", "description": description,
+                  "category": category, "status": rng.choice(list(TicketStatus)), "created_by": rng.choice(built["staff"])["id"],
+                  "assigned_student": student["id"], "created_at": created_at}
+        tickets.append(ticket)
+        for c in range(rng.choice((0, 1, 1, 2, 3))):
+            comments.append({"id": _uuid(rng), "ticket_id": ticket["id"], "author_id": rng.choice(built["staff"])["id"],
+                             "content": rng.choice(COMMENTS), "created_at": created_at + timedelta(hours=c + 1)})
+    return tickets, comments
+
+
+def windows(built: dict, first_day: date, last_day: date) -> Iterator[Tuple[dict, date, datetime, datetime]]:
+    """Every (schedule, local day, start, end) window opening between the two days, inclusive.
+
+    Windows are read in the dormitory's local time with the same helpers the
+    scan endpoint and the absence job use, so generated scans fall where the
+    API would have accepted them.
+    """
+    zone = get_zone(built["dormitory"]["timezone"])
+    schedules = [_Schedule(schedule) for schedule in built["schedules"]]
+    day = first_day
+    while day <= last_day:
+        for schedule in schedules:
+            if is_window_day(schedule, day, zone):
+                start, end = schedule_window(schedule, day, zone)
+                yield schedule.row, day, start, end
+        day += timedelta(days=1)
+
+
+class _Schedule:
+    # schedule_window reads attributes; the generator works with plain rows
+    def __init__(self, row: dict):
+        self.row = row
+        self.end_date = None
+        self.__dict__.update(row)
+
+
+def student_habits(seed: int, students: List[dict]) -> List[Tuple[float, float]]:
+    """Per-student (mean minutes after opening, absence probability); stable for a given seed."""
+    habits = []
+    for student in students:
+        rng = random.Random(f"{seed}:habits:{student['id']}")
+        habits.append((rng.lognormvariate(1.3, 0.6), min(0.4, rng.betavariate(1.2, 40))))
+    return habits
+
+
+def attendance_rows(task: tuple) -> Tuple[List[tuple], List[tuple], List[dict]]:
+    """Attendance and RFID log rows for one dormitory over one run of days.
+
+    Returns attendance tuples (ATTENDANCE_COLUMNS), RFID log tuples
+    (RFID_LOG_COLUMNS) with aware UTC timestamps, and schedule_window_runs rows.
+    """
+    seed, built, first_day, last_day = task
+    rng = random.Random(f"{seed}:attendance:{built['dormitory']['id']}:{first_day.isoformat()}")
+    habits = student_habits(seed, built["students"])
+    grace = timedelta(minutes=settings.LATE_GRACE_MINUTES)
+    attendances, logs, runs = [], [], []
+
+    for schedule, day, start, end in windows(built, first_day, last_day):
+        start_utc, length = start.astimezone(timezone.utc), (end - start).total_seconds()
+        absent = late = 0
+        for student, (lateness, absence_rate) in zip(built["students"], habits):
+            if rng.random() < absence_rate:
+                attendances.append((_uuid(rng), student["id"], schedule["id"], start_utc, AttendanceStatus.ABSENT,
+                                    schedule["created_by_id"], ABSENT_NOTE))
+                absent += 1
+                continue
+            # The rush at opening with a long tail: gamma around the student's own punctuality
+            offset = min(rng.gammavariate(2.0, lateness / 2.0) * 60 + rng.random() * 60, length - 1)
+            scanned_at = start_utc + timedelta(seconds=offset)
+            status = AttendanceStatus.LATE if scanned_at > start_utc + grace else AttendanceStatus.PRESENT
+            late += status == AttendanceStatus.LATE
+            device_id = rng.choice(built["devices"])["id"]
+            attendances.append((_uuid(rng), student["id"], schedule["id"], scanned_at, status, device_id, None))
+            logs.append((_uuid(rng), student["id"], device_id, scanned_at, schedule["id"]))
+            if rng.random() < 0.02:
+                # A second tap a few seconds later is recorded as a check-out
+                again = scanned_at + timedelta(seconds=rng.randint(2, 20))
+                attendances.append((_uuid(rng), student["id"], schedule["id"], again, AttendanceStatus.ABSENT, device_id, None))
+                logs.append((_uuid(rng), student["id"], device_id, again, schedule["id"]))
+        runs.append({"schedule_id": schedule["id"], "day": day, "absent_marked": absent, "late_marked": late,
+                     "processed_at": end.astimezone(timezone.utc)})
+    return attendances, logs, runs
+
+
+_worker_engine = None
+
+
+def _init_worker(database_url: str) -> None:
+    global _worker_engine
+    _worker_engine = create_engine(database_url)
+
+
+def _copy(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if value is None else value.name if isinstance(value, AttendanceStatus)
+                         else value.isoformat() if isinstance(value, datetime) else value for value in row])
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _generate_task(task: tuple):
+    """Pool entry point: COPY the rows on Postgres, otherwise hand them back."""
+    attendances, logs, runs = attendance_rows(task)
+    if _worker_engine.dialect.name != "postgresql":
+        return attendances, logs, runs
+    connection = _worker_engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            _copy(cursor, Attendance.__tablename__, ATTENDANCE_COLUMNS, attendances)
+            _copy(cursor, RFIDLog.__tablename__, RFID_LOG_COLUMNS, logs)
+        connection.commit()
+    finally:
+        connection.close()
+    return len(attendances), len(logs), runs
+
+
+def _insert(conn, table, rows: List[dict]) -> None:
+    for i in range(0, len(rows), BATCH_SIZE):
+        conn.execute(table.insert(), rows[i:i + BATCH_SIZE])
+
+
+def _as_dicts(columns: Tuple[str, ...], rows: List[tuple], dialect_name: str) -> List[dict]:
+    return [
+        {column: to_db_datetime(value, dialect_name) if isinstance(value, datetime) else value
+         for column, value in zip(columns, row)}
+        for row in rows
+    ]
+
+
+def generate(
+    database_url: str,
+    scale: float = 1.0,
+    days: int = 90,
+    end_date: Optional[date] = None,
+    seed: int = 42,
+    workers: Optional[int] = None,
+    drop: bool = False,
+    rollups: bool = True,
+    students_per_dormitory: int = STUDENTS_PER_DORMITORY,
+) -> Dict[str, int]:
+    """Generate the dataset and return how many rows went into each table."""
+    engine = create_engine(database_url)
+    dialect_name = engine.dialect.name
+    if drop:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+
+    end_date = end_date or date.today() - timedelta(days=1)
+    start_day = end_date - timedelta(days=days - 1)
+    password_hash = get_password_hash("password")
+    counts = dict.fromkeys(("dormitories", "users", "rooms", "students", "tickets", "comments", "attendances", "rfid_logs"), 0)
+
+    with engine.connect() as conn:
+        first_index = conn.execute(select(func.count()).select_from(Dormitory)).scalar()
+    built_dormitories = [
+        build_dormitory(index, seed, start_day, password_hash, students_per_dormitory)
+        for index in range(first_index, first_index + max(1, round(scale * DORMITORIES_PER_SCALE)))
+    ]
+
+    with engine.begin() as conn:
+        for index, built in enumerate(built_dormitories, start=first_index):
+            conn.execute(Dormitory.__table__.insert(), [built["dormitory"]])
+            _insert(conn, User.__table__, built["users"])
+            _insert(conn, AttendanceSchedule.__table__, [
+                {**schedule, "start_date": to_db_datetime(schedule["start_date"], dialect_name)}
+                for schedule in built["schedules"]
+            ])
+            _insert(conn, attendance_schedule_devices, [
+                {"schedule_id": schedule["id"], "device_id": device["id"]}
+                for schedule in built["schedules"] for device in built["devices"]
+            ])
+            _insert(conn, Room.__table__, built["rooms"])
+            _insert(conn, Student.__table__, built["students"])
+            tickets, comments = build_tickets(index, seed, built, start_day, days)
+            for row in tickets + comments:
+                row["created_at"] = to_db_datetime(row["created_at"], dialect_name)
+            _insert(conn, Ticket.__table__, tickets)
+            _insert(conn, Comment.__table__, comments)
+            counts["dormitories"] += 1
+            for key, rows in (("users", built["users"]), ("rooms", built["rooms"]), ("students", built["students"]),
+                              ("tickets", tickets), ("comments", comments)):
+                counts[key] += len(rows)
+
+    tasks = []
+    for built in built_dormitories:
+        first_day = start_day
+        while first_day <= end_date:
+            last_day = min(first_day + timedelta(days=DAYS_PER_TASK - 1), end_date)
+            tasks.append((seed, built, first_day, last_day))
+            first_day = last_day + timedelta(days=1)
+
+    engine.dispose()
+    with multiprocessing.Pool(workers or os.cpu_count(), initializer=_init_worker, initargs=(database_url,)) as pool:
+        for attendances, logs, runs in pool.imap_unordered(_generate_task, tasks):
+            with engine.begin() as conn:
+                if isinstance(attendances, int):
+                    counts["attendances"] += attendances
+                    counts["rfid_logs"] += logs
+                else:
+                    _insert(conn, Attendance.__table__, _as_dicts(ATTENDANCE_COLUMNS, attendances, dialect_name))
+                    _insert(conn, RFIDLog.__table__, _as_dicts(RFID_LOG_COLUMNS, logs, dialect_name))
+                    counts["attendances"] += len(attendances)
+                    counts["rfid_logs"] += len(logs)
+                for run in runs:
+                    run["processed_at"] = to_db_datetime(run["processed_at"], dialect_name)
+                _insert(conn, ScheduleWindowRun.__table__, runs)
+
+    if dialect_name in ("postgresql", "sqlite"):
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")
+    if rollups:
+        with Session(engine) as db:
+            refresh_attendance_rollups(db)
+            db.commit()
+    engine.dispose()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help=f"units of {DORMITORIES_PER_SCALE} dormitories (of --students-per-dormitory students)")
+    parser.add_argument("--days", type=int, default=90, help="days of attendance history")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="last day of history (default: yesterday)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--students-per-dormitory", type=int, default=STUDENTS_PER_DORMITORY)
+    parser.add_argument("--workers", type=int, help="generator processes (default: one per CPU)")
+    parser.add_argument("--drop", action="store_true", help="drop and recreate all tables first")
+    parser.add_argument("--skip-rollups", action="store_true", help="leave attendance_daily_rollups to the rollup job")
+    args = parser.parse_args()
+
+    started = timer.perf_counter()
+    counts = generate(args.database_url, args.scale, args.days, args.end_date, args.seed, args.workers,
+                      args.drop, not args.skip_rollups, args.students_per_dormitory)
+    for table, count in counts.items():
+        print(f"{table:>12}: {count:,}")
+    print(f"Done in {timer.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""Point the application at a scratch SQLite database before it is imported."""
+import os
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="dms-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("REFRESH_TOKEN_EXPIRE_MINUTES", "60")
+os.environ["JOB_SCHEDULER_ENABLED"] = "false"
+os.environ["ACCESS_LOG_SAMPLE_RATE"] = "0"
+os.environ.pop("CACHE_BACKEND_URL", None)
@@ -0,0 +1,27 @@
+"""Shared cache invalidation through a backend both workers can reach."""
+import os
+import tempfile
+
+from app.core.cache import SharedCache
+from app.core.cache_backends import SQLiteBackend
+
+
+def test_invalidating_everything_moves_the_generation_for_every_worker():
+    backend = SQLiteBackend(os.path.join(tempfile.mkdtemp(prefix="dms-cache-"), "cache.db"))
+    first = SharedCache("test_generation", ttl=60, backend=backend)
+    first.set("a", 1)
+    first.set("b", 2)
+
+    # Another worker starts with an empty local tier and reads through
+    second = SharedCache("test_generation", ttl=60, backend=backend)
+    assert second.get("a") == 1
+
+    first.invalidate("a")
+    assert first.get("a") is None and first.get("b") == 2
+
+    first.invalidate()
+    assert first.get("b") is None
+    third = SharedCache("test_generation", ttl=60, backend=backend)
+    assert third.get("b") is None
+    third.set("b", 3)
+    assert first.get("b") == 3
@@ -0,0 +1,63 @@
+"""Dashboard summaries are dropped per dormitory when their rows change."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.absences import close_window
+from app.core.database import Base, SessionLocal, engine
+from app.core.dashboard_cache import ALL_DORMITORIES, summary_cache
+from app.models.models import AttendanceSchedule, Dormitory, Student, UnknownRFID, User, UserRole
+
+Base.metadata.create_all(engine)
+
+
+def make_dormitory(db, suffix):
+    dormitory = Dormitory(name=f"Summary {suffix}")
+    db.add(dormitory)
+    db.flush()
+    admin = User(name="Admin", email=f"admin.{suffix}@example.com", hashed_password="x",
+                 role=UserRole.ADMIN, dormitory_id=dormitory.id)
+    db.add(admin)
+    db.flush()
+    return dormitory, admin
+
+
+def fill(*keys):
+    for key in keys:
+        summary_cache.set(key, {"cached": key})
+
+
+def cached(key) -> bool:
+    return summary_cache.get(key) is not None
+
+
+def test_writes_drop_only_their_dormitorys_summary():
+    db = SessionLocal()
+    first, admin = make_dormitory(db, uuid.uuid4().hex[:8])
+    second, _ = make_dormitory(db, uuid.uuid4().hex[:8])
+    db.commit()
+
+    fill(first.id, second.id, ALL_DORMITORIES)
+    db.add(Student(name="New", rfid_tag=f"tag-{uuid.uuid4().hex}", dormitory_id=first.id))
+    db.commit()
+    assert not cached(first.id) and not cached(ALL_DORMITORIES) and cached(second.id)
+
+    # The absences job writes with Core statements, outside the session's unit of work
+    now = datetime.now(timezone.utc)
+    schedule = AttendanceSchedule(
+        name="Evening", dormitory_id=second.id, created_by_id=admin.id, start_time="00:00", end_time="00:01",
+        start_date=now - timedelta(days=1), is_active=True,
+    )
+    db.add_all([schedule, Student(name="Away", rfid_tag=f"tag-{uuid.uuid4().hex}", dormitory_id=second.id)])
+    db.commit()
+    fill(first.id, second.id, ALL_DORMITORIES)
+    start, end = now - timedelta(minutes=1), now + timedelta(seconds=5)
+    result = close_window(db, schedule, start.date(), start, end, end + timedelta(seconds=5))
+    assert result["absent_marked"] == 1
+    assert cached(first.id) and not cached(second.id) and not cached(ALL_DORMITORIES)
+
+    # Unknown tags show up in every summary
+    fill(first.id, second.id)
+    db.add(UnknownRFID(rfid_tag=f"unknown-{uuid.uuid4().hex}"))
+    db.commit()
+    assert not cached(first.id) and not cached(second.id)
+    db.close()
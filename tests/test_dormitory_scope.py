@@ -0,0 +1,65 @@
+"""Staff accounts without a dormitory see no dormitory's data, not every dormitory's."""
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.dashboard_cache import summary_cache, summary_key
+from app.core.database import SessionLocal
+from app.core.events import broker
+from app.core.security import create_access_token
+from app.main import app
+from app.models.models import User, UserRole
+
+# Routes that scope their results to the caller's dormitory
+SCOPED_ROUTES = [
+    "/api/reports/attendance/export?format=csv",
+    "/api/reports/attendance/students",
+    "/api/reports/attendance/schedules",
+    "/api/reports/attendance/days",
+    "/api/reports/attendance/analytics",
+    "/api/dashboard/summary",
+    "/api/students/search/?query=ann",
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+def headers_for(role: UserRole, dormitory_id=None) -> dict:
+    db = SessionLocal()
+    user = User(name="User", email=f"user.{uuid.uuid4().hex[:8]}@example.com", hashed_password="x",
+                role=role, dormitory_id=dormitory_id)
+    db.add(user)
+    db.commit()
+    email = user.email
+    db.close()
+    return {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+
+@pytest.mark.parametrize("path", SCOPED_ROUTES)
+def test_staff_without_a_dormitory_is_refused(client, path):
+    response = client.get(path, headers=headers_for(UserRole.STAFF))
+    assert response.status_code == 403, response.text
+
+
+@pytest.mark.parametrize("path", SCOPED_ROUTES)
+def test_admin_without_a_dormitory_sees_every_dormitory(client, path):
+    response = client.get(path, headers=headers_for(UserRole.ADMIN))
+    assert response.status_code == 200, response.text
+
+
+def test_refused_dashboard_request_leaves_the_all_dormitories_summary_alone(client):
+    summary_cache.invalidate()
+    client.get("/api/dashboard/summary", headers=headers_for(UserRole.STAFF))
+    assert summary_cache.get(summary_key(None)) is None
+
+
+def test_event_stream_is_refused_before_subscribing(client, monkeypatch):
+    subscribed = []
+    monkeypatch.setattr(broker, "subscribe", lambda *args: subscribed.append(args))
+    response = client.get("/api/events/stream", headers=headers_for(UserRole.STAFF))
+    assert response.status_code == 403, response.text
+    assert subscribed == []
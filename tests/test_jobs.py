@@ -0,0 +1,27 @@
+"""A job runs on one worker at a time, whoever triggers it."""
+import asyncio
+from datetime import timedelta
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.jobs import JobScheduler
+from app.core.leases import acquire_lease, release_lease
+
+Base.metadata.create_all(engine)
+
+
+def test_manual_run_waits_for_the_lease_held_by_another_worker():
+    scheduler = JobScheduler()
+    calls = []
+    scheduler.register("test_lease_job", interval=60, timeout=5)(lambda db: calls.append(db))
+
+    db = SessionLocal()
+    assert acquire_lease(db, "job:test_lease_job", timedelta(minutes=1), holder="leader")
+    assert asyncio.run(scheduler.run_job("test_lease_job")) is None
+    assert calls == [] and not scheduler.jobs["test_lease_job"].running
+
+    release_lease(db, "job:test_lease_job", holder="leader")
+    assert asyncio.run(scheduler.run_job("test_lease_job")) == "success"
+    assert len(calls) == 1
+    # Released again once the run finished
+    assert acquire_lease(db, "job:test_lease_job", timedelta(minutes=1), holder="leader")
+    db.close()
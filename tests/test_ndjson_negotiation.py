@@ -0,0 +1,18 @@
+"""List endpoints stream NDJSON only when the client prefers it."""
+from starlette.requests import Request
+
+from app.core.serialization import accepts_ndjson
+
+
+def accepts(header: str) -> bool:
+    return accepts_ndjson(Request({"type": "http", "headers": [(b"accept", header.encode())]}))
+
+
+def test_ndjson_needs_an_explicit_non_zero_preference():
+    assert accepts("application/x-ndjson")
+    assert accepts("application/x-ndjson, application/json")
+    assert accepts("application/json;q=0.5, application/x-ndjson")
+    assert not accepts("application/x-ndjson;q=0, application/json")
+    assert not accepts("application/x-ndjson;q=0.5, application/json")
+    assert not accepts("*/*")
+    assert not accepts("")
@@ -0,0 +1,78 @@
+"""Query budgets, N+1 headers and statement shapes."""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.query_audit import N_PLUS_ONE_THRESHOLD, QueryAuditMiddleware, QueryBudgetExceeded, query_budget
+from app.core.query_stats import normalize_statement, track_queries
+
+engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+track_queries(engine)
+
+
+def run(*statements: str) -> None:
+    with engine.connect() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def audited_client(debug: bool) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/within")
+    @query_budget(2)
+    def within():
+        run("SELECT 1", "SELECT 2")
+        return {}
+
+    @app.get("/over")
+    @query_budget(1)
+    def over():
+        run("SELECT 1", "SELECT 2")
+        return {}
+
+    @app.get("/loop")
+    def loop():
+        run(*(f"SELECT {i}" for i in range(N_PLUS_ONE_THRESHOLD)))
+        return {}
+
+    app.add_middleware(QueryAuditMiddleware, debug=debug)
+    return TestClient(app)
+
+
+def test_debug_mode_fails_requests_over_their_budget():
+    client = audited_client(debug=True)
+    assert client.get("/within").status_code == 200
+    with pytest.raises(QueryBudgetExceeded, match="GET /over ran 2 SQL statements, budget is 1"):
+        client.get("/over")
+
+
+def test_over_budget_requests_only_log_outside_debug_mode():
+    client = audited_client(debug=False)
+    # Sampling is off, so nothing is audited or annotated
+    response = client.get("/over")
+    assert response.status_code == 200
+    assert "x-db-queries" not in response.headers
+
+
+def test_audited_responses_count_statements_and_repeated_shapes():
+    client = audited_client(debug=True)
+    response = client.get("/within")
+    assert response.headers["x-db-queries"] == "2"
+    assert "x-db-n-plus-one" not in response.headers
+
+    response = client.get("/loop")
+    assert response.headers["x-db-queries"] == str(N_PLUS_ONE_THRESHOLD)
+    assert response.headers["x-db-n-plus-one"] == "1"
+
+
+def test_normalize_statement_collapses_literals_and_in_lists():
+    assert normalize_statement("SELECT * FROM students WHERE id IN (?, ?, ?)") == \
+        normalize_statement("SELECT * FROM students WHERE id IN (?)") == \
+        "SELECT * FROM students WHERE id IN (?)"
+    assert normalize_statement("SELECT * FROM rooms WHERE id IN (%(id_1)s, %(id_2)s)") == \
+        "SELECT * FROM rooms WHERE id IN (?)"
+    assert normalize_statement("SELECT *\n  FROM rooms WHERE number = '101' LIMIT 5") == \
+        "SELECT * FROM rooms WHERE number = ? LIMIT ?"
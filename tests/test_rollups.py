@@ -0,0 +1,69 @@
+"""The rollup job follows when rows were written, not the time they are dated."""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.rollups import refresh_attendance_rollups
+from app.models.models import (
+    Attendance,
+    AttendanceDailyRollup,
+    AttendanceSchedule,
+    AttendanceStatus,
+    Dormitory,
+    Student,
+    User,
+    UserRole,
+)
+
+
+Base.metadata.create_all(engine)
+
+
+def rollup_status(db, schedule_id, student_id, day):
+    return db.query(AttendanceDailyRollup.final_status).filter(
+        AttendanceDailyRollup.schedule_id == schedule_id,
+        AttendanceDailyRollup.student_id == student_id,
+        AttendanceDailyRollup.day == day,
+    ).scalar()
+
+
+def test_rows_dated_before_the_watermark_are_rolled_up():
+    suffix = uuid.uuid4().hex[:8]
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    dormitory = Dormitory(name=f"Rollups {suffix}")
+    db.add(dormitory)
+    db.flush()
+    admin = User(name="Admin", email=f"admin.{suffix}@example.com", hashed_password="x",
+                 role=UserRole.ADMIN, dormitory_id=dormitory.id)
+    db.add(admin)
+    db.flush()
+    schedule = AttendanceSchedule(
+        name="Evening", dormitory_id=dormitory.id, created_by_id=admin.id,
+        start_time="00:00", end_time="23:59", start_date=now - timedelta(days=30), is_active=True,
+    )
+    student = Student(name="Student", rfid_tag=f"tag-{suffix}", dormitory_id=dormitory.id)
+    db.add_all([schedule, student])
+    db.flush()
+
+    # A fresh scan moves the watermark up to now
+    db.add(Attendance(student_id=student.id, schedule_id=schedule.id, timestamp=now,
+                      status=AttendanceStatus.PRESENT, recorded_by_id=admin.id))
+    db.commit()
+    refresh_attendance_rollups(db)
+
+    # A bulk import dated three days back is still picked up
+    past = now - timedelta(days=3)
+    backdated = Attendance(student_id=student.id, schedule_id=schedule.id, timestamp=past,
+                           status=AttendanceStatus.PRESENT, recorded_by_id=admin.id)
+    db.add(backdated)
+    db.commit()
+    refresh_attendance_rollups(db)
+    assert rollup_status(db, schedule.id, student.id, past.date()) == AttendanceStatus.PRESENT
+
+    # And so is a later edit of that row
+    backdated.status = AttendanceStatus.LATE
+    db.commit()
+    refresh_attendance_rollups(db)
+    assert rollup_status(db, schedule.id, student.id, past.date()) == AttendanceStatus.LATE
+    db.close()
@@ -0,0 +1,112 @@
+"""Schedule windows are wall-clock times in the dormitory's timezone, everywhere."""
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from zoneinfo import ZoneInfo
+
+from fastapi.testclient import TestClient
+
+from app.core.absences import ABSENT_NOTE, close_finished_windows, current_window, schedule_window
+from app.core.database import SessionLocal
+from app.core.security import create_access_token
+from app.main import app
+from app.models.models import (
+    Attendance,
+    AttendanceSchedule,
+    AttendanceStatus,
+    Dormitory,
+    Student,
+    User,
+    UserRole,
+    attendance_schedule_devices,
+)
+
+BRUSSELS = ZoneInfo("Europe/Brussels")
+EVERY_DAY = dict.fromkeys(("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"), True)
+
+
+def make_schedule(start_time: str, end_time: str, **fields):
+    return SimpleNamespace(
+        start_time=start_time,
+        end_time=end_time,
+        start_date=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        end_date=None,
+        **{**EVERY_DAY, **fields},
+    )
+
+
+def test_window_is_local_time_not_utc():
+    schedule = make_schedule("21:00", "22:30")
+    # 21:30 in Brussels during summer time
+    inside = datetime(2026, 7, 1, 19, 30, tzinfo=timezone.utc)
+    assert current_window(schedule, inside, BRUSSELS) == (
+        date(2026, 7, 1),
+        datetime(2026, 7, 1, 21, 0, tzinfo=BRUSSELS),
+        datetime(2026, 7, 1, 22, 30, tzinfo=BRUSSELS),
+    )
+    # 21:30 UTC is already 23:30 in Brussels
+    assert current_window(schedule, datetime(2026, 7, 1, 21, 30, tzinfo=timezone.utc), BRUSSELS) is None
+
+
+def test_window_past_midnight_belongs_to_the_day_it_opened():
+    schedule = make_schedule("23:00", "01:00", tuesday=False)
+    # 00:30 on a Tuesday in Brussels: Monday's window is still open
+    now = datetime(2026, 7, 6, 22, 30, tzinfo=timezone.utc)
+    day, start, end = current_window(schedule, now, BRUSSELS)
+    assert day == date(2026, 7, 6) and (start, end) == schedule_window(schedule, day, BRUSSELS)
+
+
+def test_weekday_is_the_local_weekday():
+    # 00:30 on Wednesday in Brussels is still Tuesday in UTC
+    schedule = make_schedule("00:00", "01:00", tuesday=False)
+    assert current_window(schedule, datetime(2026, 7, 7, 22, 30, tzinfo=timezone.utc), BRUSSELS) is not None
+    schedule = make_schedule("00:00", "01:00", wednesday=False)
+    assert current_window(schedule, datetime(2026, 7, 7, 22, 30, tzinfo=timezone.utc), BRUSSELS) is None
+
+
+def test_scan_and_close_out_agree_for_a_dormitory_off_utc():
+    now = datetime.now(timezone.utc)
+    local_now = now.astimezone(BRUSSELS)
+    opens, closes = local_now - timedelta(minutes=5), local_now + timedelta(minutes=20)
+    suffix = uuid.uuid4().hex[:8]
+
+    db = SessionLocal()
+    dormitory = Dormitory(name=f"Brussels {suffix}", timezone="Europe/Brussels")
+    db.add(dormitory)
+    db.flush()
+    admin = User(name="Admin", email=f"admin.{suffix}@example.com", hashed_password="x",
+                 role=UserRole.ADMIN, dormitory_id=dormitory.id)
+    device = User(name="Door", email=f"door.{suffix}@example.com", hashed_password="x",
+                  role=UserRole.IO_DEVICE, dormitory_id=dormitory.id)
+    db.add_all([admin, device])
+    db.flush()
+    schedule = AttendanceSchedule(
+        name="Evening", dormitory_id=dormitory.id, created_by_id=admin.id,
+        start_time=opens.strftime("%H:%M"), end_time=closes.strftime("%H:%M"),
+        start_date=opens, is_active=True, **EVERY_DAY,
+    )
+    present = Student(name="Present", rfid_tag=f"tag-{suffix}-1", dormitory_id=dormitory.id)
+    missing = Student(name="Missing", rfid_tag=f"tag-{suffix}-2", dormitory_id=dormitory.id)
+    db.add_all([schedule, present, missing])
+    db.flush()
+    db.execute(attendance_schedule_devices.insert().values(device_id=device.id, schedule_id=schedule.id))
+    db.commit()
+
+    client = TestClient(app)
+    token = create_access_token({"sub": device.email})
+    response = client.post(
+        "/api/rfid-scan", params={"rfid_tag": present.rfid_tag}, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200, response.text
+
+    # Run the close-out job just after the window's local end
+    _, _, end = current_window(schedule, now, BRUSSELS)
+    results = close_finished_windows(db, now=end + timedelta(minutes=1))
+    assert [(result["schedule_id"], result["absent_marked"]) for result in results] == [(schedule.id, 1)]
+
+    statuses = dict(
+        db.query(Attendance.student_id, Attendance.status).filter(Attendance.schedule_id == schedule.id).all()
+    )
+    assert statuses == {present.id: AttendanceStatus.PRESENT, missing.id: AttendanceStatus.ABSENT}
+    assert db.query(Attendance.notes).filter(Attendance.student_id == missing.id).scalar() == ABSENT_NOTE
+    db.close()
@@ -0,0 +1,30 @@
+"""Startup brings a database created before the added columns up to date."""
+import os
+import tempfile
+
+from sqlalchemy import create_engine, inspect
+
+from app.core.schema import upgrade_schema
+from app.models.models import Base
+
+
+def test_upgrade_adds_missing_columns_and_indexes():
+    path = os.path.join(tempfile.mkdtemp(prefix="dms-schema-"), "old.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DROP INDEX ix_attendances_updated_at")
+        connection.exec_driver_sql("DROP INDEX ix_attendances_timestamp")
+        connection.exec_driver_sql("ALTER TABLE attendances DROP COLUMN updated_at")
+        connection.exec_driver_sql("ALTER TABLE dormitories DROP COLUMN timezone")
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    inspector = inspect(engine)
+    assert "updated_at" in {column["name"] for column in inspector.get_columns("attendances")}
+    assert "timezone" in {column["name"] for column in inspector.get_columns("dormitories")}
+    assert {"ix_attendances_timestamp", "ix_attendances_updated_at"} <= {
+        index["name"] for index in inspector.get_indexes("attendances")
+    }
+    engine.dispose()
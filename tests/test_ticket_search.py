@@ -0,0 +1,14 @@
+"""Search snippets are safe to insert as HTML."""
+from app.core.ticket_search import SENTINEL_START, SENTINEL_STOP, _mark_up, headline
+
+
+def test_headline_escapes_the_text_around_matches():
+    text = 'Tap <img src=x onerror="alert(1)"> leaking & broken'
+    assert headline(text, {"leaking", "img"}) == (
+        "Tap &lt;<b>img</b> src=x onerror=&quot;alert(1)&quot;&gt; <b>leaking</b> &amp; broken"
+    )
+
+
+def test_postgres_snippets_are_escaped_before_the_tags_go_in():
+    snippet = f"the {SENTINEL_START}tap{SENTINEL_STOP} <script>"
+    assert _mark_up(snippet) == "the <b>tap</b> &lt;script&gt;"